@@ -2,8 +2,18 @@
 
 __version__ = "0.9.1"
 
-from .client import WPSClient
-from .ipyleafletwfs import IpyleafletWFS  # noqa: F401
+__all__ = ["WPSClient", "IpyleafletWFS", "import_wps", "BirdyClient"]
 
-# backwards compatibility
-import_wps = BirdyClient = WPSClient
+
+# The client and its dependencies are imported on first use, so that the command-line interface starts quickly.
+def __getattr__(name):
+    # backwards compatibility
+    if name in ("WPSClient", "import_wps", "BirdyClient"):
+        from .client import WPSClient
+
+        return WPSClient
+    if name == "IpyleafletWFS":
+        from .ipyleafletwfs import IpyleafletWFS
+
+        return IpyleafletWFS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -37,6 +37,78 @@ the environment variable ``WPS_SSL_VERIFY``:
 You can also set the path of the service certificate.
 Read the requests_ documentation.
 
+Command cache
+-------------
+The processes of the WPS service and their options are cached on disk, so that only the first invocation sends
+GetCapabilities and DescribeProcess requests. The cache expires after a day, or after the number of seconds set by
+the environment variable ``BIRDY_CLI_CACHE_TTL``. Use the ``--refresh`` option to fetch the processes again:
+
+.. code-block:: console
+
+    $ birdy --refresh -h
+
+Shell completion of process names and options only reads this cache, even when it has expired, so that it answers
+without network access. An expired or missing cache is rebuilt in the background for the next completion. Enable
+completion as described in the click_ documentation, e.g. for bash:
+
+.. code-block:: console
+
+    $ eval "$(_BIRDY_COMPLETE=bash_source birdy)"
+
+Download outputs
+----------------
+With ``--download-dir``, the reference outputs of a process are downloaded concurrently once it succeeds. Interrupted
+transfers are resumed, files already downloaded with the same size and ETag are kept, and the throughput is reported.
+``--convert`` also loads the files with the converters of the client and prints them:
+
+.. code-block:: console
+
+    $ birdy wordcounter --text https://example.org/page.html --download-dir outputs --convert
+
+Machine-readable output
+-----------------------
+With ``--json`` (or ``--ndjson``), a process command writes one JSON object per line instead of a progress bar:
+``accepted``, a ``status`` event each time the status, progress or message changes, an ``output`` event per output,
+a ``download`` event per downloaded file, and a ``completed`` event with the errors and the time spent submitting,
+queued, running and downloading:
+
+.. code-block:: console
+
+    $ birdy hello --name stranger --json
+
+Run a process for many inputs
+-----------------------------
+The ``batch`` command executes a process once per line of a JSON lines or CSV file, with a bounded number of
+asynchronous jobs at a time, and writes a JSON line with the status, outputs and timings of each job.
+``--resume`` only runs the jobs that did not succeed in an earlier run:
+
+.. code-block:: console
+
+    $ birdy batch hello --inputs names.csv --concurrency 8 --output results.jsonl
+    $ birdy batch hello --inputs names.csv --output results.jsonl --resume
+
+Watch running executions
+------------------------
+The ``status`` command follows executions from their status locations, or from a journal file such as the output of
+``batch``, in a single polling loop. Each execution is checked less often as it runs, and the terminal shows its
+status, progress and elapsed time until it completes:
+
+.. code-block:: console
+
+    $ birdy status --journal results.jsonl
+    $ birdy status http://localhost:5000/outputs/1234.xml --once
+
+Measure the performance of a service
+------------------------------------
+The ``bench`` command repeats GetCapabilities, DescribeProcess, synchronous and asynchronous executions, status
+checks and output downloads with concurrent clients, and reports the 50th, 95th and 99th percentiles of their
+latency with the time spent by the client building and parsing XML documents:
+
+.. code-block:: console
+
+    $ birdy bench hello --input name=stranger --concurrency 4 --duration 30
+    $ birdy bench --operation capabilities --requests 100 --json
+
 Use an OAuth2 access token
 --------------------------
 
@@ -93,5 +165,6 @@ We can then use the output_formats option to redefine it:
       netcdf=http://localhost:5000/outputs/38e9aefe-08db-11eb-9334-0800274cd70c/dummy.nc
       json=http://localhost:5000/outputs/38e9aefe-08db-11eb-9334-0800274cd70c/dummy.json
 
+.. _click: https://click.palletsprojects.com/en/stable/shell-completion/
 .. _requests: https://docs.python-requests.org/en/latest/user/advanced/#ssl-cert-verification
 """
@@ -1,21 +1,26 @@
 # noqa: D100
 
+import functools
 import os
 from collections import OrderedDict
 
 import click
-from jinja2 import Environment, PackageLoader
-from owslib.wps import WebProcessingService
-from requests.exceptions import SSLError
 
+from birdy.cli.cache import CommandCache
 from birdy.cli.misc import get_ssl_verify
 from birdy.cli.types import COMPLEX
 from birdy.exceptions import ConnectionError
 
-template_env = Environment(
-    loader=PackageLoader("birdy", "templates"),
-    autoescape=True,
-)
+
+@functools.lru_cache(maxsize=None)
+def get_template_env():
+    """Return the Jinja environment of the command templates, only loaded when a command is not cached."""
+    from jinja2 import Environment, PackageLoader
+
+    return Environment(
+        loader=PackageLoader("birdy", "templates"),
+        autoescape=True,
+    )
 
 
 class BirdyCLI(click.MultiCommand):
@@ -34,65 +39,196 @@ class BirdyCLI(click.MultiCommand):
         A WPS GetCapabilities response for testing.
     desc_xml : str
         A WPS DescribeProcess response with "identifier=all" for testing.
+    cache_dir : str or Path, optional
+        Directory of the command cache. See :class:`birdy.cli.cache.CommandCache`.
     **attrs : dict
         Additional attributes.
     """
 
-    def __init__(self, name=None, url=None, caps_xml=None, desc_xml=None, **attrs):
+    def __init__(
+        self,
+        name=None,
+        url=None,
+        caps_xml=None,
+        desc_xml=None,
+        cache_dir=None,
+        **attrs,
+    ):
         click.MultiCommand.__init__(self, name, **attrs)
         self.url = os.environ.get("WPS_SERVICE") or url
         self.verify = get_ssl_verify()
         self.caps_xml = caps_xml
         self.desc_xml = desc_xml
+        self.cache_dir = cache_dir
         self._wps = None
         self.commands = OrderedDict()
+        self.builtins = OrderedDict()
+
+    def add_command(self, cmd: click.Command, name=None):
+        """
+        Add a command of birdy itself, such as `batch`, next to the commands of the processes.
+
+        Parameters
+        ----------
+        cmd : click.Command
+            The command.
+        name : str, optional
+            Name of the command. Defaults to the name of `cmd`. It hides a process with the same name.
+        """
+        self.builtins[name or cmd.name] = cmd
 
     @property
     def wps(self):  # noqa: D102
         if self._wps is None:
+            from owslib.wps import WebProcessingService
+
             language = self.context_settings["obj"].get("language")
             self._wps = WebProcessingService(
                 self.url, verify=self.verify, skip_caps=True, language=language
             )
         return self._wps
 
-    def _update_commands(self):  # noqa: D102
-        if not self.commands:
-            try:
-                self.wps.getcapabilities(xml=self.caps_xml)
-            except SSLError:
-                raise ConnectionError(
-                    "SSL verfication of server certificate failed. Set WPS_SSL_VERIFY=false."
-                )
-            except Exception as e:
-                raise ConnectionError(
-                    f"Could not connect to Web Processing Service ({e!r})"
-                )
-            for process in self.wps.processes:
-                self.commands[process.identifier] = dict(
-                    name=process.identifier,
-                    url=self.wps.url,
-                    version=process.processVersion,
-                    help=BirdyCLI.format_command_help(process),
-                    options=[],
+    @property
+    def cache(self) -> CommandCache:
+        """Cache of the commands of the service in the current language."""
+        language = self.context_settings["obj"].get("language")
+        return CommandCache(self.url, language=language, root=self.cache_dir)
+
+    @property
+    def refresh(self) -> bool:
+        """Whether cached commands must be fetched again."""
+        return bool(self.context_settings["obj"].get("refresh"))
+
+    def _update_commands(self, ctx=None):  # noqa: D102
+        if self.commands:
+            return
+        if ctx is not None and ctx.resilient_parsing:
+            # Shell completion only reads the cache, which is refreshed by another process if expired.
+            commands = self.cache.get_commands(stale=True)
+            if commands is None or self.cache.expired:
+                self.refresh_in_background()
+            self.commands = OrderedDict(commands or {})
+            return
+        commands = None if self.refresh else self.cache.get_commands()
+        if commands is not None:
+            self.commands = OrderedDict(commands)
+            return
+        self._fetch_commands()
+        self.cache.set_commands(self.commands)
+
+    def build_cache(self):
+        """Fetch the processes of the service and compile the command of each of them into the cache."""
+        self.commands = OrderedDict()
+        self._fetch_commands()
+        self.cache.set_commands(self.commands)
+        for process in self.wps.describeprocess("all", xml=self.desc_xml):
+            if process.identifier in self.commands:
+                self.cache.set_code(
+                    process.identifier, self._compile(process.identifier, process)
                 )
 
+    def refresh_in_background(self):
+        """Rebuild the cache in a separate process, unless another one is already doing it."""
+        import subprocess
+        import sys
+
+        cache = self.cache
+        if not cache.claim_refresh():
+            return
+        args = ["--build-cache"]
+        language = self.context_settings["obj"].get("language")
+        if language:
+            args = ["--language", language] + args
+        subprocess.Popen(
+            [sys.executable, "-c", "from birdy.cli.run import cli; cli()"] + args,
+            env=dict(os.environ, WPS_SERVICE=self.url),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def _fetch_commands(self):
+        """Build the commands from the capabilities of the service."""
+        from requests.exceptions import SSLError
+
+        try:
+            self.wps.getcapabilities(xml=self.caps_xml)
+        except SSLError:
+            raise ConnectionError(
+                "SSL verfication of server certificate failed. Set WPS_SSL_VERIFY=false."
+            )
+        except Exception as e:
+            raise ConnectionError(
+                f"Could not connect to Web Processing Service ({e!r})"
+            )
+        for process in self.wps.processes:
+            self.commands[process.identifier] = dict(
+                name=process.identifier,
+                url=self.wps.url,
+                version=process.processVersion,
+                help=BirdyCLI.format_command_help(process),
+                options=[],
+            )
+
     def list_commands(self, ctx):  # noqa: D102
-        self._update_commands()
-        return list(self.commands.keys())
+        self._update_commands(ctx)
+        return list(self.builtins) + [
+            name for name in self.commands if name not in self.builtins
+        ]
+
+    def format_commands(self, ctx, formatter):
+        """List the processes with the help of their cached commands, without building each command."""
+        self._update_commands(ctx)
+        names = list(self.builtins) + list(self.commands)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        if self.builtins:
+            with formatter.section("Birdy commands"):
+                formatter.write_dl(
+                    [
+                        (name, cmd.get_short_help_str(limit))
+                        for name, cmd in self.builtins.items()
+                    ]
+                )
+        rows = [
+            (name, click.Command(name, help=cmd["help"]).get_short_help_str(limit))
+            for name, cmd in self.commands.items()
+            if name not in self.builtins
+        ]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
 
     def get_command(self, ctx, name):  # noqa: D102
-        self._update_commands()
-        cmd_templ = template_env.get_template("cmd.py.j2")
-        rendered_cmd = cmd_templ.render(self._get_command_info(name, ctx))
+        if name in self.builtins:
+            return self.builtins[name]
+        self._update_commands(ctx)
+        if name not in self.commands:
+            return None
+        if ctx.resilient_parsing:
+            code = self.cache.get_code(name, stale=True)
+            if code is None:
+                return None
+        else:
+            code = None if self.refresh else self.cache.get_code(name)
+        if code is None:
+            code = self._compile(name)
+            self.cache.set_code(name, code)
         ns = {}
-        code = compile(rendered_cmd, filename="<string>", mode="exec")
         eval(code, ns, ns)
         return ns["cli"]
 
-    def _get_command_info(self, name, ctx):  # noqa: D102
-        cmd = self.commands.get(name)
-        pp = self.wps.describeprocess(name, xml=self.desc_xml)
+    def _compile(self, name, process=None):
+        """Render and compile the command of a process."""
+        cmd_templ = get_template_env().get_template("cmd.py.j2")
+        rendered_cmd = cmd_templ.render(self._get_command_info(name, process))
+        return compile(rendered_cmd, filename="<string>", mode="exec")
+
+    def _get_command_info(self, name, process=None):  # noqa: D102
+        cmd = dict(self.commands[name], options=[])
+        pp = process or self.wps.describeprocess(name, xml=self.desc_xml)
         for inp in pp.dataInputs:
             help = inp.title or ""
             default = BirdyCLI.get_param_default(inp)
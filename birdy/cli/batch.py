@@ -0,0 +1,259 @@
+"""
+Run a process for many input sets concurrently.
+
+The `birdy batch` command reads one input set per line of a JSON lines or CSV file, submits asynchronous executions
+with a bounded number of jobs running at the same time, and writes one JSON line per job as it finishes. With
+`--resume`, jobs that already succeeded in the output file are skipped, so an interrupted batch can be completed.
+
+.. code-block:: console
+
+    $ cat jobs.jsonl
+    {"name": "Alice"}
+    {"name": "Bob"}
+    $ birdy batch hello --inputs jobs.jsonl --concurrency 8 --output results.jsonl
+"""
+
+import csv
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import click
+
+from birdy.cli.misc import get_headers, get_outputs, poll, process_io
+
+
+def read_jobs(path: str) -> list:
+    """
+    Read input sets from a JSON lines or CSV file.
+
+    Parameters
+    ----------
+    path : str
+        File with one input set per line. CSV files have a header naming the inputs.
+
+    Returns
+    -------
+    list of dict
+        The input sets.
+    """
+    with open(path, newline="") as f:
+        if path.lower().endswith(".csv"):
+            return [dict(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_done(path: str) -> set:
+    """
+    Return the ids of the jobs that succeeded according to a results file.
+
+    Parameters
+    ----------
+    path : str
+        JSON lines file written by a previous batch.
+
+    Returns
+    -------
+    set
+        The job ids.
+    """
+    done = set()
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:  # Interrupted while writing
+                    continue
+                if record.get("status") == "ProcessSucceeded":
+                    done.add(record["id"])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def wps_inputs(inputs: dict, complex_inputs: set) -> list:
+    """
+    Return the inputs of an execution from an input set.
+
+    Parameters
+    ----------
+    inputs : dict
+        Input values keyed by identifier. Lists give several values to an input, and empty values are skipped.
+    complex_inputs : set
+        Identifiers of the inputs whose values are references to files.
+
+    Returns
+    -------
+    list of tuple
+        Inputs as expected by :meth:`owslib.wps.WebProcessingService.execute`.
+    """
+    from owslib.wps import ComplexDataInput
+
+    out = []
+    for key, value in inputs.items():
+        for v in value if isinstance(value, list) else [value]:
+            if v is None or v == "":
+                continue
+            out.append((key, ComplexDataInput(v) if key in complex_inputs else str(v)))
+    return out
+
+
+def run_job(wps, process, job_id, inputs, complex_inputs, outputs, poll_interval=1):
+    """
+    Execute a process asynchronously and wait for it to complete.
+
+    Parameters
+    ----------
+    wps : owslib.wps.WebProcessingService
+        Client of the service.
+    process : str
+        Process identifier.
+    job_id : int
+        Identifier of the job in the batch.
+    inputs : dict
+        Input values keyed by identifier.
+    complex_inputs : set
+        Identifiers of the inputs whose values are references to files.
+    outputs : list of tuple
+        Identifier of each output of the process and whether it is returned as a reference.
+    poll_interval : float
+        Seconds before the first status check.
+
+    Returns
+    -------
+    dict
+        The job record, with its status, outputs or errors, and timings in seconds.
+    """
+    from owslib.wps import ASYNC
+
+    record = dict(id=job_id, inputs=inputs)
+    start = submitted = time.time()
+    try:
+        # The execution is only asynchronous if the outputs are requested.
+        execution = wps.execute(
+            process,
+            inputs=wps_inputs(inputs, complex_inputs),
+            output=outputs,
+            mode=ASYNC,
+        )
+        submitted = time.time()
+        poll(execution, interval=poll_interval)
+        record.update(
+            status=execution.status,
+            statusLocation=execution.statusLocation,
+            message=(execution.statusMessage or "").strip(),
+        )
+        if execution.isSucceded():
+            record["outputs"] = get_outputs(execution)
+        else:
+            record["errors"] = [e.text for e in execution.errors]
+    except Exception as e:
+        record.update(status="Exception", message=str(e))
+    end = time.time()
+    record["timings"] = dict(
+        submit=submitted - start, run=end - submitted, total=end - start
+    )
+    return record
+
+
+@click.command()
+@click.argument("process")
+@click.option(
+    "--inputs",
+    "-i",
+    "inputs_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON lines or CSV file with one input set per line.",
+)
+@click.option(
+    "--output",
+    "-o",
+    default="-",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="File where a JSON line is written for each job. Default: standard output.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of jobs running at the same time.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip the jobs that succeeded according to the output file, and append to it.",
+)
+@click.option(
+    "--poll-interval",
+    default=1.0,
+    show_default=True,
+    help="Seconds before the first status check of a job. The interval grows up to 10 seconds.",
+)
+@click.pass_context
+def batch(ctx, process, inputs_file, output, concurrency, resume, poll_interval):
+    """Run a process for each input set of a file, concurrently."""
+    from owslib.wps import WebProcessingService
+
+    if resume and output == "-":
+        raise click.UsageError("--resume needs an --output file.")
+
+    cli = ctx.find_root().command
+    obj = ctx.obj or {}
+    local = threading.local()
+
+    def _wps():
+        # owslib clients are not shared between threads.
+        if not hasattr(local, "wps"):
+            local.wps = WebProcessingService(
+                cli.url,
+                skip_caps=True,
+                verify=obj.get("verify", True),
+                cert=obj.get("cert"),
+                headers=get_headers(obj),
+                language=obj.get("language"),
+            )
+        return local.wps
+
+    try:
+        desc = _wps().describeprocess(process)
+    except Exception as e:
+        raise click.UsageError(f"Unknown process {process}: {e}")
+    complex_inputs, outputs = process_io(desc)
+
+    jobs = list(enumerate(read_jobs(inputs_file), start=1))
+    if resume:
+        done = read_done(output)
+        jobs = [(i, inputs) for i, inputs in jobs if i not in done]
+
+    def _run(job_id, inputs):
+        return run_job(
+            _wps(), process, job_id, inputs, complex_inputs, outputs, poll_interval
+        )
+
+    failed = 0
+    out = click.open_file(output, "a" if resume else "w")
+    try:
+        with (
+            ThreadPoolExecutor(max_workers=concurrency) as executor,
+            click.progressbar(length=len(jobs), label=process, file=sys.stderr) as bar,
+        ):
+            futures = [executor.submit(_run, i, inputs) for i, inputs in jobs]
+            for future in as_completed(futures):
+                record = future.result()
+                failed += record["status"] != "ProcessSucceeded"
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                bar.update(1)
+    finally:
+        if output != "-":
+            out.close()
+
+    if failed:
+        click.echo(f"{failed} of {len(jobs)} jobs failed.", err=True)
+        ctx.exit(1)
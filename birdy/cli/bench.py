@@ -0,0 +1,469 @@
+"""
+Measure the latency and throughput of a Web Processing Service.
+
+The `birdy bench` command sends GetCapabilities, DescribeProcess and Execute requests, checks the status of
+asynchronous executions and downloads their outputs, with a number of concurrent clients and for a given duration.
+It reports the 50th, 95th and 99th percentiles of the latency of each operation, and the part of it spent by the
+client building and parsing XML documents and converting outputs.
+
+.. code-block:: console
+
+    $ birdy bench hello --input name=stranger --concurrency 4 --duration 30
+"""
+
+import itertools
+import json
+import math
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from birdy.cli.misc import get_headers, process_io
+
+OPERATIONS = ["capabilities", "describe", "execute-sync", "execute-async", "download"]
+
+
+def percentile(samples: list, q: float) -> float:
+    """
+    Return a percentile of samples with the nearest-rank method.
+
+    Parameters
+    ----------
+    samples : list of float
+        Sorted samples.
+    q : float
+        Percentile, between 0 and 100.
+
+    Returns
+    -------
+    float
+        The percentile, or NaN without samples.
+    """
+    if not samples:
+        return math.nan
+    return samples[max(math.ceil(q / 100 * len(samples)) - 1, 0)]
+
+
+class Benchmark:
+    """
+    Operations of a Web Processing Service, timed.
+
+    Each operation returns a list of `(name, latency, client)` samples, where `client` is the number of seconds
+    spent building and parsing XML documents and converting outputs.
+
+    Parameters
+    ----------
+    url : str
+        URL of the Web Processing Service.
+    process : str, optional
+        Identifier of the process described and executed.
+    inputs : list of tuple, optional
+        Inputs of the executions.
+    headers : dict, optional
+        HTTP headers sent with each request.
+    verify : bool or str
+        Whether to verify the server's TLS certificate, or the path to a CA bundle.
+    language : str, optional
+        Language of the responses.
+    poll_interval : float
+        Seconds between status checks of asynchronous executions.
+    convert : bool
+        Whether downloaded outputs are loaded with the converters of the client.
+    """
+
+    def __init__(
+        self,
+        url,
+        process=None,
+        inputs=None,
+        headers=None,
+        verify=True,
+        language=None,
+        poll_interval=0.5,
+        convert=False,
+    ):
+        self.url = url
+        self.process = process
+        self.inputs = inputs or []
+        self.headers = headers or {}
+        self.verify = verify
+        self.language = language
+        self.poll_interval = poll_interval
+        self.convert = convert
+        self.outputs = None
+        self.references = []
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        """HTTP session of the current thread."""
+        if not hasattr(self._local, "session"):
+            import requests
+
+            self._local.session = requests.Session()
+            self._local.session.headers.update(self.headers)
+            self._local.session.verify = self.verify
+        return self._local.session
+
+    def _get(self, **params):
+        params = dict(service="WPS", version="1.0.0", **params)
+        if self.language:
+            params["language"] = self.language
+        r = self.session.get(self.url, params=params, timeout=60)
+        r.raise_for_status()
+        return r.content
+
+    def _wps(self):
+        from owslib.wps import WebProcessingService
+
+        return WebProcessingService(self.url, skip_caps=True, language=self.language)
+
+    def prepare(self, operations):
+        """
+        Describe the process, and run it once if its outputs are to be downloaded.
+
+        Parameters
+        ----------
+        operations : list of str
+            The operations that will be measured.
+        """
+        if self.process is None:
+            return
+        desc = self._wps().describeprocess(
+            self.process,
+            xml=self._get(request="DescribeProcess", identifier=self.process),
+        )
+        complex_inputs, self.outputs = process_io(desc)
+        self.inputs = [
+            (key, self._complex(value) if key in complex_inputs else value)
+            for key, value in self.inputs
+        ]
+        if "download" in operations:
+            execution = self._execute(mode="sync", references=True)[0]
+            if not execution.isSucceded():
+                raise click.ClickException(f"Execution of {self.process} failed.")
+            self.references = [
+                o.reference for o in execution.processOutputs if o.reference
+            ]
+
+    @staticmethod
+    def _complex(value):
+        from owslib.wps import ComplexDataInput
+
+        return ComplexDataInput(value)
+
+    def capabilities(self):
+        """Send a GetCapabilities request."""
+        start = time.perf_counter()
+        xml = self._get(request="GetCapabilities")
+        received = time.perf_counter()
+        self._wps().getcapabilities(xml=xml)
+        end = time.perf_counter()
+        return [("capabilities", end - start, end - received)]
+
+    def describe(self):
+        """Send a DescribeProcess request for the process."""
+        start = time.perf_counter()
+        xml = self._get(request="DescribeProcess", identifier=self.process)
+        received = time.perf_counter()
+        self._wps().describeprocess(self.process, xml=xml)
+        end = time.perf_counter()
+        return [("describe", end - start, end - received)]
+
+    def _execute(self, mode, references=False):
+        """Send an Execute request, returning the execution, its latency and the time spent building and parsing."""
+        from lxml import etree
+        from owslib.wps import ASYNC, SYNC, WPSExecution
+
+        start = time.perf_counter()
+        execution = WPSExecution(
+            url=self.url, headers=self.headers, language=self.language
+        )
+        outputs = [
+            (identifier, is_ref or references)
+            for identifier, is_ref in self.outputs or []
+        ]
+        request = etree.tostring(
+            execution.buildRequest(
+                self.process,
+                self.inputs,
+                outputs or None,
+                mode=ASYNC if mode == "async" else SYNC,
+            )
+        )
+        built = time.perf_counter()
+        r = self.session.post(self.url, data=request, timeout=600)
+        r.raise_for_status()
+        received = time.perf_counter()
+        execution.request = request
+        execution.parseResponse(etree.fromstring(r.content))
+        end = time.perf_counter()
+        return execution, end - start, (built - start) + (end - received)
+
+    def execute_sync(self):
+        """Execute the process synchronously."""
+        _, latency, client = self._execute("sync")
+        return [("execute-sync", latency, client)]
+
+    def execute_async(self):
+        """Execute the process asynchronously, and check its status until it is complete."""
+        execution, latency, client = self._execute("async")
+        samples = [("execute-async", latency, client)]
+        job = time.perf_counter() - latency
+        while not execution.isComplete():
+            time.sleep(self.poll_interval)
+            start = time.perf_counter()
+            r = self.session.get(execution.statusLocation, timeout=60)
+            r.raise_for_status()
+            received = time.perf_counter()
+            execution.checkStatus(response=r.content, sleepSecs=0)
+            end = time.perf_counter()
+            samples.append(("poll", end - start, end - received))
+        samples.append(("job", time.perf_counter() - job, 0))
+        if not execution.isSucceded():
+            raise RuntimeError(f"Execution {execution.status}")
+        return samples
+
+    def download(self):
+        """Download the reference outputs of the execution made by :meth:`prepare`."""
+        from birdy.client.download import download
+
+        samples = []
+        path = Path(tempfile.mkdtemp())
+        try:
+            for url in self.references:
+                start = time.perf_counter()
+                target = download(
+                    url,
+                    path,
+                    verify=self.verify,
+                    headers=self.headers,
+                    session=self.session,
+                )
+                received = time.perf_counter()
+                if self.convert:
+                    from birdy.client.converters import convert
+
+                    convert(target, path)
+                end = time.perf_counter()
+                samples.append(("download", end - start, end - received))
+                target.unlink()
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+        return samples
+
+    def run(self, operation, concurrency=1, duration=10.0, requests=None):
+        """
+        Repeat an operation with concurrent clients.
+
+        Parameters
+        ----------
+        operation : str
+            One of :data:`OPERATIONS`.
+        concurrency : int
+            Number of clients.
+        duration : float
+            Seconds after which no more operations are started.
+        requests : int, optional
+            Maximum number of operations, over all clients.
+
+        Returns
+        -------
+        samples : dict
+            Sorted latencies and client times in seconds, keyed by name.
+        errors : list of str
+            The errors raised by the operations.
+        elapsed : float
+            Seconds spent.
+        """
+        method = getattr(self, operation.replace("-", "_"))
+        samples = defaultdict(lambda: ([], []))
+        errors = []
+        lock = threading.Lock()
+        counter = itertools.islice(itertools.count(), requests)
+        deadline = time.perf_counter() + duration
+
+        def _client():
+            while time.perf_counter() < deadline:
+                with lock:
+                    if next(counter, None) is None:
+                        return
+                try:
+                    result = method()
+                except Exception as e:
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                with lock:
+                    for name, latency, client in result:
+                        samples[name][0].append(latency)
+                        samples[name][1].append(client)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(_client) for _ in range(concurrency)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        return (
+            {name: (sorted(lat), sorted(cl)) for name, (lat, cl) in samples.items()},
+            errors,
+            elapsed,
+        )
+
+
+def summarize(samples: dict, errors: list, elapsed: float) -> dict:
+    """
+    Return the statistics of the samples of an operation.
+
+    Parameters
+    ----------
+    samples : dict
+        Sorted latencies and client times, as returned by :meth:`Benchmark.run`.
+    errors : list of str
+        Errors raised by the operation.
+    elapsed : float
+        Seconds spent.
+
+    Returns
+    -------
+    dict
+        Number of samples, throughput in requests per second, latency percentiles and median client time in
+        milliseconds, keyed by name. The number of errors and the last one are under `errors`.
+    """
+    stats = {}
+    for name, (latencies, client) in samples.items():
+        stats[name] = dict(
+            count=len(latencies),
+            rate=len(latencies) / elapsed if elapsed else math.nan,
+            p50=percentile(latencies, 50) * 1000,
+            p95=percentile(latencies, 95) * 1000,
+            p99=percentile(latencies, 99) * 1000,
+            client=percentile(client, 50) * 1000,
+        )
+    if errors:
+        stats.setdefault("errors", {})["count"] = len(errors)
+        stats["errors"]["last"] = errors[-1]
+    return stats
+
+
+@click.command()
+@click.argument("process", required=False)
+@click.option(
+    "--input",
+    "-i",
+    "inputs",
+    multiple=True,
+    metavar="NAME=VALUE",
+    help="Input of the executions. Can be repeated.",
+)
+@click.option(
+    "--operation",
+    "-O",
+    "operations",
+    multiple=True,
+    type=click.Choice(OPERATIONS),
+    help="Operation to measure. Can be repeated. Default: all, or only capabilities without a process.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of concurrent clients.",
+)
+@click.option(
+    "--duration",
+    "-d",
+    default=10.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds spent on each operation.",
+)
+@click.option(
+    "--requests",
+    "-n",
+    type=click.IntRange(min=1),
+    help="Maximum number of times each operation is repeated.",
+)
+@click.option(
+    "--poll-interval",
+    default=0.5,
+    show_default=True,
+    help="Seconds between status checks of asynchronous executions.",
+)
+@click.option(
+    "--convert",
+    is_flag=True,
+    help="Load the downloaded outputs with the converters of the client.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the results as JSON.")
+@click.pass_context
+def bench(
+    ctx,
+    process,
+    inputs,
+    operations,
+    concurrency,
+    duration,
+    requests,
+    poll_interval,
+    convert,
+    as_json,
+):
+    """Measure the latency of the requests to the service, and of a process."""
+    obj = ctx.obj or {}
+    if process is None:
+        if set(operations) - {"capabilities"}:
+            raise click.UsageError("A process is needed to measure these operations.")
+        operations = ["capabilities"]
+    operations = [op for op in OPERATIONS if op in operations] or OPERATIONS
+
+    pairs = []
+    for item in inputs:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise click.BadParameter(
+                f"Expected NAME=VALUE, got {item!r}.", param_hint="--input"
+            )
+        pairs.append((key, value))
+
+    benchmark = Benchmark(
+        ctx.find_root().command.url,
+        process,
+        inputs=pairs,
+        headers=get_headers(obj),
+        verify=obj.get("verify", True),
+        language=obj.get("language"),
+        poll_interval=poll_interval,
+        convert=convert,
+    )
+    benchmark.prepare(operations)
+
+    results = {}
+    for operation in operations:
+        stats = summarize(*benchmark.run(operation, concurrency, duration, requests))
+        results[operation] = stats
+        if not as_json:
+            _echo(stats, operation)
+    if as_json:
+        click.echo(json.dumps(results))
+
+
+def _echo(stats, operation):
+    for name, s in stats.items():
+        if name == "errors":
+            click.echo(
+                f"{operation:<14} {s['count']} errors, last: {s['last']}", err=True
+            )
+            continue
+        click.echo(
+            f"{name:<14} n={s['count']:<6} {s['rate']:8.1f} req/s  p50={s['p50']:8.1f} ms  "
+            f"p95={s['p95']:8.1f} ms  p99={s['p99']:8.1f} ms  client={s['client']:6.1f} ms"
+        )
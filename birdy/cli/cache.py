@@ -0,0 +1,198 @@
+"""
+On-disk cache of the commands of the command-line interface.
+
+The list of processes of a Web Processing Service and the compiled command of each process are kept per service URL,
+language and version of birdy, so that later invocations of `birdy` do not send GetCapabilities and DescribeProcess
+requests. Entries expire after `BIRDY_CLI_CACHE_TTL` seconds (one day by default), and `birdy --refresh` fetches them
+again.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import shutil
+import time
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from types import CodeType
+from typing import Optional, Union
+from urllib.parse import quote
+
+from birdy import __version__
+from birdy.utils import default_cache_dir
+
+DEFAULT_TTL = 24 * 3600
+
+
+class CommandCache:
+    """
+    Cache of the commands generated for a Web Processing Service.
+
+    Parameters
+    ----------
+    url : str
+        URL of the Web Processing Service.
+    language : str, optional
+        Language of the process descriptions.
+    root : str or Path, optional
+        Cache directory. Defaults to `cli` in :func:`birdy.utils.default_cache_dir`.
+    ttl : float, optional
+        Number of seconds after which entries expire. Defaults to `BIRDY_CLI_CACHE_TTL` or one day.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        language: Optional[str] = None,
+        root: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = None,
+    ):
+        # Commands generated by another version of birdy may use other options.
+        key = f"{url} {language or ''} {__version__}"
+        key = hashlib.sha256(key.encode()).hexdigest()[:16]
+        self.path = Path(root or default_cache_dir() / "cli") / key
+        if ttl is None:
+            ttl = float(os.environ.get("BIRDY_CLI_CACHE_TTL", DEFAULT_TTL))
+        self.ttl = ttl
+
+    def __repr__(self):  # noqa: D105
+        return f"CommandCache(path='{self.path}', ttl={self.ttl})"
+
+    def _fresh(self, path):
+        try:
+            return time.time() - path.stat().st_mtime < self.ttl
+        except OSError:
+            return False
+
+    def _code_path(self, name):
+        return self.path / "commands" / f"{quote(name, safe='')}.pyc"
+
+    @property
+    def expired(self) -> bool:
+        """Whether the commands of the service are missing or expired."""
+        return not self._fresh(self.path / "commands.json")
+
+    def get_commands(self, stale: bool = False) -> Optional[dict]:
+        """
+        Return the cached commands of the service.
+
+        Parameters
+        ----------
+        stale : bool
+            If True, expired commands are returned too.
+
+        Returns
+        -------
+        dict or None
+            Command information keyed by process identifier, or None if missing or expired.
+        """
+        path = self.path / "commands.json"
+        if not stale and not self._fresh(path):
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def set_commands(self, commands: dict):
+        """
+        Store the commands of the service, discarding the compiled commands.
+
+        Parameters
+        ----------
+        commands : dict
+            Command information keyed by process identifier.
+        """
+        shutil.rmtree(self.path / "commands", ignore_errors=True)
+        _write(self.path / "commands.json", json.dumps(commands).encode())
+
+    def get_code(self, name: str, stale: bool = False) -> Optional[CodeType]:
+        """
+        Return the compiled command of a process.
+
+        Parameters
+        ----------
+        name : str
+            Process identifier.
+        stale : bool
+            If True, an expired command is returned too.
+
+        Returns
+        -------
+        code or None
+            The compiled module defining the command, or None if missing, expired or compiled by another version
+            of Python.
+        """
+        path = self._code_path(name)
+        if not stale and not self._fresh(path):
+            return None
+        try:
+            data = path.read_bytes()
+            if not data.startswith(MAGIC_NUMBER):
+                return None
+            return marshal.loads(data.removeprefix(MAGIC_NUMBER))
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+    def set_code(self, name: str, code: CodeType):
+        """
+        Store the compiled command of a process.
+
+        Parameters
+        ----------
+        name : str
+            Process identifier.
+        code : code
+            The compiled module defining the command.
+        """
+        _write(self._code_path(name), MAGIC_NUMBER + marshal.dumps(code))
+
+    def claim_refresh(self, timeout: float = 60) -> bool:
+        """
+        Return whether the caller should refresh the cache, so that concurrent processes do not all refresh it.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds after which a claim is assumed to be abandoned.
+
+        Returns
+        -------
+        bool
+            True if no other process claimed the refresh in the last `timeout` seconds.
+        """
+        path = self.path / "refresh.lock"
+        try:
+            if time.time() - path.stat().st_mtime > timeout:
+                path.unlink()
+        except OSError:
+            pass
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except OSError:
+            return False
+        return True
+
+    def release_refresh(self):
+        """Release the claim of :meth:`claim_refresh`."""
+        try:
+            (self.path / "refresh.lock").unlink()
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove the cached commands of the service."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _write(path: Path, data: bytes):
+    """Atomically write a file, ignoring errors since the cache is optional."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass
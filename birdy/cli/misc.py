@@ -1,6 +1,9 @@
 # noqa: D100
 
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
 
@@ -19,6 +22,314 @@ def monitor(execution):  # noqa: D103
         click.echo("Process execution failed.")
 
 
+def get_headers(obj: dict) -> dict:
+    """
+    Return the HTTP headers of the requests to the service, from the options of the `birdy` command.
+
+    Parameters
+    ----------
+    obj : dict
+        The context object of the `birdy` command.
+
+    Returns
+    -------
+    dict
+        The headers.
+    """
+    from urllib.parse import quote
+
+    headers = {}
+    if obj.get("token"):
+        headers = {"Authorization": "Bearer {}".format(obj["token"])}
+    if obj.get("send") and obj.get("cert"):
+        with open(obj["cert"]) as fh:
+            headers = {"X-Ssl-Client-Cert": quote(fh.read())}
+    return headers
+
+
+def poll(execution, interval: float = 1, max_interval: float = 10, callback=None):
+    """
+    Check the status of an execution until it is complete, waiting longer between checks as it runs.
+
+    Parameters
+    ----------
+    execution : owslib.wps.WPSExecution
+        The execution to monitor.
+    interval : float
+        Seconds before the first status check.
+    max_interval : float
+        Maximum number of seconds between status checks.
+    callback : callable, optional
+        Called with the execution after each status check.
+    """
+    while not execution.isComplete():
+        execution.checkStatus(sleepSecs=interval)
+        interval = min(interval * 1.5, max_interval)
+        if callback is not None:
+            callback(execution)
+
+
+def process_io(process) -> tuple:
+    """
+    Return the inputs and outputs of a process that are files.
+
+    Parameters
+    ----------
+    process : owslib.wps.Process
+        Description of the process.
+
+    Returns
+    -------
+    complex_inputs : set
+        Identifiers of the inputs whose values are references to files.
+    outputs : list of tuple
+        Identifier of each output and whether it is returned as a reference.
+    """
+    from birdy.cli.base import BirdyCLI
+    from birdy.cli.types import COMPLEX
+
+    complex_inputs = {
+        inp.identifier
+        for inp in process.dataInputs
+        if BirdyCLI.get_param_type(inp) is COMPLEX
+    }
+    outputs = [
+        (out.identifier, BirdyCLI.get_param_type(out) is COMPLEX)
+        for out in process.processOutputs
+    ]
+    return complex_inputs, outputs
+
+
+def get_outputs(execution) -> dict:
+    """
+    Return the outputs of an execution.
+
+    Parameters
+    ----------
+    execution : owslib.wps.WPSExecution
+        A complete execution.
+
+    Returns
+    -------
+    dict
+        The data of literal outputs, or the reference of complex outputs, keyed by output identifier.
+    """
+    return {o.identifier: o.data or o.reference for o in execution.processOutputs}
+
+
+def download_outputs(
+    execution,
+    path,
+    obj: dict,
+    convert: bool = False,
+    max_workers: int = 4,
+    callback=None,
+) -> list:
+    """
+    Download the reference outputs of an execution concurrently, and report the throughput.
+
+    Transfers are resumed after a dropped connection, and files already downloaded with the same size and ETag
+    are kept.
+
+    Parameters
+    ----------
+    execution : owslib.wps.WPSExecution
+        A succeeded execution.
+    path : str or Path
+        Directory where the files are written.
+    obj : dict
+        The context object of the `birdy` command.
+    convert : bool
+        If True, the downloaded files are loaded with the converters of the client and printed.
+    max_workers : int
+        Maximum number of files downloaded at the same time.
+    callback : callable, optional
+        Called with the output, the path of the file, the number of bytes received and whether the file was up to
+        date, as each file is downloaded. Nothing is printed if given.
+
+    Returns
+    -------
+    list of Path
+        The downloaded files, in the order of the outputs.
+    """
+    from birdy.client.download import RateLimiter, download, url_filename
+    from birdy.exceptions import DownloadError
+
+    outputs = [o for o in execution.processOutputs if o.reference]
+    if not outputs:
+        return []
+    headers = get_headers(obj)
+
+    def _download(output):
+        meter = RateLimiter()
+        existed = os.path.exists(os.path.join(path, url_filename(output.reference)))
+        target = download(
+            output.reference,
+            path,
+            verify=obj.get("verify", True),
+            headers=headers,
+            skip_existing=True,
+            rate_limiter=meter,
+        )
+        return target, meter.received, existed and not meter.received
+
+    start = time.time()
+    files, current, received = {}, 0, 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_download, o): o for o in outputs}
+        for future in as_completed(futures):
+            output = futures[future]
+            try:
+                target, size, skipped = future.result()
+            except DownloadError as e:
+                raise click.ClickException(str(e))
+            files[output.identifier] = target
+            current += skipped
+            received += size
+            if callback is not None:
+                callback(output, target, size, skipped)
+                continue
+            state = "up to date" if skipped else f"{target.stat().st_size} bytes"
+            click.echo(f"{output.identifier}={target} ({state})")
+    elapsed = max(time.time() - start, 1e-6)
+
+    paths = [files[o.identifier] for o in outputs]
+    if callback is not None:
+        return paths
+
+    mb = received / 1e6
+    click.echo(
+        f"Downloaded {len(files) - current} of {len(files)} files, {mb:.1f} MB in {elapsed:.1f} s "
+        f"({mb / elapsed:.1f} MB/s)."
+    )
+    if convert:
+        from birdy.client.converters import convert as convert_file
+
+        for output, target in zip(outputs, paths):
+            click.echo(f"{output.identifier}: {convert_file(target, target.parent)!r}")
+    return paths
+
+
+def emit(event: str, **fields):
+    """
+    Write an event as a line of JSON to the standard output.
+
+    Parameters
+    ----------
+    event : str
+        Name of the event.
+    **fields
+        Properties of the event.
+    """
+    click.echo(json.dumps(dict(event=event, time=time.time(), **fields)))
+
+
+def watch(execution, start: float, submitted: float, interval: float = 1) -> dict:
+    """
+    Stream the status of an execution as JSON events until it is complete.
+
+    An `accepted` event is written first, followed by a `status` event each time the status, progress or message
+    changes.
+
+    Parameters
+    ----------
+    execution : owslib.wps.WPSExecution
+        The execution returned by the service.
+    start : float
+        Time at which the execution request was sent.
+    submitted : float
+        Time at which the response to the execution request was received.
+    interval : float
+        Seconds before the first status check.
+
+    Returns
+    -------
+    dict
+        Seconds spent submitting the request, queued on the service and running.
+    """
+    emit(
+        "accepted",
+        process=execution.process.identifier if execution.process else None,
+        status=execution.status,
+        statusLocation=execution.statusLocation,
+    )
+    started = None if execution.status == "ProcessAccepted" else submitted
+    last = None
+
+    def _status(execution):
+        nonlocal started, last
+        state = (
+            execution.status,
+            execution.percentCompleted,
+            (execution.statusMessage or "").strip(),
+        )
+        if started is None and execution.status != "ProcessAccepted":
+            started = time.time()
+        if state != last:
+            last = state
+            emit("status", status=state[0], percent=state[1], message=state[2])
+
+    _status(execution)
+    poll(execution, interval=interval, callback=_status)
+    end = time.time()
+    started = started or end
+    return dict(submit=submitted - start, queue=started - submitted, run=end - started)
+
+
+def report(execution, timings: dict, download_dir=None, obj=None, convert=False):
+    """
+    Write the outputs of a complete execution as JSON events, downloading them if requested.
+
+    An `output` event is written for each output, a `download` event for each downloaded file, and a final
+    `completed` event with the status, errors and timings in seconds.
+
+    Parameters
+    ----------
+    execution : owslib.wps.WPSExecution
+        A complete execution.
+    timings : dict
+        Timings returned by :func:`watch`.
+    download_dir : str, optional
+        Directory where the reference outputs are downloaded.
+    obj : dict, optional
+        The context object of the `birdy` command.
+    convert : bool
+        If True, the type of the object loaded from each downloaded file is reported.
+    """
+    timings = dict(timings)
+    if execution.isSucceded():
+        for output in execution.processOutputs:
+            emit(
+                "output",
+                identifier=output.identifier,
+                data=output.data or None,
+                reference=output.reference,
+                mimeType=output.mimeType,
+            )
+
+        if download_dir is not None:
+
+            def _downloaded(output, target, size, skipped):
+                fields = dict(identifier=output.identifier, path=str(target))
+                emit("download", bytes=size, skipped=skipped, **fields)
+                if convert:
+                    from birdy.client.converters import convert as convert_file
+
+                    value = convert_file(target, target.parent)
+                    emit("converted", type=type(value).__name__, **fields)
+
+            start = time.time()
+            download_outputs(execution, download_dir, obj or {}, callback=_downloaded)
+            timings["download"] = time.time() - start
+
+    emit(
+        "completed",
+        status=execution.status,
+        errors=[e.text for e in execution.errors],
+        timings=timings,
+    )
+
+
 def get_ssl_verify():  # noqa: D103
     value = os.environ.get("WPS_SSL_VERIFY", "True")
     if value.lower() == "true":
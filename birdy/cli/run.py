@@ -3,12 +3,14 @@
 import os
 
 import click
-from owslib.wps import WebProcessingService
 
 from birdy.cli.base import BirdyCLI
+from birdy.cli.batch import batch
+from birdy.cli.bench import bench
 from birdy.cli.misc import get_ssl_verify
+from birdy.cli.status import status
 
-CONTEXT_OBJ = dict(language=None)
+CONTEXT_OBJ = dict(language=None, refresh=False)
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"], obj=CONTEXT_OBJ)
 DEFAULT_URL = "http://localhost:5000/wps"
 
@@ -16,6 +18,8 @@ DEFAULT_URL = "http://localhost:5000/wps"
 def _show_languages(ctx, param, value):
     if not value or ctx.resilient_parsing:
         return
+    from owslib.wps import WebProcessingService
+
     url = os.environ.get("WPS_SERVICE") or DEFAULT_URL
     wps = WebProcessingService(url, verify=get_ssl_verify())
     click.echo(",".join(wps.languages.supported))
@@ -28,6 +32,22 @@ def _set_language(ctx, param, value):
     CONTEXT_OBJ["language"] = value
 
 
+def _set_refresh(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return
+    CONTEXT_OBJ["refresh"] = True
+
+
+def _build_cache(ctx, param, value):
+    if not value or ctx.resilient_parsing:
+        return
+    try:
+        ctx.command.build_cache()
+    finally:
+        ctx.command.cache.release_refresh()
+    ctx.exit()
+
+
 @click.command(
     cls=BirdyCLI, context_settings=CONTEXT_SETTINGS, url="http://localhost:5000/wps"
 )
@@ -66,6 +86,23 @@ def _set_language(ctx, param, value):
     callback=_show_languages,
     help="Show a list of accepted languages for the WPS service.",
 )
+@click.option(
+    "--refresh",
+    expose_value=False,
+    is_flag=True,
+    is_eager=True,
+    callback=_set_refresh,
+    help="Fetch the processes of the WPS service again instead of using the cached ones.",
+)
+@click.option(
+    "--build-cache",
+    expose_value=False,
+    is_flag=True,
+    is_eager=True,
+    hidden=True,
+    callback=_build_cache,
+    help="Cache the commands of all processes, used by shell completion.",
+)
 @click.pass_context
 def cli(ctx, cert, send, sync, token):
     """
@@ -95,3 +132,8 @@ def cli(ctx, cert, send, sync, token):
     ctx.obj["send"] = send
     ctx.obj["sync"] = sync
     ctx.obj["token"] = token
+
+
+cli.add_command(batch)
+cli.add_command(bench)
+cli.add_command(status)
@@ -0,0 +1,405 @@
+"""
+Watch the status of many executions.
+
+The `birdy status` command follows executions from their status locations, given as arguments or read from a journal
+file, such as the output of `birdy batch`. All executions share one polling loop: the status documents that are due
+are fetched concurrently, and each execution is checked less and less often while it runs. A terminal shows one line
+per execution with its status, progress and elapsed time, and the outputs are printed as executions succeed.
+
+.. code-block:: console
+
+    $ birdy status http://localhost:5000/outputs/1234.xml http://localhost:5000/outputs/5678.xml
+    $ birdy status --journal results.jsonl
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from birdy.cli.misc import emit, get_headers, get_outputs
+
+
+def read_journal(path: str) -> list:
+    """
+    Read the executions listed in a journal file.
+
+    Parameters
+    ----------
+    path : str
+        File with a status location per line, or JSON lines with a `statusLocation` and an optional `id`.
+
+    Returns
+    -------
+    list of tuple
+        Label and status location of each execution.
+    """
+    jobs = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    record = json.loads(line)
+                except ValueError:  # Interrupted while writing
+                    continue
+                url = record.get("statusLocation")
+                if url:
+                    jobs.append((str(record.get("id", _label(url))), url))
+            else:
+                jobs.append((_label(line), line))
+    return jobs
+
+
+def _label(url):
+    """Name an execution after its status document."""
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    return name[:-4] if name.endswith(".xml") else name
+
+
+class Job:
+    """
+    An execution followed from its status location.
+
+    Parameters
+    ----------
+    label : str
+        Name of the execution.
+    url : str
+        Status location.
+    interval : float
+        Seconds before the first status check.
+    max_failures : int
+        Number of consecutive failed checks after which the execution is given up. A client error, such as a
+        status document that does not exist, gives it up right away.
+    """
+
+    def __init__(
+        self, label: str, url: str, interval: float = 1, max_failures: int = 5
+    ):
+        from owslib.wps import WPSExecution
+
+        self.label = label
+        self.url = url
+        self.interval = interval
+        self.max_failures = max_failures
+        self.failures = 0
+        self.next_check = 0
+        self.start = time.monotonic()
+        self.end = None
+        self.error = None
+        self.execution = WPSExecution()
+        self.execution.statusLocation = url
+
+    def __repr__(self):  # noqa: D105
+        return f"Job(label={self.label!r}, url={self.url!r})"
+
+    @property
+    def status(self) -> str:
+        """Status of the execution, or `Unknown` before the first check."""
+        if self.error is not None:
+            return "Unreachable"
+        return self.execution.status or "Unknown"
+
+    @property
+    def complete(self) -> bool:
+        """Whether the execution is complete."""
+        return self.end is not None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the execution succeeded."""
+        return self.complete and self.error is None and self.execution.isSucceded()
+
+    @property
+    def errors(self) -> list:
+        """Messages of the errors of a failed execution, or of the last failed check."""
+        if self.error is not None:
+            return [self.error]
+        return [e.text for e in self.execution.errors]
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the execution was watched."""
+        return (self.end or time.monotonic()) - self.start
+
+    @property
+    def state(self) -> tuple:
+        """Status, progress and message, which are reported when they change."""
+        message = (self.execution.statusMessage or self.error or "").strip()
+        return self.status, self.execution.percentCompleted, message
+
+    def check(self, session):
+        """
+        Fetch and parse the status document.
+
+        Parameters
+        ----------
+        session : requests.Session
+            Session used to send the request.
+        """
+        import requests
+
+        try:
+            r = session.get(self.url, timeout=60)
+            r.raise_for_status()
+            # Failed executions would accumulate the same errors at each check.
+            self.execution.errors = []
+            self.execution.checkStatus(response=r.content, sleepSecs=0)
+        except Exception as e:
+            self.error = str(e)
+            self.failures += 1
+            client_error = (
+                isinstance(e, requests.HTTPError)
+                and e.response is not None
+                and 400 <= e.response.status_code < 500
+            )
+            if client_error or self.failures >= self.max_failures:
+                self.end = time.monotonic()
+            return
+        self.error = None
+        self.failures = 0
+        if self.execution.isComplete():
+            self.end = time.monotonic()
+
+
+class Dashboard:
+    """
+    Show the state of executions on the terminal.
+
+    On an interactive terminal, one line per execution is updated in place. Otherwise a line is printed each time the
+    state of an execution changes.
+
+    Parameters
+    ----------
+    jobs : list of Job
+        The executions.
+    as_json : bool
+        If True, the changes are written as JSON events instead.
+    """
+
+    def __init__(self, jobs: list, as_json: bool = False):
+        self.jobs = jobs
+        self.as_json = as_json
+        self.live = not as_json and sys.stdout.isatty()
+        self.width = max((len(job.label) for job in jobs), default=0)
+        self._states = {}
+        self._lines = 0
+
+    def _line(self, job):
+        status, percent, message = job.state
+        return f"{job.label:<{self.width}}  {status:<17} {percent:>3}%  {job.elapsed:7.1f} s  {message}"
+
+    def update(self):
+        """Show the executions whose state changed."""
+        if self.live:
+            if self._lines:
+                click.echo(f"\x1b[{self._lines}F", nl=False)
+            for job in self.jobs:
+                click.echo(f"{self._line(job)}\x1b[K")
+            self._lines = len(self.jobs)
+
+        for job in self.jobs:
+            state = job.state
+            # An execution given up after failed checks completes without a change of state.
+            if self._states.get(job) == (state, job.complete):
+                continue
+            self._states[job] = (state, job.complete)
+            if self.as_json:
+                emit(
+                    "status",
+                    job=job.label,
+                    statusLocation=job.url,
+                    status=state[0],
+                    percent=state[1],
+                    message=state[2],
+                    elapsed=job.elapsed,
+                )
+            elif not self.live:
+                click.echo(self._line(job))
+            if job.complete:
+                self.complete(job)
+
+    def complete(self, job):
+        """Show the outputs or errors of a complete execution."""
+        if self.as_json:
+            fields = dict(job=job.label, status=job.status, elapsed=job.elapsed)
+            if job.succeeded:
+                fields["outputs"] = get_outputs(job.execution)
+            else:
+                fields["errors"] = job.errors
+            emit("completed", **fields)
+        elif not self.live:
+            self.summary(job)
+
+    def summary(self, job):  # noqa: D102
+        if job.succeeded:
+            for identifier, value in get_outputs(job.execution).items():
+                click.echo(f"{job.label}: {identifier}={value}")
+        else:
+            for error in job.errors:
+                click.echo(f"{job.label}: {error}", err=True)
+
+    def close(self):
+        """Show the outputs of the executions after the live view."""
+        if self.live:
+            for job in self.jobs:
+                if job.complete:
+                    self.summary(job)
+
+
+def follow(
+    jobs,
+    headers=None,
+    verify=True,
+    max_interval=30,
+    concurrency=8,
+    once=False,
+    callback=None,
+):
+    """
+    Check the status of executions until they are all complete.
+
+    Parameters
+    ----------
+    jobs : list of Job
+        The executions.
+    headers : dict, optional
+        HTTP headers of the requests.
+    verify : bool or str
+        Whether to verify the server's TLS certificate, or the path to a CA bundle.
+    max_interval : float
+        Maximum number of seconds between two checks of an execution.
+    concurrency : int
+        Maximum number of status documents fetched at the same time.
+    once : bool
+        If True, each execution is checked only once.
+    callback : callable, optional
+        Called after each round of checks.
+    """
+    import requests
+
+    local = threading.local()
+
+    def _check(job):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            local.session.headers.update(headers or {})
+            local.session.verify = verify
+        job.check(local.session)
+
+    pending = list(jobs)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while pending:
+            now = time.monotonic()
+            due = [job for job in pending if job.next_check <= now]
+            list(executor.map(_check, due))
+            for job in due:
+                job.next_check = now + job.interval
+                job.interval = min(job.interval * 1.5, max_interval)
+            pending = [job for job in pending if not job.complete]
+            if callback is not None:
+                callback()
+            if once or not pending:
+                break
+            time.sleep(
+                max(min(job.next_check for job in pending) - time.monotonic(), 0)
+            )
+
+
+@click.command()
+@click.argument("locations", nargs=-1)
+@click.option(
+    "--journal",
+    "-j",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with a status location per line, or JSON lines with a `statusLocation`, such as the output of "
+    "`birdy batch`. Can be repeated.",
+)
+@click.option(
+    "--interval",
+    default=1.0,
+    show_default=True,
+    help="Seconds between the first checks of an execution. The interval grows as it runs.",
+)
+@click.option(
+    "--max-interval",
+    default=30.0,
+    show_default=True,
+    help="Maximum number of seconds between two checks of an execution.",
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum number of status documents fetched at the same time.",
+)
+@click.option(
+    "--max-failures",
+    default=5,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of consecutive failed checks after which an execution is given up.",
+)
+@click.option(
+    "--once", is_flag=True, help="Check each execution once, without waiting."
+)
+@click.option(
+    "--json",
+    "as_json",
+    is_flag=True,
+    help="Write the changes of status and the outputs as JSON lines.",
+)
+@click.pass_context
+def status(
+    ctx,
+    locations,
+    journal,
+    interval,
+    max_interval,
+    concurrency,
+    max_failures,
+    once,
+    as_json,
+):
+    """Watch the status of executions until they complete."""
+    entries = [(_label(url), url) for url in locations]
+    for path in journal:
+        entries += read_journal(path)
+    if not entries:
+        raise click.UsageError("No status location given.")
+
+    # An execution listed twice, e.g. after a resumed batch, is watched once.
+    urls = {}
+    for label, url in entries:
+        urls.setdefault(url, label)
+    jobs = [Job(label, url, interval, max_failures) for url, label in urls.items()]
+
+    obj = ctx.obj or {}
+    dashboard = Dashboard(jobs, as_json=as_json)
+    try:
+        follow(
+            jobs,
+            headers=get_headers(obj),
+            verify=obj.get("verify", True),
+            max_interval=max_interval,
+            concurrency=concurrency,
+            once=once,
+            callback=dashboard.update,
+        )
+    finally:
+        dashboard.close()
+
+    failed = [job for job in jobs if job.complete and not job.succeeded]
+    if failed:
+        if not as_json:
+            click.echo(f"{len(failed)} of {len(jobs)} executions failed.", err=True)
+        ctx.exit(1)
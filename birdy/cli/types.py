@@ -1,7 +1,6 @@
 # noqa: D100
 
 import click
-from owslib.wps import ComplexDataInput
 
 from birdy.utils import is_url
 
@@ -10,6 +9,8 @@ class ComplexParamType(click.ParamType):  # noqa: D101
     name = "complex"
 
     def convert(self, value, param, ctx):  # noqa: D102
+        from owslib.wps import ComplexDataInput
+
         try:
             if not is_url(value):
                 raise ValueError()
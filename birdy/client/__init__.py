@@ -121,6 +121,19 @@ The created dictionary can then be used with a process:
     >>> z = cli.output_formats(output_formats=custom_format).get()
     >>> z
 
+Conversion options
+------------------
+
+Options passed to `get(asobj=True, ...)`, or to the client with `converter_options`, tune how outputs are
+converted. For example, netCDF outputs can be opened lazily with dask, and the netCDF files of a metalink or
+zip output combined into a single dataset:
+
+.. code-block:: python
+
+    >>> wps = WPSClient("http://localhost:5000", converter_options={"chunks": {"time": 365}})
+    >>> resp = wps.subset(...)
+    >>> ds = resp.get(asobj=True, combine=True).output
+
 .. _requests Authentication: https://2.python-requests.org/en/master/user/authentication/
 .. _magpie: https://github.com/ouranosinc/magpie
 .. _requests-magpie: https://github.com/ouranosinc/requests-magpie
@@ -22,7 +22,10 @@ from owslib.wps import (
 )
 
 from birdy.client import notebook, utils
+from birdy.client.cache import OutputCache
 from birdy.client.outputs import WPSResult
+from birdy.client.prefetch import Prefetcher
+from birdy.client.workspace import Workspace
 from birdy.exceptions import UnauthorizedException
 from birdy.utils import embed, fix_url, guess_type, sanitize
 
@@ -65,6 +68,17 @@ class WPSClient:
         Passed to :class:`owslib.wps.WebProcessingService` (e.g. 'fr-CA', 'en_US').
     lineage : bool
         If True, the Execute operation includes lineage information.
+    cache : bool or OutputCache
+        Persistent cache for downloaded outputs. If True, use an :class:`OutputCache` in the default directory.
+    workspace : str or Path or Workspace, optional
+        Scratch space for downloaded and extracted files, or the directory in which to create it.
+        A workspace created by the client is removed when the client is closed or garbage collected.
+    converter_options : dict, optional
+        Default options for the conversion of outputs with `get(asobj=True)`, e.g. `{"chunks": {"time": 365}}`.
+    prefetch : bool or dict or Prefetcher, optional
+        Download the reference outputs of processes into the cache in the background as soon as they succeed.
+        A dictionary holds the arguments of :class:`Prefetcher`, e.g. `{"max_rate": 2**20, "convert": True}`.
+        If no `cache` is given, an :class:`OutputCache` in the default directory is used.
     **kwds : dict
         Passed to :class:`owslib.wps.WebProcessingService`.
 
@@ -92,10 +106,32 @@ class WPSClient:
         desc_xml=None,
         language=None,
         lineage=False,
+        cache=False,
+        workspace=None,
+        converter_options=None,
+        prefetch=None,
         **kwds,
     ):
         """Initialize WPSClient."""
         self._converters = converters
+        self._converter_options = converter_options or {}
+        if cache is True:
+            cache = OutputCache()
+        self._cache = cache or None
+        self._owns_prefetcher = prefetch is True or isinstance(prefetch, dict)
+        if self._owns_prefetcher:
+            if self._cache is None:
+                self._cache = OutputCache()
+            options = prefetch if isinstance(prefetch, dict) else {}
+            prefetch = Prefetcher(self._cache, **options)
+        elif isinstance(prefetch, Prefetcher) and self._cache is None:
+            # Outputs must be looked up in the cache the prefetcher fills.
+            self._cache = prefetch.cache
+        self._prefetcher = prefetch or None
+        self._owns_workspace = not isinstance(workspace, Workspace)
+        if self._owns_workspace:
+            workspace = Workspace(root=workspace)
+        self._workspace = workspace
         self._interactive = progress
         self._mode = ASYNC if progress else SYNC
         self._lineage = lineage
@@ -171,6 +207,19 @@ class WPSClient:
 
         self.__doc__ = utils.build_wps_client_doc(self._wps, self._processes)
 
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        self.close()
+
+    def close(self):
+        """Remove the workspace created by the client and the files downloaded in it, and stop prefetching."""
+        if self._owns_prefetcher:
+            self._prefetcher.shutdown(wait=False)
+        if self._owns_workspace:
+            self._workspace.close()
+
     @property
     def language(self):  # noqa: D102
         return self._wps.language
@@ -404,7 +453,14 @@ class WPSClient:
 
         # Add the convenience methods of WPSResult to the WPSExecution class. This adds a `get` method.
         utils.extend_instance(wps_response, WPSResult)
-        wps_response.attach(wps_outputs=self._outputs[pid], converters=self._converters)
+        wps_response.attach(
+            wps_outputs=self._outputs[pid],
+            converters=self._converters,
+            cache=self._cache,
+            workspace=self._workspace,
+            converter_options=self._converter_options,
+            prefetcher=self._prefetcher,
+        )
         return wps_response
 
     def _console_monitor(self, execution: WPSExecution, sleep: int = 3):
@@ -0,0 +1,310 @@
+"""
+Cache Module
+============
+
+Persistent on-disk cache for WPS output files, shared across sessions and processes.
+
+Files are stored once per content hash under `objects/`, and each output URL points to one of these objects
+through a small JSON record under `urls/`. When a cached URL is requested again, its `ETag` is compared to the
+server's before the local copy is used. The total size of the cache can be capped, in which case the least
+recently used objects are evicted first. File locks make it safe for several processes to share a cache directory.
+
+Example
+-------
+
+.. code-block:: python
+
+    >>> from birdy import WPSClient
+    >>> from birdy.client.cache import OutputCache
+    >>> cache = OutputCache(max_size=10 * 2**30)
+    >>> wps = WPSClient("http://localhost:5000/wps", cache=cache)
+    >>> wps.ncmeta(dataset="...").get(asobj=True)  # Downloaded only on the first call
+
+The default cache directory is `~/.cache/birdy/outputs`, or the directory set by the `BIRDY_CACHE_DIR`
+environment variable.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+from requests.exceptions import ConnectionError, Timeout
+
+from birdy.utils import default_cache_dir
+
+from .download import CHUNK_SIZE, download
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@contextlib.contextmanager
+def file_lock(path: Path, poll: float = 0.05):
+    """
+    Hold an exclusive lock on `path` across processes.
+
+    Parameters
+    ----------
+    path : Path
+        Lock file. It is created if it does not exist.
+    poll : float
+        Seconds between attempts on platforms without `fcntl`.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is not None:
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        lock = path.with_name(path.name + ".excl")
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                time.sleep(poll)
+        try:
+            yield
+        finally:
+            os.close(fd)
+            os.unlink(lock)
+
+
+def sha256sum(path: Path) -> str:
+    """
+    Return the SHA-256 hexadecimal digest of a file.
+
+    Parameters
+    ----------
+    path : Path
+        File to hash.
+
+    Returns
+    -------
+    str
+        The digest.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class OutputCache:
+    """
+    Content-addressed cache of downloaded output files with LRU eviction.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Cache directory. Defaults to `outputs` in :func:`default_cache_dir`.
+    max_size : int, optional
+        Maximum total size of the cached files in bytes. Unlimited if None.
+    validate : bool
+        If True, compare the `ETag` of cached URLs with the server's before using them.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        max_size: Optional[int] = None,
+        validate: bool = True,
+    ):
+        self.root = Path(root) if root else default_cache_dir() / "outputs"
+        self.max_size = max_size
+        self.validate = validate
+        for name in ("urls", "objects", "tmp", "locks"):
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):  # noqa: D105
+        return f"OutputCache(root='{self.root}', max_size={self.max_size})"
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Return the cache key of a URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of an output.
+
+        Returns
+        -------
+        str
+            The key.
+        """
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _record(self, url):
+        return self.root / "urls" / f"{self.key(url)}.json"
+
+    def _lock(self, name):
+        return file_lock(self.root / "locks" / name)
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """
+        Return the cached file of a URL without contacting the server.
+
+        Parameters
+        ----------
+        url : str
+            URL of an output.
+
+        Returns
+        -------
+        Path or None
+            Path to the cached file, or None if the URL is not cached.
+        """
+        try:
+            record = json.loads(self._record(url).read_text())
+        except (OSError, ValueError):
+            return None
+        path = self.root / "objects" / record["sha256"] / record["name"]
+        if not path.is_file():
+            return None
+        return path
+
+    def get(
+        self,
+        url: str,
+        verify: Union[bool, str] = True,
+        headers: Optional[dict] = None,
+        **kwargs,
+    ) -> Path:
+        """
+        Return the cached file of a URL, downloading it if needed.
+
+        Parameters
+        ----------
+        url : str
+            URL of an output.
+        verify : bool or str
+            Whether to verify the server's TLS certificate, or the path to a CA bundle.
+        headers : dict, optional
+            Additional HTTP headers.
+        **kwargs : dict
+            Passed to :func:`birdy.client.download.download`.
+
+        Returns
+        -------
+        Path
+            Path to the cached file. It must be treated as read-only.
+        """
+        key = self.key(url)
+        with self._lock(key):
+            path = self.lookup(url)
+            etag = None
+            if path is None or self.validate:
+                etag = _etag(url, verify=verify, headers=headers)
+
+            if path is not None and etag:
+                record = json.loads(self._record(url).read_text())
+                if record.get("etag") and etag != record["etag"]:
+                    path = None
+
+            if path is None:
+                path = self._fetch(url, etag, verify=verify, headers=headers, **kwargs)
+            else:
+                os.utime(path)
+
+        self.evict(keep=path)
+        return path
+
+    def _fetch(self, url, etag=None, verify=True, headers=None, **kwargs):
+        """Download `url` to a temporary directory and move it into the object store."""
+        # Partial downloads are kept here so that a later call can resume them.
+        tmp = self.root / "tmp" / self.key(url)
+        fn = download(url, tmp, verify=verify, headers=headers, **kwargs)
+        digest = sha256sum(fn)
+        target = self.root / "objects" / digest / fn.name
+        with self._lock(digest):
+            if target.is_file():
+                os.utime(target)
+            else:
+                target.parent.mkdir(exist_ok=True)
+                os.replace(fn, target)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+        record = dict(url=url, etag=etag, sha256=digest, name=target.name)
+        _write_json(self._record(url), record)
+        return target
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached files."""
+        return sum(f.stat().st_size for _, f in self._objects())
+
+    def _objects(self):
+        for d in (self.root / "objects").iterdir():
+            for f in d.iterdir():
+                yield d, f
+
+    def evict(self, keep: Optional[Path] = None):
+        """
+        Remove the least recently used files until the cache fits in `max_size`.
+
+        Parameters
+        ----------
+        keep : Path, optional
+            A cached file that must not be evicted.
+        """
+        if self.max_size is None:
+            return
+
+        with self._lock("evict"):
+            # Files with the same content share an object directory and are evicted together.
+            entries = {}
+            for d, f in self._objects():
+                st = f.stat()
+                mtime, size, files = entries.get(d, (0, 0, []))
+                entries[d] = (max(mtime, st.st_mtime), size + st.st_size, files + [f])
+
+            total = sum(size for _, size, _ in entries.values())
+            for d, (_, size, files) in sorted(entries.items(), key=lambda e: e[1][0]):
+                if total <= self.max_size:
+                    break
+                if keep in files:
+                    continue
+                with self._lock(d.name):
+                    shutil.rmtree(d, ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        """Remove every file from the cache."""
+        with self._lock("evict"):
+            for name in ("urls", "objects"):
+                shutil.rmtree(self.root / name, ignore_errors=True)
+                (self.root / name).mkdir()
+
+
+def _etag(url, verify=True, headers=None):
+    """Return the ETag of a remote file, or None if unavailable."""
+    if not url.startswith(("http://", "https://")):
+        return None
+    try:
+        r = requests.head(
+            url, verify=verify, headers=headers, timeout=5, allow_redirects=True
+        )
+    except (ConnectionError, Timeout):
+        return None
+    return r.headers.get("ETag") if r.ok else None
+
+
+def _write_json(path, obj):
+    """Atomically write a JSON file."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(obj))
+    os.replace(tmp, path)
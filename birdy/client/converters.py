@@ -1,15 +1,31 @@
+import mmap
+import os
 import tempfile
-from collections.abc import Sequence
-from importlib import import_module
+import warnings
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from importlib import import_module, metadata
 from pathlib import Path
-from typing import Optional, Union
+from typing import BinaryIO, Optional, Union
 
+import requests
 from owslib.wps import Output
 from packaging.version import Version
 
-from birdy.utils import is_opendap_url
+from birdy.utils import is_opendap_url, is_remote
 
+from . import metalink
 from . import notebook as nb
+from .cache import OutputCache
+from .download import CHUNK_SIZE, accepts_ranges, download
+
+ENTRY_POINT_GROUP = "birdy.converters"
+
+# Outcome of `check_dependencies` for each converter class, computed once per process.
+_dependency_errors = {}
+
+# Converter indexes keyed by the tuple of converter classes they were built from.
+_indexes = {}
 
 
 class BaseConverter:  # noqa: D101
@@ -18,11 +34,18 @@ class BaseConverter:  # noqa: D101
     priority = None
     nested = False
 
+    def __init_subclass__(cls, **kwargs):
+        """Invalidate the converter indexes when a new converter is defined."""
+        super().__init_subclass__(**kwargs)
+        _indexes.clear()
+
     def __init__(
         self,
         output: Output = None,
         path: Optional[Union[str, Path]] = None,
         verify: bool = True,
+        cache: Optional[OutputCache] = None,
+        options: Optional[dict] = None,
     ) -> None:
         """Instantiate the conversion class.
 
@@ -30,17 +53,27 @@ class BaseConverter:  # noqa: D101
         ----------
         output : owslib.wps.Output
             Output object to be converted.
+        path : str or Path, optional
+            Directory where downloaded and extracted files are stored.
+        verify : bool
+            Whether to verify the server's TLS certificate.
+        cache : OutputCache, optional
+            Persistent cache through which remote files are resolved.
+        options : dict, optional
+            Conversion options. Each converter picks the options it understands and ignores the others.
         """
         self.path = path or tempfile.mkdtemp()
         self.output = output
         self.verify = verify
-        self.check_dependencies()
+        self.cache = cache
+        self.options = options or {}
+        self._check_dependencies_once()
         if isinstance(output, Output):
             self.url = output.reference
             self._file = None
         elif isinstance(output, (str, Path)):
             self.url = output
-            self._file = Path(output)
+            self._file = None if is_remote(output) else Path(output)
         else:
             raise NotImplementedError()
 
@@ -48,21 +81,111 @@ class BaseConverter:  # noqa: D101
     def file(self):
         """Return the output Path object. Download from server if not found."""
         if self._file is None:
-            self.output.writeToDisk(path=self.path, verify=self.verify)
-            self._file = Path(self.output.filePath)
+            if self.cache is not None:
+                self._file = self.cache.get(self.url, verify=self.verify)
+            else:
+                self._file = download(self.url, self.path, verify=self.verify)
         return self._file
 
     @property
     def data(self):
         """Return the data from the remote output in memory."""
-        if self._file is not None:
-            return self.file.read_bytes()
-        else:
+        if self._file is None and isinstance(self.output, Output):
             return self.output.retrieveData()
+        else:
+            return self.file.read_bytes()
+
+    def memoryview(self) -> memoryview:
+        """
+        Return a read-only view of the output file, memory-mapped rather than copied in memory.
+
+        The file is downloaded first if needed.
+
+        Returns
+        -------
+        memoryview
+            A read-only view of the file's bytes.
+        """
+        with open(self.file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def stream(self) -> BinaryIO:
+        """
+        Return a binary file object reading the output.
+
+        Remote outputs that have not been downloaded are read directly from the server's response.
+
+        Returns
+        -------
+        file object
+            A readable binary file object. It should be closed after use.
+        """
+        if self._file is None and self.cache is not None:
+            self._file = self.cache.lookup(self.url)
+        if self._file is not None:
+            return open(self._file, "rb")
+
+        r = requests.get(self.url, stream=True, verify=self.verify, timeout=30)
+        r.raise_for_status()
+        r.raw.decode_content = True
+        return r.raw
+
+    def fetch_small(self) -> Optional[bytes]:
+        """
+        Return the content of a remote output if it is smaller than the `memory_threshold` option.
+
+        The output is read in memory without being written to disk. Nothing is returned if the option is not set,
+        if the output is local, already downloaded or resolved through a cache, or if it is larger than the threshold.
+
+        Returns
+        -------
+        bytes or None
+            The content of the output, or None if it should be downloaded instead.
+        """
+        threshold = self.options.get("memory_threshold")
+        if (
+            threshold is None
+            or self._file is not None
+            or self.cache is not None
+            or not is_remote(self.url)
+        ):
+            return None
+
+        try:
+            with requests.get(
+                self.url, stream=True, verify=self.verify, timeout=30
+            ) as r:
+                size = r.headers.get("Content-Length")
+                if not r.ok or (size is not None and int(size) > threshold):
+                    return None
+                chunks, total = [], 0
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    total += len(chunk)
+                    if total > threshold:
+                        return None
+                    chunks.append(chunk)
+        except requests.RequestException:
+            return None
+        return b"".join(chunks)
 
     def check_dependencies(self):  # noqa: D102
         pass
 
+    def _check_dependencies_once(self):
+        """Run `check_dependencies` the first time this class is instantiated, and replay its outcome afterwards."""
+        cls = type(self)
+        if cls not in _dependency_errors:
+            try:
+                self.check_dependencies()
+                _dependency_errors[cls] = None
+            except ImportError as e:
+                _dependency_errors[cls] = e
+        error = _dependency_errors[cls]
+        if error is not None:
+            raise type(error)(*error.args)
+
     def _check_import(self, name: str, package: Optional[str] = None):
         """Check if libraries can be imported.
 
@@ -84,11 +207,24 @@ class BaseConverter:  # noqa: D101
         raise NotImplementedError()
 
 
-class GenericConverter(BaseConverter):  # noqa: D101
+class GenericConverter(BaseConverter):
+    """
+    Return the raw content of outputs.
+
+    By default, the content is returned as bytes. With the `buffer` option set to "mmap", a read-only
+    :class:`memoryview` over the memory-mapped file is returned instead, and with "stream", a binary file object.
+    Neither copies the whole output in memory.
+    """
+
     priority = 0
 
     def convert(self):
         """Return raw bytes memory representation."""
+        buffer = self.options.get("buffer")
+        if buffer == "mmap":
+            return self.memoryview()
+        if buffer == "stream":
+            return self.stream()
         return self.data
 
 
@@ -118,7 +254,15 @@ class TextConverter(BaseConverter):  # noqa: D101
 #         IPython.display.display(w)
 
 
-class JSONConverter(BaseConverter):  # noqa: D101
+class JSONConverter(BaseConverter):
+    """
+    Load JSON outputs.
+
+    With the `stream` option, the document is parsed incrementally with `ijson` and an iterator is returned,
+    over the items of a top-level array or the `(key, value)` pairs of a top-level object. With the `columnar`
+    option, a top-level array of objects is loaded as a dictionary of lists, one per key.
+    """
+
     mimetypes = ["application/json"]
     extensions = ["json"]
     priority = 1
@@ -126,11 +270,39 @@ class JSONConverter(BaseConverter):  # noqa: D101
     def convert(self):  # noqa: D102
         import json
 
+        if self.options.get("stream") or self.options.get("columnar"):
+            self._check_import("ijson")
+            items = self._iter_items()
+            if self.options.get("columnar"):
+                return _columns(items)
+            return items
+
         with open(self.file) as f:
             return json.load(f)
 
+    def _iter_items(self):
+        import ijson
+
+        with open(self.file, "rb") as f:
+            first = f.read(64).lstrip()[:1]
+            f.seek(0)
+            if first == b"{":
+                yield from ijson.kvitems(f, "", use_float=True)
+            else:
+                yield from ijson.items(f, "item", use_float=True)
+
+
+class GeoJSONConverter(JSONConverter):
+    """
+    Load GeoJSON outputs.
+
+    With the `stream` option, the features of a feature collection are parsed incrementally with `ijson` and
+    an iterator over :class:`geojson.Feature` objects is returned, so that memory use is bounded by the size of
+    one feature. With the `columnar` option, the features are loaded as a dictionary holding the list of `id`,
+    the list of `geometry` and, under `properties`, a list per property. Other JSON documents are streamed as
+    by :class:`JSONConverter`.
+    """
 
-class GeoJSONConverter(BaseConverter):  # noqa: D101
     mimetypes = ["application/geo+json", "application/vnd.geo+json"]
     extensions = ["json", "geojson"]
     priority = 2
@@ -141,11 +313,73 @@ class GeoJSONConverter(BaseConverter):  # noqa: D101
     def convert(self):  # noqa: D102
         import geojson
 
+        if self.options.get("stream") or self.options.get("columnar"):
+            self._check_import("ijson")
+            if self._sniff_type() != "FeatureCollection":
+                return super().convert()
+            if self.options.get("columnar"):
+                return _feature_columns(self._iter_features(raw=True))
+            return self._iter_features()
+
         with open(self.file) as f:
             return geojson.load(f)
 
+    def _sniff_type(self) -> Optional[str]:
+        """Return the `type` member of the top-level object, without loading the document."""
+        import ijson
+
+        with open(self.file, "rb") as f:
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "" and event not in ("start_map", "map_key"):
+                    return None
+                if prefix == "type":
+                    return value if event == "string" else None
+        return None
+
+    def _iter_features(self, raw=False):
+        import geojson
+        import ijson
+
+        with open(self.file, "rb") as f:
+            for feature in ijson.items(f, "features.item", use_float=True):
+                yield feature if raw else geojson.GeoJSON.to_instance(feature)
+
+
+def _columns(records):
+    """Collect an iterable of dictionaries into a dictionary of equal-length lists."""
+    columns = {}
+    for n, record in enumerate(records, 1):
+        for key in record.keys() - columns.keys():
+            columns[key] = [None] * (n - 1)
+        for key, column in columns.items():
+            column.append(record.get(key))
+    return columns
+
+
+def _feature_columns(features):
+    """Collect an iterable of GeoJSON features into lists of ids, geometries and property values."""
+    ids, geometries = [], []
+
+    def split(features):
+        for feature in features:
+            ids.append(feature.get("id"))
+            geometries.append(feature.get("geometry"))
+            yield feature.get("properties") or {}
+
+    properties = _columns(split(features))
+    return {"id": ids, "geometry": geometries, "properties": properties}
+
+
+class MetalinkConverter(BaseConverter):
+    """
+    Download the files listed in a Metalink 3.0 or 4.0 document.
+
+    Files are downloaded concurrently, from their mirrors in order of preference, and verified against the
+    hashes of the document. The `max_workers` option bounds the number of concurrent downloads (default 4), and
+    `segments` splits each file into byte ranges fetched in parallel (default 1). With `as_completed`, a
+    generator yielding each converted file as soon as it is downloaded is returned instead of the list of files.
+    """
 
-class MetalinkConverter(BaseConverter):  # noqa: D101
     mimetypes = [
         "application/metalink+xml; version=3.0",
         "application/metalink+xml; version=4.0",
@@ -154,14 +388,25 @@ class MetalinkConverter(BaseConverter):  # noqa: D101
     nested = True
     priority = 1
 
-    def check_dependencies(self):  # noqa: D102
-        self._check_import("metalink.download")
-
     def convert(self):  # noqa: D102
-        from metalink import download as md
-
-        files = md.get(self.url, path=self.path, segmented=False)
-        return files
+        files = metalink.parse(self.file)
+        results = metalink.download_files(
+            files,
+            self.path,
+            max_workers=self.options.get("max_workers", 4),
+            segments=self.options.get("segments", 1),
+            verify=self.verify,
+        )
+        if self.options.get("as_completed"):
+            return self._iter_converted(results)
+
+        paths = dict(results)
+        return [str(paths[i]) for i in range(len(files))]
+
+    def _iter_converted(self, results):
+        options = {k: v for k, v in self.options.items() if k != "as_completed"}
+        for _, fn in results:
+            yield convert(fn, self.path, verify=self.verify, options=options)
 
 
 class Netcdf4Converter(BaseConverter):  # noqa: D101
@@ -184,28 +429,116 @@ class Netcdf4Converter(BaseConverter):  # noqa: D101
         if is_opendap_url(self.url):
             return netCDF4.Dataset(self.url)
 
+        # Open small files in memory
+        data = self.fetch_small()
+        if data is not None:
+            return self.open_memory(data)
+
         # Download the file and open the local copy
         return netCDF4.Dataset(self.file)
 
+    def open_memory(self, data: bytes):
+        """
+        Open a netCDF file held in memory.
+
+        Parameters
+        ----------
+        data : bytes
+            Content of the netCDF file.
+
+        Returns
+        -------
+        netCDF4.Dataset
+            The dataset.
+        """
+        import netCDF4
+
+        return netCDF4.Dataset(Path(str(self.url)).name, memory=data)
+
+
+class XarrayConverter(BaseConverter):
+    """
+    Open netCDF outputs as :class:`xarray.Dataset`.
+
+    The `chunks`, `engine`, `decode_times` and `cache` options are passed to :func:`xarray.open_dataset`.
+    Remote files smaller than the `memory_threshold` option (in bytes) are opened in memory without being
+    written to disk.
+    Setting `chunks` opens the dataset lazily with dask, so that it can be processed out of core.
+    With the `combine` option, the netCDF files of nested outputs (metalink or zip) are opened as a single
+    dataset with :func:`xarray.open_mfdataset`, in parallel unless `parallel` is False.
+    """
 
-class XarrayConverter(BaseConverter):  # noqa: D101
     mimetypes = ["application/x-netcdf"]
     extensions = ["nc", "nc4"]
     priority = 2
+    open_options = ("chunks", "engine", "decode_times", "cache")
 
     def check_dependencies(self):  # noqa: D102
         Netcdf4Converter.check_dependencies(self)
         self._check_import("xarray")
 
+    def _open_kwargs(self):
+        return {k: self.options[k] for k in self.open_options if k in self.options}
+
     def convert(self):  # noqa: D102
         import xarray as xr
 
         # Try to access with OpenDAP url to avoid a download
         if is_opendap_url(self.url):
-            return xr.open_dataset(self.url)
+            return xr.open_dataset(self.url, **self._open_kwargs())
+
+        # Open small files in memory
+        data = self.fetch_small()
+        if data is not None:
+            return self.open_memory(data)
 
         # Download the file and open the local copy
-        return xr.open_dataset(self.file)
+        return xr.open_dataset(self.file, **self._open_kwargs())
+
+    def open_memory(self, data: bytes):
+        """
+        Open a netCDF file held in memory.
+
+        Parameters
+        ----------
+        data : bytes
+            Content of the netCDF file.
+
+        Returns
+        -------
+        xarray.Dataset
+            The dataset.
+        """
+        import xarray as xr
+
+        nc = Netcdf4Converter.open_memory(self, data)
+        kwargs = self._open_kwargs()
+        kwargs.pop("engine", None)
+        return xr.open_dataset(xr.backends.NetCDF4DataStore(nc), **kwargs)
+
+    def open_mfdataset(self, files: Sequence[Union[str, Path]]):
+        """
+        Open several netCDF files as a single dataset.
+
+        Parameters
+        ----------
+        files : sequence of str or Path
+            Paths to the netCDF files.
+
+        Returns
+        -------
+        xarray.Dataset
+            The combined dataset.
+        """
+        import xarray as xr
+
+        kwargs = self._open_kwargs()
+        kwargs.setdefault("chunks", {})
+        return xr.open_mfdataset(
+            [str(f) for f in files],
+            parallel=self.options.get("parallel", True),
+            **kwargs,
+        )
 
 
 # TODO: Add test for this.
@@ -254,7 +587,16 @@ class ImageConverter(BaseConverter):  # noqa: D101
         return IPython.display.Image(self.url)
 
 
-class GeotiffRioxarrayConverter(BaseConverter):  # noqa: D101
+class GeotiffRioxarrayConverter(BaseConverter):
+    """
+    Open GeoTIFF outputs as :class:`xarray.DataArray`.
+
+    Remote files served with HTTP range support, such as cloud-optimized GeoTIFFs, are opened in place through
+    GDAL's `/vsicurl/`, so that only the windows that are read are transferred. If dask is installed, the array is
+    chunked along the internal tiles of the file, or with the `chunks` option. Set the `remote` option to False to
+    download the whole file instead, which is also done for servers without range support.
+    """
+
     mimetypes = ["image/tiff; subtype=geotiff"]
     extensions = ["tiff", "tif"]
     priority = 3
@@ -266,8 +608,45 @@ class GeotiffRioxarrayConverter(BaseConverter):  # noqa: D101
         import xarray  # isort: skip
         import rioxarray  # noqa
 
+        path = self.vsicurl()
+        if path is not None:
+            return rioxarray.open_rasterio(path, chunks=self._chunks())
+
         return xarray.open_dataarray(self.file, engine="rasterio")
 
+    def vsicurl(self) -> Optional[str]:
+        """
+        Return the GDAL `/vsicurl/` path of the output if it can be read remotely.
+
+        Returns
+        -------
+        str or None
+            The path, or None if the output is local, already downloaded or cached, if the server does not accept
+            range requests, or if the `remote` option is False.
+        """
+        if (
+            not self.options.get("remote", True)
+            or self._file is not None
+            or not is_remote(self.url)
+        ):
+            return None
+        if self.cache is not None and self.cache.lookup(self.url) is not None:
+            return None
+        # GDAL does not share the TLS settings of `requests`, so unverified servers are downloaded from.
+        if self.verify is not True or not accepts_ranges(self.url):
+            return None
+        return f"/vsicurl/{self.url}"
+
+    def _chunks(self):
+        """Return the `chunks` option, defaulting to the internal tiles of the file when dask is available."""
+        if "chunks" in self.options:
+            return self.options["chunks"]
+        try:
+            import_module("dask.array")
+        except ImportError:
+            return None
+        return True
+
 
 # TODO: Add test for this.
 class GeotiffGdalConverter(BaseConverter):  # noqa: D101
@@ -285,7 +664,14 @@ class GeotiffGdalConverter(BaseConverter):  # noqa: D101
         return lambda x: gdal.Open(io.BytesIO(x))
 
 
-class ZipConverter(BaseConverter):  # noqa: D101
+class ZipConverter(BaseConverter):
+    """
+    Extract zip outputs and convert their members.
+
+    With the `lazy` option, the archive is not extracted. A :class:`ZipArchive` is returned instead,
+    which converts members on demand.
+    """
+
     mimetypes = ["application/zip"]
     extensions = ["zip"]
     nested = True
@@ -294,24 +680,306 @@ class ZipConverter(BaseConverter):  # noqa: D101
     def convert(self):  # noqa: D102
         import zipfile
 
+        if self.options.get("lazy"):
+            return ZipArchive(self.file, path=self.path, options=self.options)
+
         with zipfile.ZipFile(self.file) as z:
             z.extractall(path=self.path)
             return [str(Path(self.path) / fn) for fn in z.namelist()]
 
 
+class ZipArchive(Mapping):
+    """
+    Read-only mapping from the members of a zip archive to their converted objects.
+
+    Members are only read, extracted or converted when they are accessed. NetCDF members are opened from memory
+    and GeoTIFF members through GDAL's `/vsizip/` file system, without being written to disk. Other members are
+    extracted individually before being converted.
+
+    Parameters
+    ----------
+    file : str or Path
+        Path to the zip archive.
+    path : str or Path, optional
+        Directory where members are extracted.
+    converters : sequence of BaseConverter subclasses, optional
+        Converter classes to search within for a match.
+    options : dict, optional
+        Conversion options.
+
+    Examples
+    --------
+    >>> archive = resp.get(asobj=True, lazy=True).output
+    >>> archive.members
+    ['tas_2000.tif', 'tas_2001.tif', ...]
+    >>> da = archive["tas_2001.tif"]
+    """
+
+    def __init__(
+        self,
+        file: Union[str, Path],
+        path: Optional[Union[str, Path]] = None,
+        converters: Optional[Sequence[type]] = None,
+        options: Optional[dict] = None,
+    ):
+        import zipfile
+
+        self.file = Path(file)
+        self.path = Path(path or tempfile.mkdtemp())
+        self.converters = converters
+        self.options = {k: v for k, v in (options or {}).items() if k != "lazy"}
+        self._zip = zipfile.ZipFile(self.file)
+        self._extracted = {}
+
+    def __repr__(self):  # noqa: D105
+        return f"ZipArchive('{self.file}', members={len(self)})"
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        self.close()
+
+    def __getitem__(self, name):  # noqa: D105
+        self._zip.getinfo(name)  # Raises a KeyError for unknown members.
+        return self.convert(name)
+
+    def __iter__(self):  # noqa: D105
+        return iter(self.members)
+
+    def __len__(self):  # noqa: D105
+        return len(self.members)
+
+    @property
+    def members(self) -> list:
+        """Names of the files in the archive."""
+        return [i.filename for i in self._zip.infolist() if not i.is_dir()]
+
+    def open(self, name: str) -> BinaryIO:
+        """
+        Return a binary file object streaming a member from the archive.
+
+        Parameters
+        ----------
+        name : str
+            Member name.
+
+        Returns
+        -------
+        file object
+            A readable binary file object.
+        """
+        return self._zip.open(name)
+
+    def read(self, name: str) -> bytes:
+        """
+        Return the content of a member.
+
+        Parameters
+        ----------
+        name : str
+            Member name.
+
+        Returns
+        -------
+        bytes
+            The member's content.
+        """
+        return self._zip.read(name)
+
+    def extract(self, name: str) -> Path:
+        """
+        Extract a single member to disk.
+
+        Parameters
+        ----------
+        name : str
+            Member name.
+
+        Returns
+        -------
+        Path
+            Path to the extracted file.
+        """
+        if name not in self._extracted:
+            self._extracted[name] = Path(self._zip.extract(name, path=self.path))
+        return self._extracted[name]
+
+    def vsipath(self, name: str) -> str:
+        """
+        Return the GDAL virtual file system path of a member.
+
+        Parameters
+        ----------
+        name : str
+            Member name.
+
+        Returns
+        -------
+        str
+            A `/vsizip/` path that GDAL-based libraries can open without extraction.
+        """
+        return f"/vsizip/{self.file.resolve()}/{name}"
+
+    def convert(self, name: str):
+        """
+        Convert a member to a Python object.
+
+        Parameters
+        ----------
+        name : str
+            Member name.
+
+        Returns
+        -------
+        Any
+            Python object or the member's content as bytes.
+        """
+        for cls in find_converter(name, self.converters):
+            try:
+                converter = cls(
+                    str(self.path / name), path=self.path, options=self.options
+                )
+                if isinstance(converter, (Netcdf4Converter, XarrayConverter)):
+                    return converter.open_memory(self.read(name))
+                if isinstance(converter, GeotiffRioxarrayConverter):
+                    converter._file = self.vsipath(name)
+                else:
+                    converter._file = self.extract(name)
+
+                out = converter.convert()
+                if converter.nested and isinstance(out, list):
+                    out = [
+                        convert(o, self.path, self.converters, options=self.options)
+                        for o in out
+                    ]
+                return out
+
+            except (ImportError, NotImplementedError):
+                pass
+
+    def close(self):
+        """Close the archive."""
+        self._zip.close()
+
+
+class ConverterIndex:
+    """
+    Lookup table from mimetypes and file extensions to converters ordered by priority.
+
+    Parameters
+    ----------
+    converters : sequence of BaseConverter subclasses
+        Converter classes to index.
+    """
+
+    def __init__(self, converters: Sequence[type]):
+        self.converters = tuple(converters)
+        self.mimetypes = defaultdict(set)
+        self.extensions = defaultdict(set)
+        for obj in self.converters:
+            for mimetype in obj.mimetypes:
+                self.mimetypes[mimetype].add(obj)
+            for extension in obj.extensions:
+                self.extensions[extension].add(obj)
+        self._found = {}
+
+    def find(self, mimetype: Optional[str] = None, extension: Optional[str] = None):
+        """
+        Return a list of compatible converters ordered by priority.
+
+        Parameters
+        ----------
+        mimetype : str, optional
+            Mimetype of the output.
+        extension : str, optional
+            File extension of the output, without the leading dot.
+
+        Returns
+        -------
+        list
+            Compatible converters, with :class:`GenericConverter` as a last resort.
+        """
+        key = (mimetype, extension)
+        if key not in self._found:
+            select = self.mimetypes.get(mimetype, set()) | self.extensions.get(
+                extension, set()
+            )
+            select = [GenericConverter] + sorted(
+                select, key=lambda x: self.converters.index(x)
+            )
+            select.sort(key=lambda x: x.priority, reverse=True)
+            self._found[key] = select
+        return list(self._found[key])
+
+
+def load_entry_points() -> list:
+    """
+    Import the converters registered by third-party packages.
+
+    Packages register converters, i.e. subclasses of :class:`BaseConverter`, under the `birdy.converters`
+    entry point group, for example in `setup.py`:
+
+    .. code-block:: python
+
+        entry_points={"birdy.converters": ["shp = mypackage.converters:ShapefileConverter"]}
+
+    Returns
+    -------
+    list
+        The converter classes that could be loaded.
+    """
+    try:
+        eps = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python < 3.10
+        eps = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+
+    loaded = []
+    for ep in eps:
+        try:
+            loaded.append(ep.load())
+        except Exception as e:
+            warnings.warn(f"Could not load converter entry point {ep.name}: {e}")
+    return loaded
+
+
+def get_index(converters: Optional[Sequence[type]] = None) -> ConverterIndex:
+    """
+    Return the index of a sequence of converters, building it only once.
+
+    Parameters
+    ----------
+    converters : sequence of BaseConverter subclasses, optional
+        Converter classes to index. Defaults to all subclasses of :class:`BaseConverter`,
+        including those registered through entry points.
+
+    Returns
+    -------
+    ConverterIndex
+        The converter index.
+    """
+    if converters is None:
+        if None not in _indexes:
+            load_entry_points()
+            # Loading entry points may define new converters, which clears the indexes.
+            _indexes[None] = ConverterIndex(
+                sorted(all_subclasses(BaseConverter), key=lambda c: c.__name__)
+            )
+        return _indexes[None]
+
+    key = tuple(converters)
+    if key not in _indexes:
+        _indexes[key] = ConverterIndex(key)
+    return _indexes[key]
+
+
 def _find_converter(mimetype=None, extension=None, converters=()):
     """Return a list of compatible converters ordered by priority."""
-    select = [GenericConverter]
-    for obj in converters:
-        if (mimetype in obj.mimetypes) or (extension in obj.extensions):
-            select.append(obj)
-
-    select.sort(key=lambda x: x.priority, reverse=True)
-    return select
+    return get_index(converters).find(mimetype, extension)
 
 
 def find_converter(
-    obj: Union[Output, str, Path], converters: Sequence[BaseConverter]
+    obj: Union[Output, str, Path], converters: Optional[Sequence[BaseConverter]] = None
 ) -> list:
     """
     Find converters for a WPS output or a file on disk.
@@ -320,8 +988,8 @@ def find_converter(
     ----------
     obj : owslib.wps.Output or str or Path
         Object to convert.
-    converters : sequence of BaseConverter subclasses
-        Converter classes to search within for a match.
+    converters : sequence of BaseConverter subclasses, optional
+        Converter classes to search within for a match. Defaults to all known converters.
 
     Returns
     -------
@@ -345,6 +1013,8 @@ def convert(
     path: Union[str, Path],
     converters: Sequence[BaseConverter] = None,
     verify: bool = True,
+    cache: Optional[OutputCache] = None,
+    options: Optional[dict] = None,
 ):
     """
     Convert a file to an object.
@@ -359,15 +1029,21 @@ def convert(
         Converter classes to search within for a match.
     verify : bool
         Whether to perform verification. Default: True.
+    cache : OutputCache, optional
+        Persistent cache through which remote files are resolved.
+    options : dict, optional
+        Conversion options passed to the converters, e.g. `chunks` for :class:`XarrayConverter`.
+        If `combine` is True, the netCDF files of a nested output are combined into a single dataset.
+        If `buffer` is "mmap" or "stream", outputs without a specific converter are returned as a memory-mapped
+        :class:`memoryview` or a file object instead of bytes.
+        Remote netCDF files smaller than `memory_threshold` bytes are opened in memory.
 
     Returns
     -------
     Any
         Python object or file's content as bytes.
     """
-    # Get all converters
-    if converters is None:
-        converters = all_subclasses(BaseConverter)
+    options = options or {}
 
     # Find converters matching mime type or extension.
     convs = find_converter(output, converters)
@@ -375,14 +1051,29 @@ def convert(
     # Try converters in order of priority
     for cls in convs:
         try:
-            converter = cls(output, path=path, verify=verify)
+            converter = cls(
+                output, path=path, verify=verify, cache=cache, options=options
+            )
             out = converter.convert()
-            if converter.nested:  # Then the output is a list of files.
-                out = [convert(o, path) for o in out]
-            return out
-
         except (ImportError, NotImplementedError):
-            pass
+            continue
+
+        # Then the output is a list of files, unless the converter returned a lazy view.
+        if converter.nested and isinstance(out, list):
+            # Combining was requested explicitly, so a missing dependency is an error rather than a fallback.
+            if options.get("combine") and _all_netcdf(out):
+                return XarrayConverter(
+                    out[0], path=path, options=options
+                ).open_mfdataset(out)
+            out = [convert(o, path, cache=cache, options=options) for o in out]
+        return out
+
+
+def _all_netcdf(files):
+    """Return whether a non-empty list of files only holds netCDF files."""
+    return bool(files) and all(
+        Path(f).suffix[1:] in XarrayConverter.extensions for f in files
+    )
 
 
 def all_subclasses(cls: object) -> set:
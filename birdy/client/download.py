@@ -0,0 +1,524 @@
+"""
+Download Module
+===============
+
+Streaming download engine for WPS output references.
+
+Files are written to disk in fixed-size chunks so memory stays bounded whatever the size of the output.
+Partial downloads are kept next to the target file with a `.part` suffix and resumed with HTTP `Range`
+requests after a dropped connection. The ETag of a partial download is recorded next to it and sent in an
+`If-Range` header, so that a file that changed on the server since is downloaded again from the start.
+The received size is checked against the server's `Content-Length`, and an optional checksum can be
+verified once the transfer is complete. Large files can also be split into several byte ranges fetched
+in parallel.
+
+Example
+-------
+
+.. code-block:: python
+
+    >>> from birdy.client.download import download
+    >>> download("http://localhost:5000/outputs/out.nc", "/tmp", segments=4)
+    PosixPath('/tmp/out.nc')
+"""
+
+import hashlib
+import json
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+
+from birdy.exceptions import DownloadError
+
+CHUNK_SIZE = 1024 * 1024  # 1 MiB
+PART_SUFFIX = ".part"
+# Response headers compared to decide whether a file on disk is up to date.
+VALIDATORS = ("ETag", "Last-Modified", "Content-Length")
+
+
+def url_filename(url: str, default: str = "output") -> str:
+    """
+    Return the file name from the path of a URL.
+
+    Parameters
+    ----------
+    url : str
+        URL to a file.
+    default : str
+        Name used when the URL path does not end with a file name.
+
+    Returns
+    -------
+    str
+        The file name.
+    """
+    return Path(unquote(urlparse(url).path)).name or default
+
+
+def download(
+    url: str,
+    path: Union[str, Path],
+    filename: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    segments: int = 1,
+    checksum: Optional[tuple[str, str]] = None,
+    retries: int = 3,
+    timeout: float = 30,
+    verify: Union[bool, str] = True,
+    headers: Optional[dict] = None,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional["RateLimiter"] = None,
+    skip_existing: bool = False,
+) -> Path:
+    """
+    Download a file to disk in chunks, resuming interrupted transfers.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file. `file://` URLs are copied.
+    path : str or Path
+        Directory where the file is written.
+    filename : str, optional
+        Name of the file on disk. Defaults to the last part of the URL path.
+    chunk_size : int
+        Number of bytes read from the network and written to disk at a time.
+    segments : int
+        Number of byte ranges fetched in parallel. Only used if the server supports range requests and gives an
+        ETag or a `Last-Modified` date, with which each range is checked to belong to the same version of the file.
+    checksum : tuple of str, optional
+        Algorithm and hexadecimal digest of the file, e.g. `("sha-256", "9f86...")`.
+    retries : int
+        Number of times a transfer is resumed after a connection error.
+    timeout : float
+        Timeout in seconds of each HTTP request.
+    verify : bool or str
+        Whether to verify the server's TLS certificate, or the path to a CA bundle.
+    headers : dict, optional
+        Additional HTTP headers.
+    session : requests.Session, optional
+        Session used to send the requests.
+    rate_limiter : RateLimiter, optional
+        Limit on the throughput, which can be shared by several downloads.
+    skip_existing : bool
+        If True, a file already on disk is kept when its ETag, or else its size and `Last-Modified` date, match
+        the server's. These headers are recorded for each downloaded file in a hidden file next to it.
+
+    Returns
+    -------
+    Path
+        Path to the downloaded file.
+
+    Raises
+    ------
+    DownloadError
+        If the transfer cannot be completed or the file fails verification.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    target = path / (filename or url_filename(url))
+    part = target.with_name(target.name + PART_SUFFIX)
+
+    parsed = urlparse(url)
+    validators = None
+    if parsed.scheme == "file":
+        shutil.copyfile(unquote(parsed.path), part)
+    else:
+        session = session or requests.Session()
+        if skip_existing:
+            r = _head(session, url, headers=headers, timeout=timeout, verify=verify)
+            if r is not None:
+                validators = {k: r.headers.get(k) for k in VALIDATORS}
+                if _up_to_date(target, validators):
+                    return target
+        options = dict(
+            headers={**(headers or {}), "Accept-Encoding": "identity"},
+            chunk_size=chunk_size,
+            retries=retries,
+            timeout=timeout,
+            verify=verify,
+            rate_limiter=rate_limiter,
+        )
+
+        size = validator = None
+        if segments > 1:
+            size, validator = _probe_ranges(session, url, **options)
+
+        if size is not None and size >= segments * chunk_size and validator:
+            try:
+                _fetch_segments(
+                    session, url, part, size, segments, validator, **options
+                )
+            except _Changed:
+                # The file changed during the download, fetch it again in one stream.
+                _discard_part(part)
+                _fetch(session, url, part, **options)
+        else:
+            _fetch(session, url, part, **options)
+
+    if checksum is not None:
+        _verify_checksum(part, *checksum)
+
+    part.replace(target)
+    _write_part_etag(part, None)
+    if validators is not None:
+        _write_validators(target, validators)
+    return target
+
+
+class RateLimiter:
+    """
+    Limit the throughput of the downloads sharing this instance, and count the bytes they receive.
+
+    Parameters
+    ----------
+    rate : float, optional
+        Maximum number of bytes per second. If None, the throughput is only measured.
+    """
+
+    def __init__(self, rate: Optional[float] = None):
+        self.rate = rate
+        self.received = 0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def __repr__(self):  # noqa: D105
+        return f"RateLimiter(rate={self.rate})"
+
+    def consume(self, size: int):
+        """
+        Account for `size` bytes received, waiting as long as needed to stay under the rate.
+
+        Parameters
+        ----------
+        size : int
+            Number of bytes.
+        """
+        with self._lock:
+            self.received += size
+            if self.rate is None:
+                return
+            now = time.monotonic()
+            self._next = max(self._next, now) + size / self.rate
+            delay = self._next - now
+        time.sleep(delay)
+
+
+def accepts_ranges(
+    url: str,
+    verify: Union[bool, str] = True,
+    headers: Optional[dict] = None,
+    timeout: float = 30,
+) -> bool:
+    """
+    Return whether a server accepts HTTP range requests for a file.
+
+    Parameters
+    ----------
+    url : str
+        URL of the file.
+    verify : bool or str
+        Whether to verify the server's TLS certificate, or the path to a CA bundle.
+    headers : dict, optional
+        Additional HTTP headers.
+    timeout : float
+        Seconds to wait for the server.
+
+    Returns
+    -------
+    bool
+        True if the server advertises byte ranges and the size of the file.
+    """
+    with requests.Session() as session:
+        size, _ = _probe_ranges(
+            session, url, headers=headers, timeout=timeout, verify=verify
+        )
+    return size is not None
+
+
+def _head(session, url, headers, timeout, verify, **kwargs):
+    """Return the response to a HEAD request, or None if it failed."""
+    try:
+        r = session.head(
+            url, headers=headers, timeout=timeout, verify=verify, allow_redirects=True
+        )
+    except (ConnectionError, Timeout):
+        return None
+    return r if r.ok else None
+
+
+def _probe_ranges(session, url, headers, timeout, verify, **kwargs):
+    """
+    Return the size of the file if the server accepts range requests, and a validator for `If-Range` headers.
+
+    The validator is the strong ETag of the file, or else its `Last-Modified` date. Both values are None if the
+    server does not accept range requests.
+    """
+    r = _head(session, url, headers, timeout, verify)
+    if r is None or r.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None, None
+    try:
+        size = int(r.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None, None
+    return size, _strong_etag(r.headers.get("ETag")) or r.headers.get("Last-Modified")
+
+
+class _Changed(DownloadError):
+    """The file changed on the server during a segmented download."""
+
+
+def _fetch(
+    session,
+    url,
+    part,
+    start=0,
+    end=None,
+    headers=None,
+    chunk_size=CHUNK_SIZE,
+    retries=3,
+    timeout=30,
+    verify=True,
+    rate_limiter=None,
+    validator=None,
+):
+    """
+    Stream bytes `start` to `end` (inclusive) of `url` to `part`, resuming from the bytes already on disk.
+
+    If `validator` is given, every request is conditioned on it with `If-Range`, and :class:`_Changed` is raised
+    if the server sends another version of the file.
+    """
+    # A part left by an earlier call is only resumed if it can be validated against the file on the server.
+    etag = _read_etag(part)
+    if part.exists() and (etag is None or validator not in (None, etag)):
+        _discard_part(part)
+    if validator is not None:
+        etag = validator
+
+    attempt = 0
+    while True:
+        done = part.stat().st_size if part.exists() else 0
+        expected = None if end is None else end - start + 1
+        if expected is not None and done >= expected:
+            break
+
+        offset = start + done
+        request_headers = dict(headers or {})
+        if offset or end is not None:
+            request_headers["Range"] = f"bytes={offset}-{'' if end is None else end}"
+        if (done or validator is not None) and etag is not None:
+            request_headers["If-Range"] = etag
+
+        try:
+            with session.get(
+                url,
+                headers=request_headers,
+                stream=True,
+                timeout=timeout,
+                verify=verify,
+            ) as r:
+                if r.status_code == 416 and done:
+                    # Nothing left to read, the previous attempt got the whole file.
+                    break
+                r.raise_for_status()
+
+                mode = "ab"
+                if validator is not None and r.status_code != 206:
+                    raise _Changed(f"{url} changed during the download.")
+                if r.status_code != 206 and offset:
+                    if start:
+                        if "If-Range" not in request_headers:
+                            raise DownloadError(
+                                f"Server does not support range requests: {url}"
+                            )
+                        # The file changed on the server, fetch the range again.
+                        _discard_part(part)
+                        etag = None
+                        continue
+                    # The server ignored the Range header, or the file changed, and sends the whole file.
+                    mode, done = "wb", 0
+
+                if not done:
+                    etag = validator or _strong_etag(r.headers.get("ETag"))
+                    _write_part_etag(part, etag)
+
+                length = r.headers.get("Content-Length")
+                if expected is None and length is not None:
+                    expected = done + int(length)
+
+                with open(part, mode) as f:
+                    for chunk in r.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        if rate_limiter is not None:
+                            rate_limiter.consume(len(chunk))
+
+        except (ConnectionError, ChunkedEncodingError, Timeout) as e:
+            attempt += 1
+            if attempt > retries:
+                raise DownloadError(f"Download of {url} failed: {e}") from e
+            continue
+
+        except requests.HTTPError as e:
+            raise DownloadError(f"Download of {url} failed: {e}") from e
+
+        size = part.stat().st_size
+        if expected is None or size == expected:
+            break
+        if size > expected:
+            _discard_part(part)
+            raise DownloadError(
+                f"Received {size} bytes from {url}, expected {expected}."
+            )
+
+        # Truncated response, resume where it stopped.
+        attempt += 1
+        if attempt > retries:
+            raise DownloadError(
+                f"Received {size} bytes from {url}, expected {expected}."
+            )
+
+
+def _strong_etag(etag: Optional[str]) -> Optional[str]:
+    """Return an ETag usable in an `If-Range` header, which excludes weak ETags."""
+    if etag is None or etag.startswith("W/"):
+        return None
+    return etag
+
+
+def _part_etag_path(part: Path) -> Path:
+    return part.with_name(part.name + ".etag")
+
+
+def _read_etag(part: Path) -> Optional[str]:
+    """Return the ETag recorded for a partial download."""
+    try:
+        return _part_etag_path(part).read_text() or None
+    except OSError:
+        return None
+
+
+def _write_part_etag(part: Path, etag: Optional[str]):
+    path = _part_etag_path(part)
+    try:
+        if etag is None:
+            path.unlink(missing_ok=True)
+        else:
+            path.write_text(etag)
+    except OSError:
+        pass
+
+
+def _discard_part(part: Path):
+    """Remove a partial download and its ETag."""
+    part.unlink(missing_ok=True)
+    _write_part_etag(part, None)
+
+
+def _validators_path(target: Path) -> Path:
+    return target.with_name(f".{target.name}.headers")
+
+
+def _write_validators(target: Path, validators: dict):
+    try:
+        _validators_path(target).write_text(json.dumps(validators))
+    except OSError:
+        pass
+
+
+def _up_to_date(target: Path, validators: dict) -> bool:
+    """Return whether a downloaded file matches the ETag, or the size and date, announced by the server."""
+    try:
+        stored = json.loads(_validators_path(target).read_text())
+        size = target.stat().st_size
+    except (OSError, ValueError):
+        return False
+
+    length = validators.get("Content-Length")
+    if length is not None and length != str(size):
+        return False
+
+    etag = validators.get("ETag")
+    if etag is not None and stored.get("ETag") is not None:
+        return etag == stored["ETag"]
+
+    modified = validators.get("Last-Modified")
+    return (
+        length is not None
+        and modified is not None
+        and modified == stored.get("Last-Modified")
+    )
+
+
+def _fetch_segments(session, url, part, size, segments, validator, **options):
+    """
+    Download `segments` byte ranges of `url` in parallel and join them into `part`.
+
+    Every range is requested with an `If-Range` header holding `validator`, so that :class:`_Changed` is raised
+    instead of joining pieces of different versions of the file. Each thread sends its requests with its own session.
+    """
+    step = -(-size // segments)
+    ranges = [(i, min(i + step, size) - 1) for i in range(0, size, step)]
+    pieces = [part.with_name(f"{part.name}{n}") for n in range(len(ranges))]
+
+    def _piece(piece, start, end):
+        with _copy_session(session) as s:
+            _fetch(s, url, piece, start, end, validator=validator, **options)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(_piece, piece, start, end)
+                for piece, (start, end) in zip(pieces, ranges)
+            ]
+            for future in futures:
+                future.result()
+    except _Changed:
+        for piece in pieces:
+            _discard_part(piece)
+        raise
+
+    with open(part, "wb") as f:
+        for piece in pieces:
+            with open(piece, "rb") as p:
+                shutil.copyfileobj(p, f, options.get("chunk_size", CHUNK_SIZE))
+            _discard_part(piece)
+
+    if part.stat().st_size != size:
+        part.unlink()
+        raise DownloadError(f"Segmented download of {url} has the wrong size.")
+
+
+def _copy_session(session: requests.Session) -> requests.Session:
+    """Return a new session with the headers, authentication and settings of `session`."""
+    copy = requests.Session()
+    copy.headers.update(session.headers)
+    copy.cookies.update(session.cookies)
+    copy.auth = session.auth
+    copy.proxies.update(session.proxies)
+    copy.verify = session.verify
+    copy.cert = session.cert
+    return copy
+
+
+def _verify_checksum(path: Path, algorithm: str, digest: str):
+    """Raise a DownloadError and remove `path` if its digest does not match."""
+    name = algorithm.lower().replace("-", "")
+    try:
+        h = hashlib.new(name)
+    except ValueError:
+        raise DownloadError(f"Unsupported checksum algorithm: {algorithm}")
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+
+    if h.hexdigest() != digest.lower():
+        path.unlink()
+        raise DownloadError(f"Checksum mismatch for {path.name} ({algorithm}).")
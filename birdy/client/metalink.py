@@ -0,0 +1,188 @@
+"""
+Metalink Module
+===============
+
+Parse Metalink 3.0 and 4.0 documents and download the files they list concurrently.
+
+Each file is fetched from its mirrors in order of preference with :func:`birdy.client.download.download`,
+which can split it into parallel segments, and is verified against the strongest hash given in the document.
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Union
+
+from lxml import etree
+
+from birdy.exceptions import DownloadError
+
+from .download import download
+
+MetalinkFile = namedtuple("MetalinkFile", ["name", "urls", "size", "hashes"])
+
+METALINK4_NAMESPACE = "urn:ietf:params:xml:ns:metalink"
+
+# Rank of Metalink 4 URLs without a priority, below those with one (RFC 5854 allows 1 to 999999).
+LOWEST_PRIORITY = 999999
+
+# Hash types from the strongest to the weakest.
+HASH_TYPES = ["sha-512", "sha-384", "sha-256", "sha-1", "md5"]
+
+
+def _local(element) -> str:
+    return etree.QName(element).localname
+
+
+def _children(element, name):
+    return [c for c in element.iter() if isinstance(c.tag, str) and _local(c) == name]
+
+
+def parse(source: Union[str, Path, bytes]) -> list:
+    """
+    Parse a Metalink document.
+
+    Parameters
+    ----------
+    source : str or Path or bytes
+        Path to the document, or its content.
+
+    Returns
+    -------
+    list of MetalinkFile
+        The files in the document, with their mirror URLs sorted by preference,
+        their size (or None) and a dictionary of hashes keyed by type.
+    """
+    if isinstance(source, bytes):
+        root = etree.fromstring(source)
+    else:
+        root = etree.parse(str(source)).getroot()
+    v4 = etree.QName(root).namespace == METALINK4_NAMESPACE
+
+    files = []
+    for f in _children(root, "file"):
+        urls = []
+        for u in _children(f, "url"):
+            if not (u.text or "").strip():
+                continue
+            if v4:  # Lower is preferred
+                rank = int(u.get("priority", LOWEST_PRIORITY))
+            else:  # Higher is preferred
+                rank = -int(u.get("preference", 0))
+            urls.append((rank, u.text.strip()))
+
+        hashes = {}
+        for h in _children(f, "hash"):
+            if not (h.text or "").strip():
+                continue
+            # Metalink 3 names hashes `sha256`, Metalink 4 `sha-256`.
+            kind = h.get("type", "").lower().replace("sha", "sha-").replace("--", "-")
+            hashes[kind] = h.text.strip()
+
+        size = _children(f, "size")
+        files.append(
+            MetalinkFile(
+                name=f.get("name"),
+                urls=[u for _, u in sorted(urls, key=lambda x: x[0])],
+                size=int(size[0].text) if size else None,
+                hashes=hashes,
+            )
+        )
+    return files
+
+
+def _safe_name(name: str) -> Path:
+    """Return the relative path of a file name, dropping parent and absolute components."""
+    parts = [p for p in PurePosixPath(name).parts if p not in ("/", "..")]
+    return Path(*parts)
+
+
+def fetch(
+    file: MetalinkFile, path: Union[str, Path], segments: int = 1, **kwargs
+) -> Path:
+    """
+    Download a file from the first mirror that works and verify it.
+
+    Parameters
+    ----------
+    file : MetalinkFile
+        File description.
+    path : str or Path
+        Directory where the file is written.
+    segments : int
+        Number of byte ranges fetched in parallel.
+    **kwargs : dict
+        Passed to :func:`birdy.client.download.download`.
+
+    Returns
+    -------
+    Path
+        Path to the downloaded file.
+    """
+    name = _safe_name(file.name)
+    checksum = next(
+        ((kind, file.hashes[kind]) for kind in HASH_TYPES if kind in file.hashes),
+        None,
+    )
+
+    error = DownloadError(f"No URL for {file.name}.")
+    for url in file.urls:
+        try:
+            fn = download(
+                url,
+                Path(path) / name.parent,
+                filename=name.name,
+                segments=segments,
+                checksum=checksum,
+                **kwargs,
+            )
+        except DownloadError as e:
+            error = e
+            continue
+        if file.size is not None and fn.stat().st_size != file.size:
+            fn.unlink()
+            error = DownloadError(f"{file.name} does not have the expected size.")
+            continue
+        return fn
+    raise error
+
+
+def download_files(
+    files: list,
+    path: Union[str, Path],
+    max_workers: int = 4,
+    segments: int = 1,
+    **kwargs,
+) -> Iterator[tuple]:
+    """
+    Download files concurrently, yielding them as they complete.
+
+    Parameters
+    ----------
+    files : list of MetalinkFile
+        Files to download.
+    path : str or Path
+        Directory where the files are written.
+    max_workers : int
+        Maximum number of files downloaded at the same time.
+    segments : int
+        Number of byte ranges of each file fetched in parallel.
+    **kwargs : dict
+        Passed to :func:`birdy.client.download.download`.
+
+    Yields
+    ------
+    tuple of int and Path
+        The index of the file in `files` and the path to the downloaded file.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch, f, path, segments=segments, **kwargs): i
+            for i, f in enumerate(files)
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
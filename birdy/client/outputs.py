@@ -1,17 +1,87 @@
+import functools
+import io
 import tempfile
+import threading
+import weakref
 from collections import namedtuple
-from typing import Optional
+from collections.abc import Iterator
+from typing import Optional, Union
 
 from owslib.wps import Output, WPSExecution
 
 from birdy.client import utils
+from birdy.client.cache import OutputCache
 from birdy.client.converters import convert
+from birdy.client.prefetch import Prefetcher
+from birdy.client.workspace import Workspace
 from birdy.exceptions import ProcessFailed, ProcessIsNotComplete
 from birdy.utils import delist, sanitize
 
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def response_type(name: str, fields: tuple) -> type:
+    """
+    Return the namedtuple class of the response of a process, created once per process.
+
+    Parameters
+    ----------
+    name : str
+        Sanitized process identifier.
+    fields : tuple of str
+        Sanitized output identifiers.
+
+    Returns
+    -------
+    type
+        The namedtuple class.
+    """
+    output = namedtuple(name + "Response", fields)
+    output.__repr__ = utils.pretty_repr
+    return output
+
+
+def _freeze(obj):
+    """Return a hashable representation of conversion options."""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple, set)):
+        return tuple(_freeze(v) for v in obj)
+    try:
+        hash(obj)
+    except TypeError:
+        return repr(obj)
+    return obj
+
+
+def _single_use(options: dict) -> bool:
+    """Return whether conversion options produce objects that can only be read once."""
+    return bool(
+        options.get("stream")
+        or options.get("buffer") == "stream"
+        or options.get("as_completed")
+    )
+
+
+def _consumable(value) -> bool:
+    """Return whether a converted output is an iterator or a file object, which can only be read once."""
+    if isinstance(value, (list, tuple)) and not hasattr(value, "_fields"):
+        return any(_consumable(v) for v in value)
+    return isinstance(value, (Iterator, io.IOBase))
+
 
 class WPSResult(WPSExecution):  # noqa: D101
-    def attach(self, wps_outputs: Output, converters: Optional[dict] = None):
+    def attach(
+        self,
+        wps_outputs: Output,
+        converters: Optional[dict] = None,
+        cache: Optional[OutputCache] = None,
+        workspace: Optional[Workspace] = None,
+        converter_options: Optional[dict] = None,
+        memoize: Union[bool, str] = True,
+        prefetcher: Optional[Prefetcher] = None,
+    ):
         """
         Attach the outputs according to converters.
 
@@ -21,12 +91,80 @@ class WPSResult(WPSExecution):  # noqa: D101
             The WPS outputs.
         converters : dict, optional
             Converter dictionary (`{name: object}`).
+        cache : OutputCache, optional
+            Persistent cache through which output files are downloaded.
+        workspace : Workspace, optional
+            Workspace in which the result's scratch directory is created.
+        converter_options : dict, optional
+            Default conversion options, see :func:`birdy.client.converters.convert`.
+        memoize : bool or {"weak"}
+            If True, outputs are converted once per set of options and returned again by later calls to
+            :meth:`get`. With "weak", converted objects are only kept while they are referenced elsewhere, so that
+            their memory can be reclaimed. If False, outputs are converted on every call. Iterators and file
+            objects, such as those returned with the `stream` option, are never memoized.
+        prefetcher : Prefetcher, optional
+            Prefetcher downloading the outputs in the background as soon as the process succeeds.
         """
         self._wps_outputs = wps_outputs
         self._converters = converters
-        self._path = tempfile.mkdtemp()
+        self._cache = cache
+        self._workspace = workspace
+        self._converter_options = converter_options or {}
+        self.memoize = memoize
+        self._memo = {}
+        self._memo_locks = {}
+        self._memo_lock = threading.Lock()
+        self._prefetcher = prefetcher
+        self._prefetched = False
+        if workspace is None:
+            self._path = tempfile.mkdtemp()
+        else:
+            self._path = str(workspace.mkdtemp(prefix="result-"))
+            weakref.finalize(self, workspace.release, self._path)
+        self._start_prefetch()
+
+    def checkStatus(self, *args, **kwargs):  # noqa: N802
+        """
+        Check the status of the process, and start prefetching its outputs once it has succeeded.
+
+        Parameters
+        ----------
+        *args : tuple
+            Positional arguments of :meth:`owslib.wps.WPSExecution.checkStatus`.
+        **kwargs : dict
+            Keyword arguments of :meth:`owslib.wps.WPSExecution.checkStatus`.
+        """
+        super().checkStatus(*args, **kwargs)
+        self._start_prefetch()
+
+    def _start_prefetch(self):
+        if self._prefetcher is None or self._prefetched or not self.isSucceded():
+            return
+        self._prefetched = True
+        self._prefetcher.submit(self)
 
-    def get(self, asobj: bool = False):
+    def release(self):
+        """Release the converted outputs and the scratch directory of this result so that they can be removed."""
+        self.invalidate()
+        if self._workspace is not None:
+            self._workspace.release(self._path)
+
+    def invalidate(self, *identifiers: str):
+        """
+        Forget converted outputs, so that they are converted again by the next call to :meth:`get`.
+
+        Parameters
+        ----------
+        *identifiers : str
+            Identifiers of the outputs to forget. All outputs are forgotten if none is given.
+        """
+        if not identifiers:
+            self._memo.clear()
+            return
+        for key in [k for k in self._memo if k[0] in identifiers]:
+            del self._memo[key]
+
+    def get(self, asobj: bool = False, asarray: bool = False, **options):
         """
         Return the process response outputs.
 
@@ -34,25 +172,70 @@ class WPSResult(WPSExecution):  # noqa: D101
         ----------
         asobj : bool
             If True, object_converters will be used. Default is False.
+        asarray : bool
+            If True, literal outputs are returned as NumPy arrays, decoded in a single call. Default is False.
+        **options : dict
+            Conversion options, overriding those given to the client. For example, `chunks` opens netCDF
+            outputs lazily with dask, and `combine` merges the netCDF files of nested outputs in one dataset.
+            See :func:`birdy.client.converters.convert`.
         """
         if not self.isComplete():
             raise ProcessIsNotComplete("Please wait ...")
         if not self.isSucceded():
             # TODO: add reason for failure
             raise ProcessFailed("Sorry, process failed.")
-        return self._make_output(asobj)
+        return self._make_output(
+            asobj, {**self._converter_options, **options}, asarray=asarray
+        )
 
-    def _make_output(self, convert_objects=False):
-        output = namedtuple(
-            sanitize(self.process.identifier) + "Response",
-            [sanitize(o.identifier) for o in self.processOutputs],
+    def _make_output(self, convert_objects=False, options=None, asarray=False):
+        output = response_type(
+            sanitize(self.process.identifier),
+            tuple(sanitize(o.identifier) for o in self.processOutputs),
         )
-        output.__repr__ = utils.pretty_repr
         return output(
-            *[self._process_output(o, convert_objects) for o in self.processOutputs]
+            *[
+                self._memoized_output(o, convert_objects, options, asarray)
+                for o in self.processOutputs
+            ]
         )
 
-    def _process_output(self, output: Output, convert_objects: bool = False):
+    def _memoized_output(self, output, convert_objects, options, asarray):
+        """Return the processed output, from the memo if it was already processed with the same options."""
+        if not self.memoize or _single_use(options or {}):
+            return self._process_output(output, convert_objects, options, asarray)
+
+        key = (output.identifier, convert_objects, asarray, _freeze(options or {}))
+        # Calls converting the same output, e.g. from the prefetcher and the user, wait for each other.
+        with self._memo_lock:
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        with lock:
+            value = self._memo.get(key, _MISSING)
+            if isinstance(value, weakref.ref):
+                value = value()
+                value = _MISSING if value is None else value
+            if value is not _MISSING:
+                return value
+
+            value = self._process_output(output, convert_objects, options, asarray)
+            if _consumable(value):
+                return value
+            self._memo[key] = value
+            if self.memoize == "weak":
+                try:
+                    self._memo[key] = weakref.ref(value)
+                except TypeError:
+                    # Builtin types cannot be weakly referenced and are kept.
+                    pass
+            return value
+
+    def _process_output(
+        self,
+        output: Output,
+        convert_objects: bool = False,
+        options: Optional[dict] = None,
+        asarray: bool = False,
+    ):
         """
         Process the output response.
 
@@ -64,16 +247,30 @@ class WPSResult(WPSExecution):  # noqa: D101
             The WPS outputs.
         convert_objects : bool
             If True, object_converters will be used.
+        options : dict, optional
+            Conversion options.
+        asarray : bool
+            If True, literal data is returned as a NumPy array.
         """
         # Get the data for recognized types.
         if output.data:
             data_type = output.dataType
             if data_type is None:
                 data_type = self._wps_outputs[output.identifier].dataType
-            data = [utils.from_owslib(d, data_type) for d in output.data]
-            return delist(data)
+            data = utils.from_owslib_array(output.data, data_type, asarray=asarray)
+            return data if asarray else delist(data)
 
         if convert_objects:
-            return convert(output, self._path, self._converters, self.auth.verify)
+            out = convert(
+                output,
+                self._path,
+                self._converters,
+                self.auth.verify,
+                cache=self._cache,
+                options=options,
+            )
+            if self._workspace is not None:
+                self._workspace.enforce_quota()
+            return out
         else:
             return output.reference
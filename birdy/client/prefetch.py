@@ -0,0 +1,178 @@
+"""
+Prefetch Module
+===============
+
+Background download of process outputs as soon as a job succeeds.
+
+A :class:`Prefetcher` downloads the reference outputs of finished jobs into an :class:`OutputCache` with a bounded
+number of threads and an optional limit on the total bandwidth, so that a later call to `get(asobj=True)` finds the
+files in the cache. It can also convert the outputs in the background, in which case `get(asobj=True)` returns the
+converted objects memoized on the result.
+
+Example
+-------
+
+.. code-block:: python
+
+    >>> from birdy import WPSClient
+    >>> wps = WPSClient("http://localhost:5000/wps", progress=True, prefetch={"max_rate": 10 * 2**20})
+    >>> resp = wps.subset(...)  # Outputs start downloading when the job succeeds
+    >>> ds = resp.get(asobj=True).output
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional
+
+from birdy.utils import is_remote
+
+from .cache import OutputCache
+from .download import RateLimiter
+
+
+class Prefetcher:
+    """
+    Download, and optionally convert, the outputs of succeeded jobs in the background.
+
+    Parameters
+    ----------
+    cache : OutputCache, optional
+        Cache in which outputs are downloaded. Defaults to a new :class:`OutputCache`.
+    max_workers : int
+        Maximum number of concurrent downloads.
+    max_rate : float, optional
+        Maximum total download rate in bytes per second. Unlimited if None.
+    convert : bool
+        If True, convert the outputs once they are downloaded.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[OutputCache] = None,
+        max_workers: int = 2,
+        max_rate: Optional[float] = None,
+        convert: bool = False,
+    ):
+        self.cache = cache if cache is not None else OutputCache()
+        self.convert = convert
+        self.rate_limiter = RateLimiter(max_rate) if max_rate else None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="birdy-prefetch"
+        )
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self):  # noqa: D105
+        return f"Prefetcher(cache={self.cache!r}, convert={self.convert})"
+
+    def submit(self, result) -> list[Future]:
+        """
+        Start downloading the reference outputs of a succeeded result.
+
+        Parameters
+        ----------
+        result : WPSResult
+            The result of a job.
+
+        Returns
+        -------
+        list of Future
+            The download tasks, followed by the conversion task if `convert` is True.
+        """
+        urls = [
+            o.reference
+            for o in result.processOutputs
+            if not o.data and o.reference and is_remote(o.reference)
+        ]
+        futures = [
+            self._submit(self._download, url, result.auth.verify) for url in urls
+        ]
+
+        if self.convert:
+            converted = Future()
+            futures.append(converted)
+            self._track(converted)
+            pending = [len(urls)]
+
+            def _done(_=None):
+                with self._lock:
+                    pending[0] -= 1
+                    if pending[0] > 0:
+                        return
+                try:
+                    future = self._executor.submit(result.get, asobj=True)
+                except RuntimeError:  # Shut down
+                    converted.cancel()
+                    return
+                future.add_done_callback(lambda f: _chain(f, converted))
+
+            if urls:
+                for future in futures[:-1]:
+                    future.add_done_callback(_done)
+            else:
+                pending[0] = 1
+                _done()
+
+        return futures
+
+    def _submit(self, fn, *args, **kwargs):
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._track(future)
+        return future
+
+    def _track(self, future):
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _download(self, url, verify=True):
+        return self.cache.get(url, verify=verify, rate_limiter=self.rate_limiter)
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait for the pending tasks to complete.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait.
+        """
+        while True:
+            with self._lock:
+                futures = set(self._futures)
+            if not futures:
+                return
+            _, not_done = wait(futures, timeout=timeout)
+            if not_done:
+                return
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the background threads, cancelling the tasks that have not started.
+
+        Parameters
+        ----------
+        wait : bool
+            Whether to wait for the running tasks to complete.
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+def _chain(source: Future, target: Future):
+    """Copy the outcome of `source` to `target`."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
@@ -1,8 +1,10 @@
 # noqa: D100, D101, D102
 
 import datetime as dt
+import warnings
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 from urllib.parse import urlparse
 
 import dateutil.parser
@@ -322,29 +324,111 @@ def from_owslib(value: Any, data_type: str) -> Any:
     """
     if value is None:
         return None
+    return literal_decoder(data_type)(value)
 
+
+def _parse_datetime(value):
+    try:
+        return dt.datetime.fromisoformat(value)
+    except ValueError:
+        return dateutil.parser.parse(value)
+
+
+def _identity(value):
+    return value
+
+
+def literal_decoder(data_type: str) -> Callable[[Any], Any]:
+    """
+    Return the function converting strings to the given WPS dataType.
+
+    Resolving the function once avoids matching the dataType again for each value of an output.
+
+    Parameters
+    ----------
+    data_type : str
+        The WPS dataType.
+
+    Returns
+    -------
+    callable
+        Function converting a single value.
+    """
     if "string" in data_type:
-        pass
+        return _identity
     elif "integer" in data_type:
-        value = int(value)
+        return int
     elif "float" in data_type:
-        value = float(value)
+        return float
     elif "boolean" in data_type:
-        value = bool(value)
+        return bool
     elif "dateTime" in data_type:
-        value = dateutil.parser.parse(value)
+        return _parse_datetime
     elif "time" in data_type:
-        value = dateutil.parser.parse(value).time()
+        return lambda v: dateutil.parser.parse(v).time()
     elif "date" in data_type:
-        value = dateutil.parser.parse(value).date()
+        return lambda v: _parse_datetime(v).date()
     elif "angle" in data_type:
-        value = float(value)
+        return float
     elif "ComplexData" in data_type:
-        value = ComplexDataInput(value)
-    elif "BoundingBoxData" in data_type:
-        pass
-        # value = BoundingBoxDataInput(value)
-    return value
+        return ComplexDataInput
+    return _identity
+
+
+# NumPy dtypes of the WPS dataTypes that NumPy parses from strings.
+NUMPY_DTYPES = [
+    ("integer", "int64"),
+    ("float", "float64"),
+    ("angle", "float64"),
+    ("dateTime", "datetime64[us]"),
+    ("date", "datetime64[D]"),
+]
+
+
+def from_owslib_array(
+    values: Sequence[Any], data_type: str, asarray: bool = False
+) -> Any:
+    """
+    Convert a sequence of strings into another data type.
+
+    Parameters
+    ----------
+    values : sequence
+        Values to be converted.
+    data_type : str
+        The WPS dataType.
+    asarray : bool
+        If True and NumPy is installed, return a NumPy array. Numeric and date values are then parsed by NumPy
+        in a single call, and dates with a time zone are converted to UTC.
+
+    Returns
+    -------
+    list or numpy.ndarray
+        The converted values.
+    """
+    if asarray:
+        try:
+            import numpy as np
+        except ImportError:
+            asarray = False
+
+    if asarray and None not in values:
+        dtype = next((d for name, d in NUMPY_DTYPES if name in data_type), None)
+        if dtype is not None:
+            try:
+                with warnings.catch_warnings():
+                    # Dates with a time zone are converted to UTC.
+                    warnings.simplefilter("ignore")
+                    return np.asarray(values, dtype=dtype)
+            except ValueError:
+                # Forms NumPy does not parse are decoded one by one.
+                pass
+
+    decode = literal_decoder(data_type)
+    out = [None if v is None else decode(v) for v in values]
+    if asarray:
+        return np.asarray(out)
+    return out
 
 
 def py_type(data_type: str) -> Any:
@@ -0,0 +1,152 @@
+"""
+Workspace Module
+================
+
+Scratch directories for downloaded and extracted outputs.
+
+A :class:`Workspace` owns a directory under a configurable root, in which each :class:`WPSResult` gets its own
+subdirectory. The workspace is removed when it is closed, when it is used as a context manager and the block
+exits, or when it is garbage collected. Results release their subdirectory when they are garbage collected or
+when :meth:`WPSResult.release` is called. If the workspace grows beyond its quota, released subdirectories are
+removed, oldest first.
+
+Example
+-------
+
+.. code-block:: python
+
+    >>> from birdy import WPSClient
+    >>> from birdy.client.workspace import Workspace
+    >>> with Workspace(root="/scratch", quota=50 * 2**30) as ws:
+    ...     wps = WPSClient("http://localhost:5000/wps", workspace=ws)
+    ...     ds = wps.subset(...).get(asobj=True)
+
+The default root is the system temporary directory, or the directory set by the `BIRDY_WORKSPACE_DIR`
+environment variable.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import warnings
+import weakref
+from pathlib import Path
+from typing import Optional, Union
+
+
+def _size(path: Path) -> int:
+    """Return the total size in bytes of the files under `path`."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for fn in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, fn)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class Workspace:
+    """
+    Scratch directory with a size quota and automatic cleanup.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Directory in which the workspace is created.
+        Defaults to `BIRDY_WORKSPACE_DIR` or the system temporary directory.
+    quota : int, optional
+        Maximum size of the workspace in bytes. Unlimited if None.
+    prefix : str
+        Prefix of the workspace directory name.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        quota: Optional[int] = None,
+        prefix: str = "birdy-",
+    ):
+        root = root or os.environ.get("BIRDY_WORKSPACE_DIR") or tempfile.gettempdir()
+        Path(root).mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix=prefix, dir=root))
+        self.quota = quota
+        self._released = {}
+        self._finalizer = weakref.finalize(
+            self, shutil.rmtree, self.path, ignore_errors=True
+        )
+
+    def __repr__(self):  # noqa: D105
+        return f"Workspace(path='{self.path}', quota={self.quota})"
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the workspace has been removed."""
+        return not self._finalizer.alive
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the files in the workspace."""
+        return _size(self.path)
+
+    def mkdtemp(self, prefix: str = "") -> Path:
+        """
+        Create a new subdirectory in the workspace.
+
+        Parameters
+        ----------
+        prefix : str
+            Prefix of the directory name.
+
+        Returns
+        -------
+        Path
+            Path to the new directory.
+        """
+        if self.closed:
+            raise ValueError("Workspace is closed.")
+        self.enforce_quota()
+        return Path(tempfile.mkdtemp(prefix=prefix, dir=self.path))
+
+    def release(self, path: Union[str, Path]):
+        """
+        Mark a subdirectory as no longer needed, so it can be removed to free space.
+
+        Parameters
+        ----------
+        path : str or Path
+            A directory created by :meth:`mkdtemp`.
+        """
+        if not self.closed:
+            self._released[Path(path)] = time.monotonic()
+
+    def enforce_quota(self):
+        """Remove released subdirectories, oldest first, until the workspace fits in its quota."""
+        if self.quota is None or self.closed:
+            return
+
+        size = self.size
+        for path in sorted(self._released, key=self._released.get):
+            if size <= self.quota:
+                break
+            size -= _size(path)
+            shutil.rmtree(path, ignore_errors=True)
+            del self._released[path]
+
+        if size > self.quota:
+            warnings.warn(
+                f"Workspace {self.path} uses {size} bytes, more than its quota of {self.quota} bytes. "
+                "Release results that are no longer needed with `WPSResult.release()`."
+            )
+
+    def close(self):
+        """Remove the workspace and all its files."""
+        self._finalizer()
+        self._released.clear()
@@ -1,13 +1,22 @@
 import click
-from owslib.util import ServiceException
 
 
 class ConnectionError(click.ClickException):  # noqa: D101
     pass
 
 
-class UnauthorizedException(ServiceException):  # noqa: D101
-    pass
+def __getattr__(name):
+    # owslib is imported on first use, so that the command-line interface starts quickly.
+    if name == "UnauthorizedException":
+        from owslib.util import ServiceException
+
+        global UnauthorizedException
+
+        class UnauthorizedException(ServiceException):  # noqa: D101
+            pass
+
+        return UnauthorizedException
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class IPythonWarning(UserWarning):  # noqa: D101
@@ -24,3 +33,7 @@ class ProcessFailed(Exception):  # noqa: D101
 
 class ProcessCanceled(Exception):  # noqa: D101
     pass
+
+
+class DownloadError(IOError):  # noqa: D101
+    pass
@@ -23,6 +23,9 @@ There are notebook examples which show how to use this module and what can be do
 
 The WFS request is filtered by the extent of the visible map, to make large layers easier to work with.
 Using the on-map 'Refresh WFS layer' button will make a new request for the current extent.
+Features are requested by map tiles and cached, so that a refresh only requests the tiles that were not fetched yet.
+For dense layers, ``page_size`` requests the features by pages fetched concurrently, filling the layer in as they
+arrive, and ``max_features`` caps the number of features loaded for an extent.
 
 .. warning::
 
@@ -1,11 +1,20 @@
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Optional
 
+import requests
+from lxml import etree
+from owslib.util import ServiceException
 from owslib.wfs import WebFeatureService
 
 from birdy.dependencies import ipyleaflet as ipyl
 from birdy.dependencies import ipywidgets as ipyw
 
+from .cache import FeatureCache, tile_bbox
+from .index import FeatureIndex
+
 ipyl_not_installed = "Ipyleaflet is not supported. Please install *ipyleaflet*."
 ipyw_not_installed = "Ipywidgets is not supported. Please install *ipywidgets*."
 
@@ -65,6 +74,23 @@ class IpyleafletWFS:
         The url of the WFS service.
     wfs_version : str
         The version of the WFS service to use. Defaults to 2.0.0.
+    tile_cache : bool
+        If True, features are requested by map tiles and cached, so that a refresh only requests the tiles of the
+        extent that were not fetched yet. See :class:`birdy.ipyleafletwfs.cache.FeatureCache`.
+    max_workers : int
+        Maximum number of WFS requests sent at the same time.
+    page_size : int, optional
+        If set, features are requested by pages of this size with the WFS 2.0 `count` and `startIndex` parameters,
+        fetched concurrently after a `resultType=hits` request gives the number of features. The layer is filled in
+        as pages arrive.
+    max_features : int, optional
+        Maximum number of features loaded for an extent.
+    indexed_properties : list of str, optional
+        Properties whose inverted indexes are built as soon as features are loaded, instead of on their first lookup.
+        See :attr:`feature_index`.
+    sort_by : str, optional
+        Property by which paged features are sorted, so that pages neither skip nor repeat features. Defaults to
+        the first property of the layer if the service declares the `ImplementsSorting` constraint.
 
     Returns
     -------
@@ -72,7 +98,26 @@ class IpyleafletWFS:
         Instance from which the WFS layers can be created.
     """
 
-    def __init__(self, url, wfs_version="2.0.0"):
+    def __init__(
+        self,
+        url,
+        wfs_version="2.0.0",
+        tile_cache=True,
+        max_workers=4,
+        page_size=None,
+        max_features=None,
+        indexed_properties=(),
+        sort_by=None,
+    ):
+        self._cache = FeatureCache() if tile_cache else None
+        self._cache_typename = None
+        self._max_workers = max_workers
+        self._page_size = page_size
+        self._max_features = max_features
+        self._indexed_properties = list(indexed_properties)
+        self._index = FeatureIndex()
+        self._sort_by = sort_by
+        self._sort_keys = {}
         self._geojson = None
         self._layer = None
         self._layer_typename = ""
@@ -147,13 +192,8 @@ class IpyleafletWFS:
         # Calculate extent filter
         bbox_filter_coords = _map_extent_to_bbox_filter(self._source_map)
 
-        # Fetch and prepare data
-        data = self._wfs.getfeature(
-            typename=self._layer_typename, bbox=bbox_filter_coords, outputFormat="JSON"
-        )
-        self._geojson = json.loads(data.getvalue().decode())
-
-        # Create layer and add to the map
+        # Create layer and add to the map, then fill it as features arrive
+        self._set_geojson({"type": "FeatureCollection", "features": []})
         self._layer = ipyl.GeoJSON(
             data=self._geojson,
             style=self._layerstyle,
@@ -167,6 +207,17 @@ class IpyleafletWFS:
 
         self._source_map.add_layer(self._layer)
 
+        # Fetch and prepare data
+        self._set_geojson(
+            self._load_features(
+                self._layer_typename,
+                bbox_filter_coords,
+                progress=self._fill_layer,
+                interval=1,
+            )
+        )
+        self._layer.data = self._geojson
+
         # Create default property widget
         if self._property_widgets is None:
             self._property_widgets = {}
@@ -220,16 +271,237 @@ class IpyleafletWFS:
         bbox_filter_coords = _map_extent_to_bbox_filter(source_map)
 
         # Fetch and prepare data
-        data = self._wfs.getfeature(
-            typename=layer_typename, bbox=bbox_filter_coords, outputFormat="JSON"
-        )
-        self._geojson = json.loads(data.getvalue().decode())
+        self._set_geojson(self._load_features(layer_typename, bbox_filter_coords))
 
         # Create layer, default widget and add to the map
         layer = ipyl.GeoJSON(data=self._geojson, style=style)
 
         return layer
 
+    def _getfeature(
+        self,
+        layer_typename: str,
+        bbox: tuple,
+        count: Optional[int] = None,
+        startindex: Optional[int] = None,
+    ) -> dict:
+        """Request the features of a layer within an extent, as a GeoJSON feature collection."""
+        kwargs = {}
+        sort_key = None if startindex is None else self._sort_key(layer_typename)
+        # The owslib client of WFS 1.0.0 has no `sortby` parameter, so its pages are sorted here.
+        server_sort = sort_key is not None and self._wfs.version != "1.0.0"
+        if server_sort:
+            kwargs["sortby"] = [sort_key]
+        data = self._wfs.getfeature(
+            typename=layer_typename,
+            bbox=bbox,
+            outputFormat="JSON",
+            maxfeatures=count,
+            startindex=startindex,
+            **kwargs,
+        )
+        collection = json.loads(data.getvalue().decode())
+        if sort_key is not None and not server_sort:
+
+            def _key(feature):
+                value = (feature.get("properties") or {}).get(sort_key)
+                return value is None, value
+
+            collection["features"].sort(key=_key)
+        return collection
+
+    def _sort_key(self, layer_typename: str) -> Optional[str]:
+        """Return the property sorting the pages of a layer, or None if the service cannot sort them."""
+        if self._sort_by is not None:
+            return self._sort_by
+        if layer_typename not in self._sort_keys:
+            key = None
+            constraint = getattr(self._wfs, "constraints", {}).get("ImplementsSorting")
+            if constraint is not None and "FALSE" not in [
+                str(v).upper() for v in constraint.values
+            ]:
+                try:
+                    schema = self._wfs.get_schema(layer_typename) or {}
+                    key = next(iter(schema.get("properties") or {}), None)
+                except (
+                    requests.RequestException,
+                    ServiceException,
+                    etree.XMLSyntaxError,
+                ):
+                    pass
+            self._sort_keys[layer_typename] = key
+        return self._sort_keys[layer_typename]
+
+    def _hits(self, layer_typename: str, bbox: tuple) -> Optional[int]:
+        """Return the number of features of a layer within an extent, or None if the service does not tell."""
+        # WFS 1.0.0 has no `resultType=hits` requests, and its owslib client cannot build them.
+        if not hasattr(self._wfs, "getGETGetFeatureRequest"):
+            return None
+        url = self._wfs.getGETGetFeatureRequest(typename=layer_typename, bbox=bbox)
+        try:
+            r = requests.get(
+                url,
+                params={"resultType": "hits"},
+                headers=self._wfs.headers,
+                timeout=self._wfs.timeout,
+            )
+            r.raise_for_status()
+            root = etree.fromstring(r.content)
+            # WFS 1.1.0 names the count `numberOfFeatures`.
+            return int(root.get("numberMatched", root.get("numberOfFeatures")))
+        except (requests.RequestException, etree.XMLSyntaxError, TypeError, ValueError):
+            return None
+
+    def _fetch_features(self, layer_typename: str, bbox: tuple, callback=None) -> tuple:
+        """
+        Request the features of a layer within an extent, by pages if `page_size` is set.
+
+        The number of features is requested first, so that the pages are fetched concurrently. Services that cannot
+        count are read one page after the other until a page is not full.
+
+        Parameters
+        ----------
+        layer_typename : str
+            Typename of the layer.
+        bbox : tuple
+            Extent of the features.
+        callback : callable, optional
+            Called with the features of each page as it arrives, possibly from another thread.
+
+        Returns
+        -------
+        features : list of dict
+            GeoJSON features, in the order of the service.
+        complete : bool
+            False if features were left out because of `max_features`.
+        """
+        limit, size = self._max_features, self._page_size
+
+        if not size:
+            features = self._getfeature(layer_typename, bbox, count=limit)["features"]
+            if callback is not None:
+                callback(features)
+            return features, limit is None or len(features) < limit
+
+        hits = self._hits(layer_typename, bbox)
+        if hits is None:
+            features = []
+            while True:
+                count = size if limit is None else min(size, limit - len(features))
+                page = self._getfeature(
+                    layer_typename, bbox, count=count, startindex=len(features)
+                )["features"]
+                features += page
+                if callback is not None:
+                    callback(page)
+                if len(page) < count:
+                    return features, True
+                if limit is not None and len(features) >= limit:
+                    return features, False
+
+        total = hits if limit is None else min(hits, limit)
+        starts = range(0, total, size)
+        pages = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._getfeature,
+                    layer_typename,
+                    bbox,
+                    min(size, total - start),
+                    start,
+                ): start
+                for start in starts
+            }
+            for future in as_completed(futures):
+                page = future.result()["features"]
+                pages[futures[future]] = page
+                if callback is not None:
+                    callback(page)
+        return [f for start in starts for f in pages[start]], total == hits
+
+    def _load_features(
+        self, layer_typename: str, bbox: tuple, progress=None, interval: float = 0
+    ) -> dict:
+        """
+        Return the features of a layer within an extent, only requesting the tiles that are not cached.
+
+        Parameters
+        ----------
+        layer_typename : str
+            Typename of the layer.
+        bbox : tuple
+            Extent, as returned by `_map_extent_to_bbox_filter`.
+        progress : callable, optional
+            Called with the GeoJSON feature collection loaded so far, as pages of features arrive.
+        interval : float
+            Minimum number of seconds between two calls of `progress`. The pages arriving in between are only
+            collected, not looked up in the cache.
+
+        Returns
+        -------
+        dict
+            A GeoJSON feature collection, of at most `max_features` features.
+        """
+        limit = self._max_features
+
+        shown = None
+
+        def _collection(features):
+            return {"type": "FeatureCollection", "features": features[:limit]}
+
+        def _due():
+            nonlocal shown
+            now = time.monotonic()
+            if progress is None or (shown is not None and now - shown < interval):
+                return False
+            shown = now
+            return True
+
+        if self._cache is None:
+            loaded = []
+
+            def _page(features):
+                loaded.extend(features)
+                if _due():
+                    progress(_collection(loaded))
+
+            return _collection(self._fetch_features(layer_typename, bbox, _page)[0])
+
+        if layer_typename != self._cache_typename:
+            self._cache.clear()
+            self._cache_typename = layer_typename
+
+        lock = threading.Lock()
+
+        def _page(features):
+            with lock:
+                self._cache.add(None, features)
+                if _due():
+                    progress(_collection(self._cache.query(bbox)))
+
+        def _tile(tile):
+            _, complete = self._fetch_features(layer_typename, tile_bbox(*tile), _page)
+            # Tiles truncated by `max_features` are requested again on the next refresh.
+            if complete:
+                with lock:
+                    self._cache.add(tile, [])
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            list(executor.map(_tile, self._cache.missing(bbox)))
+
+        return _collection(self._cache.query(bbox))
+
+    def _set_geojson(self, collection: Optional[dict]):
+        """Store the loaded features and index them."""
+        self._geojson = collection
+        features = collection["features"] if collection else ()
+        self._index = FeatureIndex(features, self._indexed_properties)
+
+    def _fill_layer(self, collection: dict):
+        """Show the features loaded so far."""
+        self._layer.data = collection
+
     def _refresh_layer(self, placeholder: Optional[str] = None):
         """
         Refresh the WFS layer for the current map extent.
@@ -268,7 +540,7 @@ class IpyleafletWFS:
             self._layer_typename = ""
             self._layerstyle = {}
             self._property = None
-            self._geojson = None
+            self._set_geojson(None)
             self._refresh_widget = None
         else:
             print("There is no layer to remove")
@@ -284,6 +556,7 @@ class IpyleafletWFS:
         The id field is usually the first field.
         Since the name is always different, this is the only assumption that can be made to automate this process.
         Hence, this will not work if the layer in question does not follow this formatting.
+        Features are looked up by their GeoJSON `id` with `feature_index.get`.
 
         Parameters
         ----------
@@ -295,21 +568,45 @@ class IpyleafletWFS:
         dict
             A dictionary of the layer's properties.
         """
-        for feature in self._geojson["features"]:
-            # The id field is usually the first field. Since the name is
-            # always different, this is the only assumption I could make
-            # to automate this process.
-            first_key = list(feature["properties"].keys())[0]
-            current_feature_id = feature["properties"][first_key]
+        feature = self._index.get_by_first_property(feature_id)
+        if feature is not None:
+            return feature["properties"]
+
+    def features_by_property(self, feature_property: str, value: Any) -> list:
+        """
+        Return the features with a property value.
+
+        The inverted index of the property is built on the first lookup, and rebuilt when the layer is refreshed.
+
+        Parameters
+        ----------
+        feature_property : str
+            The property key. Use the `property_list()` function to get a list of the available properties.
+        value : Any
+            The property value.
 
-            if current_feature_id == feature_id:
-                return feature["properties"]
+        Returns
+        -------
+        list
+            The GeoJSON features.
+        """
+        return self._index.lookup(feature_property, value)
 
     @property
     def geojson(self):
         """Return the imported geojson data in a python object format."""
         return self._geojson
 
+    @property
+    def feature_index(self) -> FeatureIndex:
+        """Return the index of the loaded features by id and by property values."""
+        return self._index
+
+    @property
+    def feature_cache(self) -> Optional[FeatureCache]:
+        """Return the cache of the features fetched by tiles, or None if disabled."""
+        return self._cache
+
     @property
     def layer_list(self) -> list:
         """
@@ -431,9 +728,7 @@ class IpyleafletWFS:
             if properties is None:
                 return
 
-            key = list(properties.keys())[0]
-            if feature_property:
-                key = feature_property
+            key = feature_property or next(iter(properties))
             textbox.value = """
                 <h4>{}<h4>
                 <b style="font-size:10px">{}<b>
@@ -0,0 +1,320 @@
+"""
+Tiled cache of WFS features.
+
+Features are requested by z/x/y map tiles covering the extent of the map, so that panning only requests the tiles
+that were not fetched yet. Fetched features are kept once per GeoJSON `id` in a grid index of their bounding boxes, from
+which the features of any extent are looked up.
+"""
+
+import json
+import math
+from collections import defaultdict
+from typing import Any, Optional
+
+MAX_LAT = 85.0511287798
+MAX_ZOOM = 18
+
+# Cells of the grid index are 360 / 2 ** INDEX_ZOOM degrees wide.
+INDEX_ZOOM = 8
+# Features covering more cells than this are checked for every lookup instead of being indexed.
+MAX_CELLS = 256
+
+
+def tile_xy(lon: float, lat: float, zoom: int) -> tuple:
+    """
+    Return the column and row of the map tile containing a point.
+
+    Parameters
+    ----------
+    lon, lat : float
+        Coordinates of the point in degrees.
+    zoom : int
+        Zoom level of the tile.
+
+    Returns
+    -------
+    tuple of int
+        Column and row of the tile.
+    """
+    n = 2**zoom
+    lat = math.radians(max(min(lat, MAX_LAT), -MAX_LAT))
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bbox(zoom: int, x: int, y: int) -> tuple:
+    """
+    Return the extent of a map tile.
+
+    Parameters
+    ----------
+    zoom, x, y : int
+        Zoom level, column and row of the tile.
+
+    Returns
+    -------
+    tuple of float
+        Minimum longitude, minimum latitude, maximum longitude and maximum latitude of the tile.
+    """
+    n = 2**zoom
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return x / n * 360 - 180, lat(y + 1), (x + 1) / n * 360 - 180, lat(y)
+
+
+def tiles(bbox: tuple, zoom: int) -> list:
+    """
+    Return the map tiles covering an extent.
+
+    Parameters
+    ----------
+    bbox : tuple of float
+        Minimum longitude, minimum latitude, maximum longitude and maximum latitude.
+    zoom : int
+        Zoom level of the tiles.
+
+    Returns
+    -------
+    list of tuple
+        Zoom level, column and row of each tile.
+    """
+    x1, y1 = tile_xy(bbox[0], bbox[3], zoom)
+    x2, y2 = tile_xy(bbox[2], bbox[1], zoom)
+    return [(zoom, x, y) for x in range(x1, x2 + 1) for y in range(y1, y2 + 1)]
+
+
+def tile_zoom(bbox: tuple) -> int:
+    """
+    Return the zoom level of the tiles requested for an extent, at least half as wide as the extent.
+
+    A view is then covered by at most 3 by 3 tiles, spanning less than 3 times its width, and panning by less than
+    its width requests a few others.
+
+    Parameters
+    ----------
+    bbox : tuple of float
+        Minimum longitude, minimum latitude, maximum longitude and maximum latitude.
+
+    Returns
+    -------
+    int
+        The zoom level.
+    """
+    width = max(bbox[2] - bbox[0], 1e-9)
+    return min(max(math.floor(math.log2(360 / width)) + 1, 0), MAX_ZOOM)
+
+
+def feature_id(feature: dict) -> Any:
+    """
+    Return the id of a GeoJSON feature.
+
+    Parameters
+    ----------
+    feature : dict
+        A GeoJSON feature.
+
+    Returns
+    -------
+    Any
+        The `id` member of the feature, or None if it has none.
+    """
+    return feature.get("id")
+
+
+def _cache_key(feature):
+    fid = feature_id(feature)
+    if fid is not None:
+        return "id", fid
+    # Without an id, only features that are identical in every member are the same feature, e.g. a feature fetched
+    # with two neighbouring tiles.
+    return "content", json.dumps(feature, sort_keys=True, default=str)
+
+
+def feature_bbox(feature: dict) -> Optional[tuple]:
+    """
+    Return the bounding box of the geometry of a GeoJSON feature.
+
+    Parameters
+    ----------
+    feature : dict
+        A GeoJSON feature.
+
+    Returns
+    -------
+    tuple of float or None
+        Minimum longitude, minimum latitude, maximum longitude and maximum latitude, or None without coordinates.
+    """
+    if feature.get("bbox"):
+        b = feature["bbox"]
+        n = len(b) // 2
+        return b[0], b[1], b[n], b[n + 1]
+
+    xs, ys = [], []
+
+    def walk(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            xs.append(coords[0])
+            ys.append(coords[1])
+        else:
+            for c in coords:
+                walk(c)
+
+    geometry = feature.get("geometry") or {}
+    for geom in geometry.get("geometries", [geometry]):
+        walk(geom.get("coordinates") or [])
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _intersects(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _cells(bbox):
+    size = 360 / 2**INDEX_ZOOM
+    return [
+        (i, j)
+        for i in range(math.floor(bbox[0] / size), math.floor(bbox[2] / size) + 1)
+        for j in range(math.floor(bbox[1] / size), math.floor(bbox[3] / size) + 1)
+    ]
+
+
+class FeatureCache:
+    """
+    Features of a WFS layer, fetched by map tiles.
+
+    Examples
+    --------
+    >>> cache = FeatureCache()
+    >>> for tile in cache.missing((-75, 45, -73, 46)):
+    ...     cache.add(tile, fetch(tile_bbox(*tile)))
+    >>> features = cache.query((-75, 45, -73, 46))
+    """
+
+    def __init__(self):
+        self.features = {}
+        self.fetched = set()
+        self._bboxes = {}
+        self._order = {}
+        self._grid = defaultdict(set)
+        self._large = set()
+
+    def __len__(self):  # noqa: D105
+        return len(self.features)
+
+    def __repr__(self):  # noqa: D105
+        return f"FeatureCache(features={len(self.features)}, tiles={len(self.fetched)})"
+
+    def covered(self, tile: tuple) -> bool:
+        """
+        Return whether the features of a tile have been fetched, with the tile itself or a larger one.
+
+        Parameters
+        ----------
+        tile : tuple of int
+            Zoom level, column and row of the tile.
+
+        Returns
+        -------
+        bool
+            True if the tile was fetched.
+        """
+        zoom, x, y = tile
+        while zoom >= 0:
+            if (zoom, x, y) in self.fetched:
+                return True
+            zoom, x, y = zoom - 1, x // 2, y // 2
+        return False
+
+    def missing(self, bbox: tuple, zoom: Optional[int] = None) -> list:
+        """
+        Return the tiles of an extent that have not been fetched.
+
+        Parameters
+        ----------
+        bbox : tuple of float
+            Minimum longitude, minimum latitude, maximum longitude and maximum latitude.
+        zoom : int, optional
+            Zoom level of the tiles. Defaults to :func:`tile_zoom`.
+
+        Returns
+        -------
+        list of tuple
+            Zoom level, column and row of each missing tile.
+        """
+        if zoom is None:
+            zoom = tile_zoom(bbox)
+        return [tile for tile in tiles(bbox, zoom) if not self.covered(tile)]
+
+    def add(self, tile: Optional[tuple], features: list):
+        """
+        Store the features fetched for a tile, replacing the features with the same ids.
+
+        Features without an id only replace identical features.
+
+        Parameters
+        ----------
+        tile : tuple of int, optional
+            Zoom level, column and row of the tile, marked as fetched.
+        features : list of dict
+            GeoJSON features.
+        """
+        for feature in features:
+            fid = _cache_key(feature)
+            if fid in self.features:
+                self._unindex(fid)
+            self.features[fid] = feature
+            self._order.setdefault(fid, len(self._order))
+            bbox = feature_bbox(feature)
+            self._bboxes[fid] = bbox
+            cells = None if bbox is None else _cells(bbox)
+            if cells is None or len(cells) > MAX_CELLS:
+                self._large.add(fid)
+            else:
+                for cell in cells:
+                    self._grid[cell].add(fid)
+        if tile is not None:
+            self.fetched.add(tuple(tile))
+
+    def _unindex(self, fid):
+        self._large.discard(fid)
+        bbox = self._bboxes.pop(fid, None)
+        if bbox is not None:
+            for cell in _cells(bbox):
+                self._grid[cell].discard(fid)
+
+    def query(self, bbox: tuple) -> list:
+        """
+        Return the features intersecting an extent.
+
+        Parameters
+        ----------
+        bbox : tuple of float
+            Minimum longitude, minimum latitude, maximum longitude and maximum latitude.
+
+        Returns
+        -------
+        list of dict
+            GeoJSON features, in the order they were added.
+        """
+        ids = set(self._large)
+        for cell in _cells(bbox):
+            ids.update(self._grid.get(cell, ()))
+        return [
+            self.features[fid]
+            for fid in sorted(ids, key=self._order.__getitem__)
+            if self._bboxes[fid] is None or _intersects(self._bboxes[fid], bbox)
+        ]
+
+    def clear(self):
+        """Remove all features and fetched tiles."""
+        self.features.clear()
+        self.fetched.clear()
+        self._bboxes.clear()
+        self._order.clear()
+        self._grid.clear()
+        self._large.clear()
@@ -0,0 +1,136 @@
+"""
+Index of the features of a WFS layer.
+
+Features are looked up by their GeoJSON `id`, by the value of their first property, which is usually the id field
+of the layer, and by the value of any property through inverted indexes built on first use.
+"""
+
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+from typing import Any, Optional
+
+from .cache import feature_id
+
+
+class FeatureIndex:
+    """
+    Features of a layer, indexed by id, by first property and by property values.
+
+    Parameters
+    ----------
+    features : iterable of dict, optional
+        GeoJSON features.
+    properties : iterable of str, optional
+        Properties whose inverted indexes are built right away. The others are built on their first lookup.
+    """
+
+    def __init__(self, features: Iterable[dict] = (), properties: Iterable[str] = ()):
+        self.features = list(features)
+        self.by_id = {}
+        self.by_first_property = {}
+        for feature in self.features:
+            fid = feature_id(feature)
+            if fid is not None and isinstance(fid, Hashable):
+                self.by_id.setdefault(fid, feature)
+            first = next(iter((feature.get("properties") or {}).values()), None)
+            if isinstance(first, Hashable):
+                self.by_first_property.setdefault(first, feature)
+        self._inverted = {}
+        for name in properties:
+            self._build(name)
+
+    def __len__(self):  # noqa: D105
+        return len(self.features)
+
+    def __repr__(self):  # noqa: D105
+        return f"FeatureIndex(features={len(self.features)}, properties={sorted(self._inverted)})"
+
+    def get(self, fid: Any) -> Optional[dict]:
+        """
+        Return the feature with an id.
+
+        Parameters
+        ----------
+        fid : Any
+            The GeoJSON `id` of the feature.
+
+        Returns
+        -------
+        dict or None
+            The first feature with this id, or None.
+        """
+        try:
+            return self.by_id.get(fid)
+        except TypeError:  # Unhashable
+            return None
+
+    def get_by_first_property(self, value: Any) -> Optional[dict]:
+        """
+        Return the feature with a value of its first property.
+
+        Parameters
+        ----------
+        value : Any
+            The value of the first property of the feature, whatever its name.
+
+        Returns
+        -------
+        dict or None
+            The first feature with this value, or None.
+        """
+        try:
+            return self.by_first_property.get(value)
+        except TypeError:  # Unhashable
+            return None
+
+    def _build(self, name):
+        inverted = defaultdict(list)
+        for feature in self.features:
+            value = (feature.get("properties") or {}).get(name)
+            if isinstance(value, Hashable):
+                inverted[value].append(feature)
+        self._inverted[name] = dict(inverted)
+        return self._inverted[name]
+
+    def lookup(self, name: str, value: Any) -> list:
+        """
+        Return the features with a property value.
+
+        Parameters
+        ----------
+        name : str
+            Name of the property.
+        value : Any
+            Value of the property.
+
+        Returns
+        -------
+        list of dict
+            The features, in the order of the layer.
+        """
+        inverted = self._inverted.get(name)
+        if inverted is None:
+            inverted = self._build(name)
+        try:
+            return list(inverted.get(value, ()))
+        except TypeError:  # Unhashable
+            return []
+
+    def values(self, name: str) -> list:
+        """
+        Return the distinct values of a property.
+
+        Parameters
+        ----------
+        name : str
+            Name of the property.
+
+        Returns
+        -------
+        list
+            The values, in the order they first appear in the layer.
+        """
+        inverted = self._inverted.get(name)
+        if inverted is None:
+            inverted = self._build(name)
+        return list(inverted)
@@ -1,7 +1,10 @@
 import base64
 import collections
 import keyword
+import os
 import re
+import threading
+import time
 from pathlib import Path
 from typing import Any, Optional, Union
 from urllib.parse import urlparse
@@ -66,20 +69,123 @@ def is_url(url: Optional[str]) -> bool:
         return True
 
 
-def is_opendap_url(url: str) -> bool:
+def default_cache_dir() -> Path:
+    """
+    Return the default directory for birdy caches.
+
+    Returns
+    -------
+    Path
+        The `BIRDY_CACHE_DIR` environment variable, or `birdy` in the user's cache directory.
+    """
+    if os.environ.get("BIRDY_CACHE_DIR"):
+        return Path(os.environ["BIRDY_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "birdy"
+
+
+def is_remote(url: Union[str, Path]) -> bool:
+    """
+    Return whether value is the URL of a remote resource served over HTTP(S).
+
+    Parameters
+    ----------
+    url : str or Path
+        URL or local path.
+
+    Returns
+    -------
+    bool
+        True if value is an HTTP or HTTPS URL.
+    """
+    return isinstance(url, str) and urlparse(url).scheme in ("http", "https")
+
+
+# URL patterns that identify OPeNDAP endpoints without sending a request.
+OPENDAP_PATTERNS = [re.compile(r"/dodsC/")]
+
+# Number of seconds a probe result is reused.
+OPENDAP_CACHE_TTL = 3600
+
+# Number of leading path segments of the prefix under which URLs share a negative probe result, e.g. 1 for
+# `https://host/wpsoutputs`. The outputs of every job of a server then share a single probe.
+OPENDAP_CACHE_DEPTH = 1
+
+_opendap_endpoints = set()
+_opendap_cache = {}
+_opendap_lock = threading.Lock()
+
+
+def register_opendap_endpoint(prefix: str) -> None:
+    """
+    Declare that every URL starting with `prefix` is an OpenDAP URL.
+
+    Parameters
+    ----------
+    prefix : str
+        URL prefix, e.g. `https://pavics.ouranos.ca/twitcher/ows/proxy/thredds/dodsC/`.
+    """
+    _opendap_endpoints.add(prefix)
+
+
+def clear_opendap_cache() -> None:
+    """Forget the results of previous OpenDAP probes."""
+    with _opendap_lock:
+        _opendap_cache.clear()
+
+
+def _opendap_keys(url: str) -> tuple:
+    """Return the cache keys of the directory, the prefix and the host of a URL."""
+    u = urlparse(url)
+    host = f"{u.scheme}://{u.netloc}"
+    segments = u.path.split("/")[1:-1]
+    return (
+        ("directory", "/".join([host] + segments)),
+        ("prefix", "/".join([host] + segments[:OPENDAP_CACHE_DEPTH])),
+        ("host", host),
+    )
+
+
+def _cached_opendap(keys: tuple) -> Optional[bool]:
+    now = time.monotonic()
+    with _opendap_lock:
+        for key in keys:
+            if key in _opendap_cache:
+                result, expires = _opendap_cache[key]
+                if now < expires:
+                    return result
+                del _opendap_cache[key]
+    return None
+
+
+def _cache_opendap(key: tuple, result: bool, ttl: float):
+    with _opendap_lock:
+        _opendap_cache[key] = (result, time.monotonic() + ttl)
+
+
+def is_opendap_url(url: str, ttl: Optional[float] = None) -> bool:
     """
     Check if a provided url is an OpenDAP url.
 
+    URLs starting with a prefix declared with :func:`register_opendap_endpoint`, or matching one of
+    `OPENDAP_PATTERNS`, are OpenDAP URLs. Otherwise, a HEAD request is sent to the server.
+
     The DAP Standard specifies that a specific tag must be included in the
     Content-Description header of every request. This tag is one of:
     "dods-dds" | "dods-das" | "dods-data" | "dods-error"
 
     So we can check if the header starts with `dods`.
 
+    A positive result applies to every URL in the same directory, and a negative one to every URL under the same
+    prefix, made of the host and the first `OPENDAP_CACHE_DEPTH` path segments. Results are reused for `ttl`
+    seconds. If the server cannot be reached, no other request is sent to the same host for `ttl` seconds.
+
     Parameters
     ----------
     url : str
         URL.
+    ttl : float, optional
+        Seconds during which a probe result is reused. Defaults to `OPENDAP_CACHE_TTL`.
 
     Returns
     -------
@@ -91,19 +197,36 @@ def is_opendap_url(url: str) -> bool:
     This might not work with every DAP server implementation.
     """
     import requests
-    from requests.exceptions import ConnectionError, InvalidSchema, MissingSchema
+    from requests.exceptions import ConnectionError, Timeout
+
+    if not is_remote(url):
+        return False
+
+    if any(url.startswith(prefix) for prefix in _opendap_endpoints):
+        return True
+
+    if any(pattern.search(url) for pattern in OPENDAP_PATTERNS):
+        return True
+
+    ttl = OPENDAP_CACHE_TTL if ttl is None else ttl
+    directory, prefix, host = _opendap_keys(url)
+    cached = _cached_opendap((directory, prefix, host))
+    if cached is not None:
+        return cached
 
     try:
         content_description = requests.head(url, timeout=5).headers.get(
             "Content-Description"
         )
-    except (ConnectionError, MissingSchema, InvalidSchema):
+    except (ConnectionError, Timeout):
+        _cache_opendap(host, False, ttl)
         return False
 
-    if content_description:
-        return content_description.lower().startswith("dods")
-    else:
-        return False
+    result = bool(
+        content_description and content_description.lower().startswith("dods")
+    )
+    _cache_opendap(directory if result else prefix, result, ttl)
+    return result
 
 
 def is_file(path: Optional[str]) -> bool:
@@ -1,6 +1,15 @@
 # noqa: D100
 
+import functools
+import http.server
 import os
+import re
+import threading
+import uuid
+from collections import defaultdict
+from urllib.parse import parse_qsl, urlparse
+
+from lxml import etree
 
 
 def resource_file(filepath):  # noqa: D103
@@ -16,3 +25,216 @@ def test_directory():
 URL_EMU = "http://localhost:5000/wps"
 EMU_CAPS_XML = open(resource_file("wps_emu_caps.xml"), "rb").read()
 EMU_DESC_XML = open(resource_file("wps_emu_desc.xml"), "rb").read()
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler honouring single `Range` requests, and `If-Range` with an ETag.
+
+    Set `drop_after` on the server to close the connection once that many bytes
+    have been sent, the first time a file is requested.
+    """
+
+    def log_message(self, format, *args):  # noqa: D102
+        pass
+
+    def send_head(self):  # noqa: D102
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return None
+
+        size = os.path.getsize(path)
+        etag = f'"{size}-{int(os.path.getmtime(path))}"'
+        start, end = 0, size - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if match and self.server.ranges and if_range in (None, etag):
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else end
+            if start >= size:
+                self.send_error(416)
+                return None
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        self.send_header(
+            "Last-Modified", self.date_time_string(int(os.path.getmtime(path)))
+        )
+        self.end_headers()
+
+        f = open(path, "rb")
+        f.seek(start)
+        self.length = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):  # noqa: D102
+        data = source.read(self.length)
+        drop = self.server.drop_after
+        if drop and self.path not in self.server.dropped:
+            self.server.dropped.add(self.path)
+            data = data[:drop]
+        self.server.requests.append(
+            (self.command, self.path, self.headers.get("Range"))
+        )
+        outputfile.write(data)
+
+
+class FileServer:
+    """Serve the files of a directory over HTTP from a background thread."""
+
+    def __init__(self, directory, ranges=True, drop_after=None):
+        handler = functools.partial(RangeRequestHandler, directory=str(directory))
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.ranges = ranges
+        self.httpd.drop_after = drop_after
+        self.httpd.dropped = set()
+        self.httpd.requests = []
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):  # noqa: D102
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):  # noqa: D102
+        return self.httpd.requests
+
+    def __enter__(self):  # noqa: D105
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+EXECUTE_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<wps:ExecuteResponse xmlns:wps="http://www.opengis.net/wps/1.0.0" xmlns:ows="http://www.opengis.net/ows/1.1"
+    service="WPS" version="1.0.0" xml:lang="en-US" statusLocation="{url}/status/{job}.xml">
+  <wps:Process wps:processVersion="1.0">
+    <ows:Identifier>hello</ows:Identifier>
+    <ows:Title>Say Hello</ows:Title>
+  </wps:Process>
+  <wps:Status creationTime="2024-01-01T00:00:00Z">{status}</wps:Status>
+  {outputs}
+</wps:ExecuteResponse>"""
+
+OUTPUTS = """<wps:ProcessOutputs>
+    <wps:Output>
+      <ows:Identifier>output</ows:Identifier>
+      <ows:Title>Output</ows:Title>
+      <wps:Data><wps:LiteralData dataType="string">Hello {name}</wps:LiteralData></wps:Data>
+    </wps:Output>
+    <wps:Output>
+      <ows:Identifier>file</ows:Identifier>
+      <ows:Title>File</ows:Title>
+      <wps:Reference href="{url}/outputs/{job}/hello.txt" mimeType="text/plain"/>
+    </wps:Output>
+  </wps:ProcessOutputs>"""
+
+STARTED = '<wps:ProcessStarted percentCompleted="50">Running</wps:ProcessStarted>'
+SUCCEEDED = "<wps:ProcessSucceeded>Done</wps:ProcessSucceeded>"
+FAILED = """<wps:ProcessFailed>
+    <ows:ExceptionReport version="1.0.0">
+      <ows:Exception exceptionCode="NoApplicableCode"><ows:ExceptionText>Bad name</ows:ExceptionText></ows:Exception>
+    </ows:ExceptionReport>
+  </wps:ProcessFailed>"""
+
+
+def describe_process(identifier):
+    """Return the DescribeProcess response of one Emu process, or of all of them."""
+    if identifier == "all":
+        return EMU_DESC_XML
+    root = etree.fromstring(EMU_DESC_XML)
+    for desc in list(root):
+        if desc.findtext("{http://www.opengis.net/ows/1.1}Identifier") != identifier:
+            root.remove(desc)
+    return etree.tostring(root)
+
+
+class WPSRequestHandler(RangeRequestHandler):
+    """Minimal WPS 1.0.0 server running the `hello` process of Emu.
+
+    Asynchronous jobs are running on their first status request and complete on the next one. A job fails if the
+    name is "fail". Outputs are a literal greeting and a reference to a text file, served with range support.
+    """
+
+    def _send_xml(self, body, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _response(self, job, status):
+        name = self.server.jobs[job]
+        outputs = OUTPUTS.format(url=self.server.url, job=job, name=name)
+        if status == SUCCEEDED and name == "fail":
+            status = FAILED
+        return EXECUTE_RESPONSE.format(
+            url=self.server.url,
+            job=job,
+            status=status,
+            outputs=outputs if status == SUCCEEDED else "",
+        ).encode()
+
+    def do_GET(self):  # noqa: D102
+        parsed = urlparse(self.path)
+        query = {k.lower(): v for k, v in parse_qsl(parsed.query)}
+        self.server.requests.append((self.command, self.path, None))
+        if parsed.path == "/wps":
+            request = query.get("request", "").lower()
+            if request == "getcapabilities":
+                return self._send_xml(EMU_CAPS_XML)
+            if request == "describeprocess":
+                return self._send_xml(describe_process(query.get("identifier")))
+            return self.send_error(400)
+        match = re.match(r"/status/(.+)\.xml$", parsed.path)
+        if match:
+            job = match.group(1)
+            self.server.polls[job] += 1
+            status = STARTED if self.server.polls[job] == 1 else SUCCEEDED
+            return self._send_xml(self._response(job, status))
+        return super().do_GET()
+
+    def do_POST(self):  # noqa: D102
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.command, self.path, None))
+        match = re.search(rb"<(?:\w+:)?LiteralData[^>]*>([^<]*)<", body)
+        name = match.group(1).decode() if match else "World"
+        job = uuid.uuid4().hex
+        self.server.jobs[job] = name
+        out = os.path.join(self.directory, "outputs", job)
+        os.makedirs(out)
+        with open(os.path.join(out, "hello.txt"), "w") as f:
+            f.write(f"Hello {name}\n" * 1000)
+
+        if b'storeExecuteResponse="true"' in body:
+            status = "<wps:ProcessAccepted>Accepted</wps:ProcessAccepted>"
+        else:
+            status = SUCCEEDED
+        self._send_xml(self._response(job, status))
+
+
+class WPSServer(FileServer):
+    """Serve a stub WPS at `url + "/wps"` from a background thread, storing outputs in `directory`."""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.httpd.RequestHandlerClass = functools.partial(
+            WPSRequestHandler, directory=str(directory)
+        )
+        self.httpd.url = self.url
+        self.httpd.jobs = {}
+        self.httpd.polls = defaultdict(int)
+
+    @property
+    def wps_url(self):  # noqa: D102
+        return f"{self.url}/wps"
@@ -0,0 +1,81 @@
+# noqa: D100
+
+import json
+import os
+import time
+
+import pytest
+from common import FileServer
+
+from birdy.client import converters
+from birdy.client.cache import OutputCache
+
+
+@pytest.fixture
+def src(tmp_path):  # noqa: D103
+    d = tmp_path / "src"
+    d.mkdir()
+    (d / "a.json").write_text(json.dumps({"a": 1}))
+    (d / "b.json").write_text(json.dumps({"a": 1}))
+    (d / "c.bin").write_bytes(os.urandom(1000))
+    return d
+
+
+def gets(server):  # noqa: D103
+    return [p for m, p, _ in server.requests if m == "GET"]
+
+
+def test_hit(src, tmp_path):  # noqa: D103
+    cache = OutputCache(tmp_path / "cache")
+    with FileServer(src) as server:
+        url = f"{server.url}/a.json"
+        p1 = cache.get(url)
+        p2 = cache.get(url)
+        assert gets(server) == ["/a.json"]
+    assert p1 == p2
+    assert p1.name == "a.json"
+    assert cache.lookup(url) == p1
+
+    # Another instance sharing the same directory sees the file.
+    assert OutputCache(tmp_path / "cache").lookup(url) == p1
+
+
+def test_etag_change(src, tmp_path):  # noqa: D103
+    cache = OutputCache(tmp_path / "cache")
+    with FileServer(src) as server:
+        url = f"{server.url}/c.bin"
+        cache.get(url)
+        (src / "c.bin").write_bytes(b"new content")
+        os.utime(src / "c.bin", (time.time() + 10, time.time() + 10))
+        p = cache.get(url)
+        assert gets(server) == ["/c.bin", "/c.bin"]
+    assert p.read_bytes() == b"new content"
+
+
+def test_content_addressed(src, tmp_path):  # noqa: D103
+    cache = OutputCache(tmp_path / "cache")
+    with FileServer(src) as server:
+        pa = cache.get(f"{server.url}/a.json")
+        pb = cache.get(f"{server.url}/b.json")
+    assert pa.parent == pb.parent
+    assert cache.size == pa.stat().st_size * 2
+
+
+def test_lru_eviction(src, tmp_path):  # noqa: D103
+    cache = OutputCache(tmp_path / "cache", max_size=1000)
+    with FileServer(src) as server:
+        pa = cache.get(f"{server.url}/a.json")
+        os.utime(pa, (1, 1))
+        pc = cache.get(f"{server.url}/c.bin")
+        assert not pa.exists()
+        assert pc.exists()
+        assert cache.lookup(f"{server.url}/a.json") is None
+
+
+def test_convert_through_cache(src, tmp_path):  # noqa: D103
+    cache = OutputCache(tmp_path / "cache")
+    with FileServer(src) as server:
+        url = f"{server.url}/a.json"
+        c = converters.JSONConverter(url, path=tmp_path / "tmp", cache=cache)
+        assert c.convert() == {"a": 1}
+        assert c.file == cache.lookup(url)
@@ -1,8 +1,14 @@
 # noqa: D100
 
+import json
+from collections import OrderedDict
+from unittest import mock
+
 import pytest
+import requests
 from click.testing import CliRunner
-from common import EMU_CAPS_XML, URL_EMU
+from common import EMU_CAPS_XML, EMU_DESC_XML, URL_EMU, WPSServer
+from lxml import etree
 
 import birdy.cli.run
 
@@ -57,3 +63,282 @@ def test_multiple_outputs():  # noqa: D103
         ],
     )
     assert result.exit_code == 0
+
+
+@pytest.fixture
+def cached_cli(tmp_path, monkeypatch):  # noqa: D103
+    monkeypatch.setattr(cli, "cache_dir", tmp_path)
+    monkeypatch.setattr(cli, "commands", OrderedDict())
+    monkeypatch.setattr(cli, "desc_xml", EMU_DESC_XML)
+    monkeypatch.setattr(cli, "_wps", None)
+    monkeypatch.setitem(birdy.cli.run.CONTEXT_OBJ, "refresh", False)
+    return cli
+
+
+def test_command_cache(cached_cli, monkeypatch):  # noqa: D103
+    runner = CliRunner()
+    result = runner.invoke(cached_cli, ["hello", "--help"])
+    assert result.exit_code == 0
+    assert "--name" in result.output
+
+    # Later invocations do not contact the service.
+    monkeypatch.setattr(cached_cli, "commands", OrderedDict())
+    monkeypatch.setattr(cached_cli, "caps_xml", None)
+    monkeypatch.setattr(cached_cli, "desc_xml", None)
+    monkeypatch.setattr(cached_cli, "_wps", None)
+
+    with mock.patch("owslib.wps.WebProcessingService") as wps:
+        result = runner.invoke(cached_cli, ["hello", "--help"])
+        assert result.exit_code == 0
+        assert "--name" in result.output
+
+        result = runner.invoke(cached_cli, ["--help"])
+        assert result.exit_code == 0
+        assert "wordcounter" in result.output
+        wps.assert_not_called()
+
+        monkeypatch.setattr(cached_cli, "commands", OrderedDict())
+        runner.invoke(cached_cli, ["--refresh", "--help"])
+        wps.assert_called()
+
+
+@pytest.fixture
+def wps_cli(tmp_path, monkeypatch):  # noqa: D103
+    with WPSServer(tmp_path) as server:
+        monkeypatch.setattr(cli, "url", server.wps_url)
+        monkeypatch.setattr(cli, "caps_xml", None)
+        monkeypatch.setattr(cli, "desc_xml", None)
+        monkeypatch.setattr(cli, "cache_dir", tmp_path / "cache")
+        monkeypatch.setattr(cli, "commands", OrderedDict())
+        monkeypatch.setattr(cli, "_wps", None)
+        monkeypatch.setitem(birdy.cli.run.CONTEXT_OBJ, "refresh", False)
+        yield server
+
+
+def test_batch(wps_cli, tmp_path):  # noqa: D103
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text('{"name": "Alice"}\n{"name": "fail"}\n{"name": "Bob"}\n')
+    results = tmp_path / "results.jsonl"
+    args = ["batch", "hello", "-i", str(jobs), "-o", str(results), "-c", "2"]
+    args += ["--poll-interval", "0.01"]
+
+    runner = CliRunner()
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 1
+    records = {r["id"]: r for r in map(json.loads, results.read_text().splitlines())}
+    assert sorted(records) == [1, 2, 3]
+    assert records[1]["status"] == "ProcessSucceeded"
+    assert records[1]["outputs"]["output"] == ["Hello Alice"]
+    assert records[1]["outputs"]["file"].endswith("hello.txt")
+    assert records[1]["timings"]["total"] >= records[1]["timings"]["run"]
+    assert records[2]["errors"] == ["Bad name"]
+    # Executions are asynchronous, and checked until complete.
+    assert len(wps_cli.httpd.polls) == 3
+
+    # Only the failed job runs again.
+    jobs.write_text('{"name": "Alice"}\n{"name": "Carol"}\n{"name": "Bob"}\n')
+    result = runner.invoke(cli, args + ["--resume"])
+    assert result.exit_code == 0
+    lines = results.read_text().splitlines()
+    assert len(lines) == 4
+    assert json.loads(lines[-1])["outputs"]["output"] == ["Hello Carol"]
+
+
+def test_batch_csv(wps_cli, tmp_path):  # noqa: D103
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text("name\nAlice\nBob\n")
+    result = CliRunner().invoke(
+        cli, ["batch", "hello", "-i", str(jobs), "--poll-interval", "0.01"]
+    )
+    assert result.exit_code == 0
+    assert "Hello Bob" in result.stdout
+
+
+def test_download_outputs(wps_cli, tmp_path):  # noqa: D103
+    out = tmp_path / "downloads"
+    args = ["hello", "--name", "Alice", "--download-dir", str(out), "--convert"]
+    runner = CliRunner()
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert (out / "hello.txt").read_text().startswith("Hello Alice")
+    assert "Downloaded 1 of 1 files" in result.output
+    assert "file: 'Hello Alice" in result.output
+
+    # Outputs converted without a download directory are downloaded to a directory removed afterwards.
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    with mock.patch("tempfile.tempdir", str(scratch)):
+        result = runner.invoke(cli, ["hello", "--name", "Alice", "--convert"])
+    assert result.exit_code == 0, result.output
+    assert "file: 'Hello Alice" in result.output
+    assert list(scratch.iterdir()) == []
+
+
+def test_input_named_like_option():  # noqa: D103
+    from birdy.cli.base import get_template_env
+
+    options = [
+        dict(name=name, help="", type="STRING", multiple=False)
+        for name in ("convert", "json")
+    ]
+    code = (
+        get_template_env()
+        .get_template("cmd.py.j2")
+        .render(name="proc", url=URL_EMU, version="1.0", help="", options=options)
+    )
+    namespace = {}
+    exec(compile(code, "<string>", "exec"), namespace)
+    params = {p.name: p.opts for p in namespace["cli"].params}
+    # The inputs keep their names, and the options of birdy without them are left out.
+    assert params["convert"] == ["--convert"]
+    assert params["json"] == ["--json"]
+    assert params["_birdy_as_json"] == ["--ndjson"]
+    assert "_birdy_convert" not in params
+
+
+def test_json_events(wps_cli, tmp_path):  # noqa: D103
+    args = ["hello", "--name", "Alice", "--json", "--download-dir", str(tmp_path)]
+    # Outputs are requested so that the execution is asynchronous.
+    args += ["--output_formats", "file", "true", "None"]
+    with mock.patch("birdy.cli.misc.time.sleep"):
+        result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in result.output.splitlines()]
+    names = [e["event"] for e in events]
+    assert names == [
+        "accepted",
+        "status",
+        "status",
+        "status",
+        "output",
+        "output",
+        "download",
+        "completed",
+    ]
+    assert [e["status"] for e in events[1:4]] == [
+        "ProcessAccepted",
+        "ProcessStarted",
+        "ProcessSucceeded",
+    ]
+    assert events[2]["percent"] == 50
+    assert events[6]["path"] == str(tmp_path / "hello.txt")
+    assert set(events[-1]["timings"]) == {"submit", "queue", "run", "download"}
+
+
+def test_bench(wps_cli):  # noqa: D103
+    args = ["bench", "hello", "-i", "name=Bob", "-n", "3", "-c", "2", "--json"]
+    result = CliRunner().invoke(cli, args + ["--poll-interval", "0"])
+    assert result.exit_code == 0, result.output
+    stats = json.loads(result.output)
+    assert list(stats) == [
+        "capabilities",
+        "describe",
+        "execute-sync",
+        "execute-async",
+        "download",
+    ]
+    assert stats["execute-async"]["job"]["count"] == 3
+    # Each job is checked twice by the stub server, once running and once complete.
+    assert stats["execute-async"]["poll"]["count"] == 6
+    assert stats["download"]["download"]["count"] == 3
+    s = stats["capabilities"]["capabilities"]
+    assert s["p50"] <= s["p95"] <= s["p99"]
+    assert 0 < s["client"] <= s["p99"]
+
+
+def test_percentile():  # noqa: D103
+    from birdy.cli.bench import percentile
+
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_completion_offline(cached_cli, monkeypatch):  # noqa: D103
+    cached_cli.build_cache()
+    monkeypatch.setattr(cached_cli, "commands", OrderedDict())
+    monkeypatch.setenv("BIRDY_CLI_CACHE_TTL", "0")
+
+    def complete(*words):
+        env = dict(
+            _BIRDY_COMPLETE="bash_complete",
+            COMP_WORDS=" ".join(("birdy",) + words),
+            COMP_CWORD=str(len(words)),
+        )
+        monkeypatch.setattr(cached_cli, "commands", OrderedDict())
+        result = CliRunner().invoke(cached_cli, [], env=env, prog_name="birdy")
+        return [line.split(",")[1] for line in result.output.splitlines()]
+
+    with (
+        mock.patch("owslib.wps.WebProcessingService") as wps,
+        mock.patch("subprocess.Popen") as popen,
+    ):
+        assert complete("hel") == ["hello"]
+        assert "--name" in complete("hello", "--")
+        assert "batch" in complete("ba")
+        wps.assert_not_called()
+        # The expired cache is refreshed by a single background process.
+        popen.assert_called_once()
+        assert popen.call_args[0][0][-1] == "--build-cache"
+
+
+def _submit(server, name):
+    """Start an asynchronous execution on the stub server, returning its status location."""
+    body = f'<ResponseDocument storeExecuteResponse="true"/><LiteralData>{name}</LiteralData>'
+    r = requests.post(server.wps_url, data=body)
+    return etree.fromstring(r.content).get("statusLocation")
+
+
+def test_status(wps_cli, tmp_path):  # noqa: D103
+    alice, failed = _submit(wps_cli, "Alice"), _submit(wps_cli, "fail")
+    journal = tmp_path / "journal.jsonl"
+    journal.write_text(json.dumps(dict(id=1, statusLocation=alice)) + "\n")
+    args = ["status", "--journal", str(journal), failed, "--interval", "0"]
+
+    result = CliRunner().invoke(cli, args + ["--json"])
+    assert result.exit_code == 1
+    events = [json.loads(line) for line in result.output.splitlines()]
+    completed = {e["job"]: e for e in events if e["event"] == "completed"}
+    assert completed["1"]["outputs"]["output"] == ["Hello Alice"]
+    assert completed[failed.rsplit("/", 1)[1][:-4]]["errors"] == ["Bad name"]
+    # Running, then complete.
+    statuses = [e["status"] for e in events if e["event"] == "status"]
+    assert statuses.count("ProcessStarted") == 2
+    assert statuses.count("ProcessSucceeded") == 1
+    assert wps_cli.httpd.polls[alice.rsplit("/", 1)[1][:-4]] == 2
+
+    result = CliRunner().invoke(cli, ["status", alice, "--once"])
+    assert result.exit_code == 0
+    assert "Hello Alice" in result.output
+
+
+def test_status_same_label(wps_cli, tmp_path):  # noqa: D103
+    # Journal ids of different batches repeat.
+    args = ["status", "--interval", "0", "--json"]
+    for i, name in enumerate(("Alice", "Bob")):
+        journal = tmp_path / f"journal{i}.jsonl"
+        location = _submit(wps_cli, name)
+        journal.write_text(json.dumps(dict(id=1, statusLocation=location)) + "\n")
+        args += ["--journal", str(journal)]
+
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0
+    events = [json.loads(line) for line in result.output.splitlines()]
+    completed = [e for e in events if e["event"] == "completed"]
+    assert sorted(e["outputs"]["output"][0] for e in completed) == [
+        "Hello Alice",
+        "Hello Bob",
+    ]
+
+
+def test_status_unreachable(wps_cli):  # noqa: D103
+    # A missing status document is given up right away, an unreachable server after a few checks.
+    missing = f"{wps_cli.url}/outputs/missing.xml"
+    args = ["status", missing, "http://127.0.0.1:9/1.xml", "--interval", "0"]
+    result = CliRunner().invoke(cli, args + ["--max-failures", "2", "--json"])
+    assert result.exit_code == 1
+    events = [json.loads(line) for line in result.output.splitlines()]
+    completed = {e["job"]: e for e in events if e["event"] == "completed"}
+    assert completed.keys() == {"missing", "1"}
+    assert "404" in completed["missing"]["errors"][0]
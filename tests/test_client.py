@@ -134,7 +134,6 @@ def test_interactive(capsys):  # noqa: D103
 
 @pytest.mark.online
 def test_wps_client_multiple_outputs(wps):  # noqa: D103
-    pytest.importorskip("metalink.download")
     resp = wps.multiple_outputs(2)
 
     # As reference
@@ -412,3 +411,86 @@ def test_verbose_deprecation():  # noqa: D103
         WPSClient(
             url=URL_EMU, caps_xml=EMU_CAPS_XML, desc_xml=EMU_DESC_XML, verbose=True
         )
+
+
+def test_from_owslib_array():  # noqa: D103
+    from birdy.client.utils import from_owslib_array
+
+    assert from_owslib_array(["1", "2"], "integer") == [1, 2]
+    assert from_owslib_array(["2020-01-01", None], "date") == [
+        datetime.date(2020, 1, 1),
+        None,
+    ]
+
+    np = pytest.importorskip("numpy")
+    out = from_owslib_array(["1.5", "2"], "float", asarray=True)
+    assert out.dtype == np.float64
+    out = from_owslib_array(
+        ["2020-01-01T00:00:00Z", "2020-01-01T12:00:00+02:00"], "dateTime", asarray=True
+    )
+    np.testing.assert_array_equal(
+        out, np.array(["2020-01-01T00:00", "2020-01-01T10:00"], dtype="datetime64[us]")
+    )
+    out = from_owslib_array(["Jan 1 2020"], "dateTime", asarray=True)
+    assert out[0] == datetime.datetime(2020, 1, 1)
+
+
+def test_result_memoized(tmp_path):  # noqa: D103
+    from lxml import etree
+
+    from birdy.client import outputs
+    from birdy.client.outputs import WPSResult
+
+    (tmp_path / "out.json").write_text(json.dumps({"a": 1}))
+    xml = f"""
+    <wps:Output xmlns:wps="http://www.opengis.net/wps/1.0.0" xmlns:ows="http://www.opengis.net/ows/1.1">
+      <ows:Identifier>output</ows:Identifier>
+      <wps:Reference href="{(tmp_path / 'out.json').as_uri()}" mimeType="application/json"/>
+    </wps:Output>"""
+    result = WPSResult()
+    result.process = mock.Mock(identifier="proc")
+    result.processOutputs = [owslib.wps.Output(etree.fromstring(xml))]
+    result.status = "ProcessSucceeded"
+    result.attach({})
+
+    with mock.patch.object(outputs, "convert", wraps=outputs.convert) as convert:
+        out = result.get(asobj=True)
+        assert out.output == {"a": 1}
+        assert result.get(asobj=True).output is out.output
+        assert type(result.get(asobj=True)) is type(out)
+        assert convert.call_count == 1
+
+        result.get(asobj=True, chunks={"time": 1})
+        assert convert.call_count == 2
+
+        result.invalidate("output")
+        result.get(asobj=True)
+        assert convert.call_count == 3
+
+        result.memoize = False
+        result.get(asobj=True)
+        assert convert.call_count == 4
+
+
+def test_result_stream_not_memoized(tmp_path):  # noqa: D103
+    pytest.importorskip("ijson")
+    from lxml import etree
+
+    from birdy.client.outputs import WPSResult
+
+    (tmp_path / "out.json").write_text(json.dumps([{"a": 1}, {"a": 2}]))
+    xml = f"""
+    <wps:Output xmlns:wps="http://www.opengis.net/wps/1.0.0" xmlns:ows="http://www.opengis.net/ows/1.1">
+      <ows:Identifier>output</ows:Identifier>
+      <wps:Reference href="{(tmp_path / 'out.json').as_uri()}" mimeType="application/json"/>
+    </wps:Output>"""
+    result = WPSResult()
+    result.process = mock.Mock(identifier="proc")
+    result.processOutputs = [owslib.wps.Output(etree.fromstring(xml))]
+    result.status = "ProcessSucceeded"
+    result.attach({})
+
+    # Iterators can only be read once, and are created again by each call.
+    for _ in range(2):
+        assert list(result.get(asobj=True, stream=True).output) == [{"a": 1}, {"a": 2}]
+    assert result._memo == {}
@@ -2,6 +2,7 @@
 
 import json
 import os
+import shutil
 import tempfile
 
 import pytest
@@ -105,3 +106,321 @@ def test_raster_tif():
 
     da = converters.convert(fn, path="/tmp")
     assert isinstance(da, xr.DataArray)
+
+
+def test_converter_index():  # noqa: D103
+    index = converters.get_index()
+    assert index is converters.get_index()
+
+    found = index.find("application/x-netcdf", "nc")
+    assert found[0] is converters.XarrayConverter
+    assert found[-1] is converters.GenericConverter
+    assert found == converters._find_converter("application/x-netcdf", "nc", None)
+
+    found = converters.find_converter("out.json", [converters.JSONConverter])
+    assert found == [converters.JSONConverter, converters.GenericConverter]
+
+
+@pytest.fixture
+def local_converters():
+    """Forget converter classes defined in a test once it is done."""
+    yield
+    import gc
+
+    converters._dependency_errors.clear()
+    converters._indexes.clear()
+    gc.collect()
+
+
+def test_index_invalidated_by_new_converter(local_converters):  # noqa: D103
+    converters.get_index()
+
+    class CSVConverter(converters.BaseConverter):
+        extensions = ["csv"]
+        priority = 5
+
+    assert converters.find_converter("a.csv")[0] is CSVConverter
+    del CSVConverter
+
+
+def test_dependencies_checked_once(local_converters):  # noqa: D103
+    calls = []
+
+    class MissingConverter(converters.BaseConverter):
+        priority = 1
+
+        def check_dependencies(self):
+            calls.append(1)
+            self._check_import("not_a_module")
+
+    for _ in range(3):
+        with pytest.raises(ImportError, match="not_a_module"):
+            MissingConverter("a.txt")
+    assert len(calls) == 1
+    del MissingConverter
+
+
+def test_entry_points(monkeypatch):  # noqa: D103
+    from importlib import metadata
+
+    ep = metadata.EntryPoint(
+        name="dummy",
+        value="birdy.client.converters:TextConverter",
+        group=converters.ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(metadata, "entry_points", lambda **kwargs: [ep])
+    assert converters.load_entry_points() == [converters.TextConverter]
+
+
+def test_local_converters_forgotten():  # noqa: D103
+    import gc
+
+    def define():
+        class LocalConverter(converters.BaseConverter):
+            extensions = ["local"]
+            priority = 1
+
+        assert converters.find_converter("out.local")[0] is LocalConverter
+
+    define()
+    # As done by the `local_converters` fixture.
+    converters._dependency_errors.clear()
+    converters._indexes.clear()
+    gc.collect()
+    names = {c.__name__ for c in converters.all_subclasses(converters.BaseConverter)}
+    assert "LocalConverter" not in names
+    assert converters.find_converter("out.local") == [converters.GenericConverter]
+
+
+def test_xarray_options():  # noqa: D103
+    xr = pytest.importorskip("xarray")
+    pytest.importorskip("dask")
+
+    fn = resource_file("dummy.nc")
+    ds = converters.convert(
+        fn, path="/tmp", options={"chunks": {}, "decode_times": False}
+    )
+    assert isinstance(ds, xr.Dataset)
+    assert all(v.chunks is not None for v in ds.data_vars.values())
+
+
+def test_combine_nested(tmp_path):  # noqa: D103
+    import zipfile
+
+    xr = pytest.importorskip("xarray")
+    pytest.importorskip("dask")
+    np = pytest.importorskip("numpy")
+
+    ds = xr.Dataset({"tas": ("time", np.arange(10.0))}, coords={"time": np.arange(10)})
+    f = tmp_path / "out.zip"
+    with zipfile.ZipFile(f, mode="w") as zf:
+        for i, part in enumerate(
+            (ds.isel(time=slice(0, 5)), ds.isel(time=slice(5, 10)))
+        ):
+            part.to_netcdf(tmp_path / f"{i}.nc")
+            zf.write(tmp_path / f"{i}.nc", arcname=f"{i}.nc")
+
+    out = converters.convert(
+        f,
+        path=tmp_path / "x",
+        converters=[converters.ZipConverter],
+        options={"combine": True, "parallel": False},
+    )
+    assert isinstance(out, xr.Dataset)
+    assert out.tas.chunks is not None
+    np.testing.assert_array_equal(out.tas.values, ds.tas.values)
+
+    out = converters.convert(
+        f, path=tmp_path / "y", converters=[converters.ZipConverter]
+    )
+    assert len(out) == 2
+
+
+def test_combine_nested_missing_dependency(tmp_path, monkeypatch):  # noqa: D103
+    import zipfile
+
+    f = tmp_path / "out.zip"
+    with zipfile.ZipFile(f, mode="w") as zf:
+        zf.writestr("0.nc", b"CDF")
+        zf.writestr("1.nc", b"CDF")
+    monkeypatch.setitem(
+        converters._dependency_errors, converters.XarrayConverter, ImportError("xarray")
+    )
+    with pytest.raises(ImportError):
+        converters.convert(
+            f,
+            path=tmp_path / "x",
+            converters=[converters.ZipConverter],
+            options={"combine": True},
+        )
+
+
+def test_generic_buffer(tmp_path):  # noqa: D103
+    from common import FileServer
+
+    data = bytes(range(256)) * 4
+    fn = tmp_path / "out.bin"
+    fn.write_bytes(data)
+
+    view = converters.convert(fn, path=tmp_path, options={"buffer": "mmap"})
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert view.tobytes() == data
+
+    (tmp_path / "empty.bin").write_bytes(b"")
+    view = converters.convert(
+        tmp_path / "empty.bin", path=tmp_path, options={"buffer": "mmap"}
+    )
+    assert len(view) == 0
+
+    with FileServer(tmp_path) as server:
+        url = f"{server.url}/out.bin"
+        c = converters.GenericConverter(
+            url, path=tmp_path / "dl", options={"buffer": "stream"}
+        )
+        with c.convert() as f:
+            assert f.read() == data
+        assert not (tmp_path / "dl" / "out.bin").exists()
+
+
+def test_json_stream(tmp_path):  # noqa: D103
+    pytest.importorskip("ijson")
+    fn = tmp_path / "out.json"
+
+    fn.write_text(json.dumps([{"a": 1, "b": 0.5}, {"a": 2, "c": "x"}]))
+    items = converters.JSONConverter(fn, options={"stream": True}).convert()
+    assert not isinstance(items, list)
+    assert list(items) == [{"a": 1, "b": 0.5}, {"a": 2, "c": "x"}]
+
+    cols = converters.JSONConverter(fn, options={"columnar": True}).convert()
+    assert cols == {"a": [1, 2], "b": [0.5, None], "c": [None, "x"]}
+
+    fn.write_text(json.dumps({"a": 1, "b": [1, 2]}))
+    items = converters.JSONConverter(fn, options={"stream": True}).convert()
+    assert dict(items) == {"a": 1, "b": [1, 2]}
+
+
+def test_geojson_stream(tmp_path):  # noqa: D103
+    geojson = pytest.importorskip("geojson")
+    pytest.importorskip("ijson")
+
+    expected = [
+        geojson.Feature(
+            id=i,
+            geometry=geojson.Point((i, 1.5)),
+            properties={"name": f"f{i}", **({"area": 2.5} if i % 2 else {})},
+        )
+        for i in range(4)
+    ]
+    fn = tmp_path / "out.geojson"
+    fn.write_text(geojson.dumps(geojson.FeatureCollection(expected)))
+
+    features = converters.GeoJSONConverter(fn, options={"stream": True}).convert()
+    features = list(features)
+    assert features == expected
+    assert isinstance(features[0], geojson.Feature)
+
+    cols = converters.GeoJSONConverter(fn, options={"columnar": True}).convert()
+    assert cols["id"] == [0, 1, 2, 3]
+    assert cols["geometry"] == [f["geometry"] for f in expected]
+    assert cols["properties"] == {
+        "name": ["f0", "f1", "f2", "f3"],
+        "area": [None, 2.5, None, 2.5],
+    }
+
+
+def test_json_stream_not_geojson(tmp_path):  # noqa: D103
+    pytest.importorskip("geojson")
+    pytest.importorskip("ijson")
+    fn = tmp_path / "out.json"
+    fn.write_text(json.dumps([{"a": 1, "type": "x"}, {"a": 2}]))
+    assert converters.find_converter(fn)[0] is converters.GeoJSONConverter
+
+    items = converters.convert(fn, tmp_path, options={"stream": True})
+    assert list(items) == [{"a": 1, "type": "x"}, {"a": 2}]
+    cols = converters.convert(fn, tmp_path, options={"columnar": True})
+    assert cols == {"a": [1, 2], "type": ["x", None]}
+
+    fn.write_text(json.dumps({"type": "Feature", "properties": {"a": 1}}))
+    items = converters.convert(fn, tmp_path, options={"stream": True})
+    assert dict(items) == {"type": "Feature", "properties": {"a": 1}}
+
+
+def test_lazy_zip(tmp_path):  # noqa: D103
+    import zipfile
+
+    xr = pytest.importorskip("xarray")
+
+    f = tmp_path / "out.zip"
+    with zipfile.ZipFile(f, mode="w") as zf:
+        zf.writestr("a.json", json.dumps({"a": 1}))
+        zf.writestr("b.csv", "a, b, c\n1, 2, 3")
+        zf.write(resource_file("dummy.nc"), arcname="data/dummy.nc")
+
+    extract = tmp_path / "x"
+    archive = converters.convert(
+        f, path=extract, converters=[converters.ZipConverter], options={"lazy": True}
+    )
+    assert isinstance(archive, converters.ZipArchive)
+    assert archive.members == ["a.json", "b.csv", "data/dummy.nc"]
+    assert not extract.exists() or not list(extract.iterdir())
+
+    assert archive["a.json"] == {"a": 1}
+    assert [p.name for p in extract.iterdir()] == ["a.json"]
+
+    ds = archive["data/dummy.nc"]
+    assert isinstance(ds, xr.Dataset)
+    assert not (extract / "data").exists()
+
+    with archive.open("b.csv") as fp:
+        assert fp.read().startswith(b"a, b")
+    assert archive.vsipath("b.csv").startswith("/vsizip/")
+
+    with pytest.raises(KeyError):
+        archive["missing.txt"]
+
+    ds.close()
+    archive.close()
+    shutil.rmtree(extract)
+
+
+@pytest.mark.parametrize("name", ["Netcdf4Converter", "XarrayConverter"])
+def test_netcdf_in_memory(tmp_path, name):  # noqa: D103
+    from common import FileServer
+
+    pytest.importorskip("xarray")
+    cls = getattr(converters, name)
+    src = tmp_path / "src"
+    src.mkdir()
+    shutil.copy(resource_file("test.nc"), src)
+    size = (src / "test.nc").stat().st_size
+
+    with FileServer(src) as server:
+        url = f"{server.url}/test.nc"
+        c = cls(url, path=tmp_path / "small", options={"memory_threshold": size})
+        ds = c.convert()
+        assert c._file is None
+        assert not (tmp_path / "small").exists()
+        assert len(ds.variables) > 0
+
+        c = cls(url, path=tmp_path / "large", options={"memory_threshold": size - 1})
+        c.convert()
+        assert c.file.parent == tmp_path / "large"
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_raster_tif_remote(tmp_path, ranges):  # noqa: D103
+    from common import FileServer
+
+    xr = pytest.importorskip("xarray")
+    pytest.importorskip("rioxarray")
+    shutil.copy(resource_file("Olympus.tif"), tmp_path)
+
+    with FileServer(tmp_path, ranges=ranges) as server:
+        c = converters.GeotiffRioxarrayConverter(
+            f"{server.url}/Olympus.tif", path=tmp_path / "out"
+        )
+        da = c.convert()
+        assert isinstance(da, xr.DataArray)
+        assert (c.vsicurl() is not None) is ranges
+        assert (tmp_path / "out" / "Olympus.tif").exists() is not ranges
@@ -0,0 +1,203 @@
+# noqa: D100
+
+import hashlib
+import json
+import os
+
+import pytest
+from common import FileServer
+
+from birdy.client.download import accepts_ranges, download, url_filename
+from birdy.exceptions import DownloadError
+
+SIZE = 100_000
+
+
+@pytest.fixture
+def served(tmp_path):  # noqa: D103
+    src = tmp_path / "src"
+    src.mkdir()
+    data = os.urandom(SIZE)
+    (src / "out.nc").write_bytes(data)
+    return src, data
+
+
+def test_url_filename():  # noqa: D103
+    assert url_filename("http://localhost:5000/outputs/a/out.nc") == "out.nc"
+    assert url_filename("http://localhost:5000/outputs/a%20b.nc?x=1") == "a b.nc"
+    assert url_filename("http://localhost:5000/") == "output"
+
+
+def test_download(served, tmp_path):  # noqa: D103
+    src, data = served
+    with FileServer(src) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path / "dst", chunk_size=4096)
+    assert fn == tmp_path / "dst" / "out.nc"
+    assert fn.read_bytes() == data
+    assert not fn.with_name("out.nc.part").exists()
+
+
+def test_download_file_url(served, tmp_path):  # noqa: D103
+    src, data = served
+    fn = download((src / "out.nc").as_uri(), tmp_path / "dst")
+    assert fn.read_bytes() == data
+
+
+def test_resume_after_drop(served, tmp_path):  # noqa: D103
+    src, data = served
+    with FileServer(src, drop_after=30_000) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path, chunk_size=4096)
+        ranges = [r for _, _, r in server.requests]
+    assert fn.read_bytes() == data
+    assert ranges[0] is None
+    # Resumed from the last chunk written to disk.
+    assert 0 < int(ranges[-1].split("=")[1].rstrip("-")) <= 30_000
+
+
+def _etag(path):
+    return f'"{path.stat().st_size}-{int(path.stat().st_mtime)}"'
+
+
+def test_resume_existing_part(served, tmp_path):  # noqa: D103
+    src, data = served
+    (tmp_path / "out.nc.part").write_bytes(data[:50_000])
+    (tmp_path / "out.nc.part.etag").write_text(_etag(src / "out.nc"))
+    with FileServer(src) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path)
+        assert server.requests[0][2] == "bytes=50000-"
+    assert fn.read_bytes() == data
+    assert not (tmp_path / "out.nc.part.etag").exists()
+
+
+@pytest.mark.parametrize("etag", ['"400-0"', None])
+def test_stale_part_restarts(served, tmp_path, etag):  # noqa: D103
+    src, data = served
+    (tmp_path / "out.nc.part").write_bytes(b"x" * 400)
+    if etag is not None:
+        # The part was downloaded from an earlier version of the file.
+        (tmp_path / "out.nc.part.etag").write_text(etag)
+    with FileServer(src) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path)
+    assert fn.read_bytes() == data
+
+
+def test_no_range_support_restarts(served, tmp_path):  # noqa: D103
+    src, data = served
+    (tmp_path / "out.nc.part").write_bytes(b"garbage")
+    with FileServer(src, ranges=False) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path)
+    assert fn.read_bytes() == data
+
+
+def test_segments(served, tmp_path):  # noqa: D103
+    src, data = served
+    with FileServer(src) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path, chunk_size=1024, segments=4)
+        ranges = {r for m, _, r in server.requests if m == "GET"}
+    assert fn.read_bytes() == data
+    assert len(ranges) == 4
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_segments_changed(served, tmp_path, monkeypatch):  # noqa: D103
+    from birdy.client import download as dl
+
+    src, data = served
+    probe = dl._probe_ranges
+    # The file changes between the probe and the segment requests.
+    monkeypatch.setattr(
+        dl, "_probe_ranges", lambda *a, **kw: (probe(*a, **kw)[0], '"old"')
+    )
+    with FileServer(src) as server:
+        fn = download(f"{server.url}/out.nc", tmp_path, chunk_size=1024, segments=4)
+        ranges = [r for m, _, r in server.requests if m == "GET"]
+    assert fn.read_bytes() == data
+    # Restarted in one stream.
+    assert ranges[-1] is None
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_checksum(served, tmp_path):  # noqa: D103
+    src, data = served
+    digest = hashlib.sha256(data).hexdigest()
+    with FileServer(src) as server:
+        url = f"{server.url}/out.nc"
+        fn = download(url, tmp_path / "a", checksum=("sha-256", digest))
+        assert fn.exists()
+
+        with pytest.raises(DownloadError, match="Checksum"):
+            download(url, tmp_path / "b", checksum=("sha-256", "0" * 64))
+    assert not (tmp_path / "b" / "out.nc").exists()
+
+
+def test_missing(tmp_path):  # noqa: D103
+    with FileServer(tmp_path) as server:
+        with pytest.raises(DownloadError):
+            download(f"{server.url}/missing.nc", tmp_path / "dst")
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_accepts_ranges(served, ranges):  # noqa: D103
+    src, _ = served
+    with FileServer(src, ranges=ranges) as server:
+        assert accepts_ranges(f"{server.url}/out.nc") is ranges
+        assert not accepts_ranges(f"{server.url}/missing.nc")
+
+
+def test_rate_limiter(served, tmp_path):  # noqa: D103
+    import time
+
+    from birdy.client.download import RateLimiter
+
+    src, data = served
+    limiter = RateLimiter(4 * SIZE)
+    start = time.monotonic()
+    with FileServer(src) as server:
+        for name in ("a", "b"):
+            download(
+                f"{server.url}/out.nc",
+                tmp_path / name,
+                chunk_size=SIZE // 4,
+                rate_limiter=limiter,
+            )
+    assert time.monotonic() - start >= 0.4
+    assert (tmp_path / "b" / "out.nc").read_bytes() == data
+
+
+def test_skip_existing(served, tmp_path):  # noqa: D103
+    src, data = served
+    with FileServer(src) as server:
+        url = f"{server.url}/out.nc"
+        fn = download(url, tmp_path, skip_existing=True)
+        download(url, tmp_path, skip_existing=True)
+        assert len(server.requests) == 1
+
+        # A new file with the same size has another ETag.
+        new = os.urandom(SIZE)
+        (src / "out.nc").write_bytes(new)
+        os.utime(src / "out.nc", (0, 0))
+        download(url, tmp_path, skip_existing=True)
+        assert len(server.requests) == 2
+    assert fn.read_bytes() == new
+
+
+def test_skip_existing_stale(served, tmp_path):  # noqa: D103
+    src, data = served
+    with FileServer(src) as server:
+        url = f"{server.url}/out.nc"
+        # A file of the same size without recorded headers is downloaded again.
+        (tmp_path / "out.nc").write_bytes(b"C" * SIZE)
+        fn = download(url, tmp_path, skip_existing=True)
+        assert fn.read_bytes() == data
+
+        # Without ETags, the size and date must both match.
+        headers = tmp_path / ".out.nc.headers"
+        recorded = json.loads(headers.read_text())
+        headers.write_text(json.dumps(dict(recorded, ETag=None)))
+        download(url, tmp_path, skip_existing=True)
+        assert len(server.requests) == 1
+        headers.write_text(
+            json.dumps(dict(recorded, ETag=None, **{"Last-Modified": "yesterday"}))
+        )
+        download(url, tmp_path, skip_existing=True)
+        assert len(server.requests) == 2
@@ -0,0 +1,299 @@
+# noqa: D100
+
+import functools
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from birdy.ipyleafletwfs.base import IpyleafletWFS
+from birdy.ipyleafletwfs.cache import (
+    FeatureCache,
+    feature_bbox,
+    tile_bbox,
+    tile_zoom,
+    tiles,
+)
+from birdy.ipyleafletwfs.index import FeatureIndex
+
+
+def point(fid, lon, lat):  # noqa: D103
+    return {
+        "type": "Feature",
+        "id": f"forest.{fid}",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {"OBJECTID": fid, "name": f"stand {fid}"},
+    }
+
+
+# A grid of points over southern Quebec.
+FEATURES = [
+    point(i * 100 + j, -80 + i * 0.1, 45 + j * 0.1)
+    for i in range(100)
+    for j in range(50)
+]
+
+
+def ids(features):  # noqa: D103
+    return sorted(f["id"] for f in features)
+
+
+def _inside(feature, bbox):
+    lon, lat = feature["geometry"]["coordinates"]
+    return bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]
+
+
+class FakeWFS:
+    """Answer GetFeature requests from `FEATURES`."""
+
+    def __init__(self, *args, version="2.0.0", **kwargs):
+        self.version = version
+        self.requests = []
+        self.sortby = []
+
+    def getfeature(  # noqa: D102
+        self, typename, bbox, outputFormat, maxfeatures=None, startindex=None, **kwargs
+    ):
+        if self.version == "1.0.0" and kwargs:
+            raise TypeError(f"Unexpected arguments: {sorted(kwargs)}")
+        self.requests.append(bbox)
+        self.sortby.append(kwargs.get("sortby"))
+        features = [f for f in FEATURES if _inside(f, bbox)]
+        start = startindex or 0
+        end = start + maxfeatures if maxfeatures else None
+        features = features[start:end]
+        data = dict(type="FeatureCollection", features=features)
+        return io.BytesIO(json.dumps(data).encode())
+
+
+@pytest.fixture
+def make_wfs():  # noqa: D103
+    with mock.patch("birdy.ipyleafletwfs.base.WebFeatureService", FakeWFS):
+        yield functools.partial(IpyleafletWFS, "http://localhost/wfs")
+
+
+@pytest.fixture
+def wfs(make_wfs):  # noqa: D103
+    return make_wfs()
+
+
+def test_tiles():  # noqa: D103
+    bbox = (-75, 45, -73, 46)
+    zoom = tile_zoom(bbox)
+    covering = tiles(bbox, zoom)
+    assert 1 <= len(covering) <= 9
+    extent = [tile_bbox(*t) for t in covering]
+    assert min(e[0] for e in extent) <= bbox[0]
+    assert max(e[3] for e in extent) >= bbox[3]
+    # The requested extent is not much larger than the view.
+    assert max(e[2] for e in extent) - min(e[0] for e in extent) < 3 * (
+        bbox[2] - bbox[0]
+    )
+
+
+def test_feature_bbox():  # noqa: D103
+    polygon = {
+        "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [[[[0, 0], [2, 0], [2, 3], [0, 0]]], [[[-1, 1], [0, 1]]]],
+        }
+    }
+    assert feature_bbox(polygon) == (-1, 0, 2, 3)
+    assert feature_bbox({"geometry": None}) is None
+
+
+def test_feature_cache():  # noqa: D103
+    cache = FeatureCache()
+    bbox = (-75, 45, -73, 46)
+    missing = cache.missing(bbox)
+    for tile in missing:
+        cache.add(tile, [f for f in FEATURES if _inside(f, tile_bbox(*tile))])
+    assert cache.missing(bbox) == []
+    # Smaller tiles are covered by the tiles that were fetched.
+    assert cache.missing(bbox, zoom=tile_zoom(bbox) + 2) == []
+
+    assert ids(cache.query(bbox)) == ids(f for f in FEATURES if _inside(f, bbox))
+
+    # Features are merged by id.
+    n = len(cache)
+    moved = point(6005, -73.95, 45.55)
+    cache.add(None, [moved])
+    assert len(cache) == n
+    assert cache.query((-74.01, 45.49, -73.99, 45.51)) == []
+    assert cache.query((-73.96, 45.54, -73.94, 45.56)) == [moved]
+
+
+def test_feature_cache_without_ids():  # noqa: D103
+    # Features without an id are not merged on their properties, only when they are identical.
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [-74 + i / 10, 45.5]},
+            "properties": {"province": "QC"},
+        }
+        for i in range(5)
+    ]
+    cache = FeatureCache()
+    cache.add(None, features)
+    cache.add(None, [dict(features[0])])
+    assert len(cache) == 5
+    assert cache.query((-75, 45, -73, 46)) == features
+
+
+def test_load_features_by_tiles(wfs):  # noqa: D103
+    bbox = (-75, 45, -73, 46)
+    collection = wfs._load_features("public:forest", bbox)
+    assert ids(collection["features"]) == ids(f for f in FEATURES if _inside(f, bbox))
+    requests = len(wfs._wfs.requests)
+
+    # A pan only requests the new tiles.
+    bbox = (-72, 45, -70, 46)
+    collection = wfs._load_features("public:forest", bbox)
+    assert 0 < len(wfs._wfs.requests) - requests <= requests
+    assert ids(collection["features"]) == ids(f for f in FEATURES if _inside(f, bbox))
+
+    # Nothing is requested again within the fetched extent.
+    requests = len(wfs._wfs.requests)
+    wfs._load_features("public:forest", (-74, 45.2, -73.5, 45.8))
+    assert len(wfs._wfs.requests) == requests
+
+
+@pytest.mark.parametrize("hits", [True, False])
+def test_load_features_by_pages(make_wfs, hits):  # noqa: D103
+    wfs = make_wfs(tile_cache=False, page_size=100)
+    bbox = (-75, 45, -73, 46)
+    expected = [f for f in FEATURES if _inside(f, bbox)]
+    wfs._hits = lambda typename, bbox: len(expected) if hits else None
+
+    progress = []
+    collection = wfs._load_features("public:forest", bbox, progress.append)
+    assert ids(collection["features"]) == ids(expected)
+    assert len(wfs._wfs.requests) == 3
+    # The layer fills in as pages arrive.
+    sizes = [len(c["features"]) for c in progress]
+    assert len(sizes) == 3 and sizes == sorted(sizes) and sizes[-1] == len(expected)
+
+
+def test_load_features_progress_interval(make_wfs):  # noqa: D103
+    wfs = make_wfs(page_size=20)
+    bbox = (-75, 45, -73, 46)
+    progress = []
+    with mock.patch.object(
+        wfs.feature_cache, "query", wraps=wfs.feature_cache.query
+    ) as query:
+        collection = wfs._load_features("public:forest", bbox, progress.append, 60)
+    assert len(wfs._wfs.requests) > 2
+    # Only the first page is shown before the end, and the cache is not looked up for the others.
+    assert len(progress) == 1
+    assert query.call_count == 2
+    assert ids(collection["features"]) == ids(f for f in FEATURES if _inside(f, bbox))
+
+
+def test_load_features_without_hits(make_wfs):  # noqa: D103
+    # Like the owslib WFS 1.0.0 client, the service cannot count features.
+    wfs = make_wfs(tile_cache=False, page_size=100)
+    bbox = (-75, 45, -73, 46)
+    collection = wfs._load_features("public:forest", bbox)
+    assert ids(collection["features"]) == ids(f for f in FEATURES if _inside(f, bbox))
+    assert wfs._wfs.sortby == [None] * 3
+
+
+def test_paged_sort_key(make_wfs):  # noqa: D103
+    wfs = make_wfs(tile_cache=False, page_size=100)
+    wfs._wfs.constraints = {"ImplementsSorting": mock.Mock(values=["TRUE"])}
+    wfs._wfs.get_schema = mock.Mock(
+        return_value={"properties": {"OBJECTID": "int", "name": "string"}}
+    )
+    wfs._load_features("public:forest", (-75, 45, -73, 46))
+    wfs._load_features("public:forest", (-72, 45, -70, 46))
+    assert set(map(tuple, wfs._wfs.sortby)) == {("OBJECTID",)}
+    wfs._wfs.get_schema.assert_called_once_with("public:forest")
+
+    wfs = make_wfs(tile_cache=False, page_size=100, sort_by="name")
+    wfs._load_features("public:forest", (-75, 45, -73, 46))
+    assert set(map(tuple, wfs._wfs.sortby)) == {("name",)}
+
+    # WFS 1.0.0 cannot sort, so pages are sorted by the client.
+    wfs = make_wfs(wfs_version="1.0.0", tile_cache=False, page_size=100, sort_by="name")
+    getfeature = wfs._wfs.getfeature
+
+    def reversed_pages(*args, **kwargs):
+        data = json.loads(getfeature(*args, **kwargs).getvalue())
+        data["features"].reverse()
+        return io.BytesIO(json.dumps(data).encode())
+
+    wfs._wfs.getfeature = reversed_pages
+    features = wfs._load_features("public:forest", (-75, 45, -73, 46))["features"]
+    assert set(wfs._wfs.sortby) == {None}
+    names = [f["properties"]["name"] for f in features]
+    assert names[:100] == sorted(names[:100])
+
+
+@pytest.mark.parametrize("tile_cache", [True, False])
+def test_max_features(make_wfs, tile_cache):  # noqa: D103
+    wfs = make_wfs(tile_cache=tile_cache, page_size=20, max_features=50)
+    wfs._hits = lambda typename, bbox: len([f for f in FEATURES if _inside(f, bbox)])
+    bbox = (-75, 45, -73, 46)
+    collection = wfs._load_features("public:forest", bbox)
+    assert 0 < len(collection["features"]) <= 50
+    if tile_cache:
+        # Truncated tiles are requested again.
+        assert wfs.feature_cache.missing(bbox)
+    else:
+        assert len(collection["features"]) == 50
+
+
+def test_feature_index():  # noqa: D103
+    index = FeatureIndex(FEATURES, properties=["name"])
+    assert len(index) == len(FEATURES)
+    # Features are keyed by their GeoJSON id, as in the tile cache.
+    assert index.get("forest.6005")["properties"]["OBJECTID"] == 6005
+    assert index.get(6005) is None
+    assert index.get([6005]) is None
+    assert index.get_by_first_property(6005)["id"] == "forest.6005"
+    assert index.get_by_first_property([6005]) is None
+    # Features without an id member are only found by their properties.
+    anonymous = [{k: v for k, v in f.items() if k != "id"} for f in FEATURES[:10]]
+    assert FeatureIndex(anonymous).get(5) is None
+    assert FeatureIndex(anonymous).get(None) is None
+    assert ids(index.lookup("name", "stand 6005")) == ["forest.6005"]
+    assert index.lookup("name", "stand") == []
+
+    # Other properties are indexed on their first lookup.
+    features = [
+        dict(f, properties=dict(f["properties"], zone=f["properties"]["OBJECTID"] % 3))
+        for f in FEATURES
+    ]
+    index = FeatureIndex(features)
+    assert len(index.lookup("zone", 0)) == len(
+        [f for f in FEATURES if f["properties"]["OBJECTID"] % 3 == 0]
+    )
+    assert index.values("zone") == [0, 1, 2]
+
+
+def test_feature_properties_by_id(wfs):  # noqa: D103
+    assert wfs.feature_properties_by_id(6005) is None
+    wfs._set_geojson(wfs._load_features("public:forest", (-75, 45, -73, 46)))
+    assert wfs.feature_properties_by_id(6005) == {
+        "OBJECTID": 6005,
+        "name": "stand 6005",
+    }
+    assert wfs.feature_properties_by_id(1) is None
+    # GeoJSON ids are looked up in the index.
+    assert wfs.feature_properties_by_id("forest.6005") is None
+    assert wfs.feature_index.get("forest.6005")["properties"]["OBJECTID"] == 6005
+    assert ids(wfs.features_by_property("name", "stand 6005")) == ["forest.6005"]
+
+    # The index follows the loaded features.
+    wfs._set_geojson(wfs._load_features("public:forest", (-72, 45, -70, 46)))
+    assert wfs.feature_properties_by_id(6005) is None
+    assert wfs.feature_properties_by_id(8005)["name"] == "stand 8005"
+
+
+def test_feature_properties_by_numeric_id(wfs):  # noqa: D103
+    # Numeric GeoJSON ids do not shadow the first property of other features.
+    features = [dict(f, id=f["properties"]["OBJECTID"] - 10) for f in FEATURES[:50]]
+    wfs._set_geojson({"type": "FeatureCollection", "features": features})
+    assert wfs.feature_properties_by_id(5)["OBJECTID"] == 5
+    assert wfs.feature_index.get(5)["properties"]["OBJECTID"] == 15
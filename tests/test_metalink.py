@@ -0,0 +1,128 @@
+# noqa: D100
+
+import hashlib
+import json
+import types
+
+import pytest
+from common import FileServer
+
+from birdy.client import converters, metalink
+from birdy.exceptions import DownloadError
+
+META3 = """<?xml version="1.0" encoding="UTF-8"?>
+<metalink version="3.0" xmlns="http://www.metalinker.org/">
+  <files>
+    <file name="{name}">
+      <size>{size}</size>
+      <verification><hash type="sha256">{sha256}</hash></verification>
+      <resources>
+        <url type="http" preference="10">{url}/missing/{name}</url>
+        <url type="http" preference="100">{url}/{name}</url>
+      </resources>
+    </file>
+  </files>
+</metalink>
+"""
+
+META4_FILE = """
+  <file name="{name}">
+    <size>{size}</size>
+    <hash type="sha-256">{sha256}</hash>
+    <url priority="1">{url}/{name}</url>
+  </file>"""
+
+
+def meta4(files):  # noqa: D103
+    body = "".join(META4_FILE.format(**f) for f in files)
+    return f'<metalink xmlns="urn:ietf:params:xml:ns:metalink">{body}\n</metalink>'
+
+
+@pytest.fixture
+def src(tmp_path):  # noqa: D103
+    d = tmp_path / "src"
+    d.mkdir()
+    files = []
+    for i in range(5):
+        data = json.dumps({"i": i}).encode()
+        (d / f"{i}.json").write_bytes(data)
+        files.append(
+            dict(
+                name=f"{i}.json",
+                size=len(data),
+                sha256=hashlib.sha256(data).hexdigest(),
+            )
+        )
+    return d, files
+
+
+def test_parse_v4_priority():  # noqa: D103
+    doc = """<metalink xmlns="urn:ietf:params:xml:ns:metalink">
+      <file name="a.nc">
+        <url>http://c/a.nc</url>
+        <url/>
+        <url priority="2">http://b/a.nc</url>
+        <url priority="1">http://a/a.nc</url>
+      </file>
+    </metalink>"""
+    (f,) = metalink.parse(doc.encode())
+    # URLs without a priority come last, and empty ones are skipped.
+    assert f.urls == ["http://a/a.nc", "http://b/a.nc", "http://c/a.nc"]
+
+
+def test_parse_v3(src):  # noqa: D103
+    d, files = src
+    doc = META3.format(url="http://x", **files[0]).encode()
+    [f] = metalink.parse(doc)
+    assert f.name == "0.json"
+    assert f.urls == ["http://x/0.json", "http://x/missing/0.json"]
+    assert f.size == files[0]["size"]
+    assert f.hashes == {"sha-256": files[0]["sha256"]}
+
+
+def test_mirror_fallback(src, tmp_path):  # noqa: D103
+    d, files = src
+    with FileServer(d) as server:
+        (d / "0.metalink").write_text(
+            META3.format(url=server.url, **files[0]).replace(
+                'preference="100"', 'preference="1"'
+            )
+        )
+        out = converters.convert(d / "0.metalink", path=tmp_path / "out")
+    assert out == [{"i": 0}]
+
+
+def test_concurrent_download(src, tmp_path):  # noqa: D103
+    d, files = src
+    with FileServer(d) as server:
+        (d / "all.meta4").write_text(meta4([dict(url=server.url, **f) for f in files]))
+        out = converters.convert(
+            d / "all.meta4", path=tmp_path / "out", options={"max_workers": 3}
+        )
+    assert out == [{"i": i} for i in range(5)]
+
+
+def test_as_completed(src, tmp_path):  # noqa: D103
+    d, files = src
+    with FileServer(d) as server:
+        (d / "all.meta4").write_text(meta4([dict(url=server.url, **f) for f in files]))
+        out = converters.convert(
+            d / "all.meta4", path=tmp_path / "out", options={"as_completed": True}
+        )
+        assert isinstance(out, types.GeneratorType)
+        assert sorted(o["i"] for o in out) == list(range(5))
+
+
+def test_hash_mismatch(src, tmp_path):  # noqa: D103
+    d, files = src
+    files[0]["sha256"] = "0" * 64
+    with FileServer(d) as server:
+        [f] = metalink.parse(meta4([dict(url=server.url, **files[0])]).encode())
+        with pytest.raises(DownloadError):
+            list(metalink.download_files([f], tmp_path / "out"))
+    assert not (tmp_path / "out" / "0.json").exists()
+
+
+def test_safe_name():  # noqa: D103
+    assert str(metalink._safe_name("../../etc/passwd")) == "etc/passwd"
+    assert str(metalink._safe_name("/a/b.nc")) == "a/b.nc"
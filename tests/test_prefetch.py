@@ -0,0 +1,95 @@
+# noqa: D100
+
+import json
+from unittest import mock
+
+import owslib.wps
+from common import FileServer
+from lxml import etree
+
+from birdy.client.cache import OutputCache
+from birdy.client.outputs import WPSResult
+from birdy.client.prefetch import Prefetcher
+
+OUTPUT_XML = """
+<wps:Output xmlns:wps="http://www.opengis.net/wps/1.0.0" xmlns:ows="http://www.opengis.net/ows/1.1">
+  <ows:Identifier>output</ows:Identifier>
+  <wps:Reference href="{url}" mimeType="application/json"/>
+</wps:Output>"""
+
+
+def make_result(url, status, cache, prefetcher):  # noqa: D103
+    result = WPSResult()
+    result.process = mock.Mock(identifier="proc")
+    result.processOutputs = [
+        owslib.wps.Output(etree.fromstring(OUTPUT_XML.format(url=url)))
+    ]
+    result.status = status
+    result.attach({}, cache=cache, prefetcher=prefetcher)
+    return result
+
+
+def test_prefetch_on_success(tmp_path):  # noqa: D103
+    (tmp_path / "out.json").write_text(json.dumps({"a": 1}))
+    cache = OutputCache(tmp_path / "cache")
+    prefetcher = Prefetcher(cache)
+    with FileServer(tmp_path) as server:
+        url = f"{server.url}/out.json"
+        result = make_result(url, "ProcessStarted", cache, prefetcher)
+        prefetcher.wait()
+        assert cache.lookup(url) is None
+
+        # The status poll shows success.
+        with mock.patch.object(owslib.wps.WPSExecution, "checkStatus"):
+            result.status = "ProcessSucceeded"
+            result.checkStatus()
+        prefetcher.wait()
+        assert cache.lookup(url) is not None
+        assert result.get(asobj=True).output == {"a": 1}
+    prefetcher.shutdown()
+
+
+def test_prefetch_convert(tmp_path):  # noqa: D103
+    (tmp_path / "out.json").write_text(json.dumps({"a": 1}))
+    cache = OutputCache(tmp_path / "cache")
+    prefetcher = Prefetcher(cache, convert=True, max_rate=10**6)
+    with FileServer(tmp_path) as server:
+        result = make_result(
+            f"{server.url}/out.json", "ProcessSucceeded", cache, prefetcher
+        )
+        prefetcher.wait()
+        assert len(server.requests) > 0
+    # Converted in the background and memoized on the result.
+    assert len(result._memo) == 1
+    assert result.get(asobj=True).output == {"a": 1}
+    prefetcher.shutdown()
+
+
+def test_prefetch_concurrent_get(tmp_path):  # noqa: D103
+    import threading
+    import time
+
+    from birdy.client import outputs
+
+    (tmp_path / "out.json").write_text(json.dumps({"a": 1}))
+    cache = OutputCache(tmp_path / "cache")
+    prefetcher = Prefetcher(cache, convert=True)
+    convert = outputs.convert
+
+    def slow(*args, **kwargs):
+        time.sleep(0.2)
+        return convert(*args, **kwargs)
+
+    with FileServer(tmp_path) as server:
+        with mock.patch.object(outputs, "convert", side_effect=slow) as patched:
+            result = make_result(
+                f"{server.url}/out.json", "ProcessSucceeded", cache, prefetcher
+            )
+            # The outputs are requested while they are converted in the background.
+            thread = threading.Thread(target=result.get, kwargs={"asobj": True})
+            thread.start()
+            assert result.get(asobj=True).output == {"a": 1}
+            thread.join()
+            prefetcher.wait()
+    assert patched.call_count == 1
+    prefetcher.shutdown()
@@ -14,6 +14,14 @@ def test_is_url():  # noqa: D103
     assert not utils.is_url("myfile.txt")
 
 
+def test_is_remote():  # noqa: D103
+    assert utils.is_remote("http://localhost:5000/outputs/out.nc")
+    assert utils.is_remote("https://remote.org/out.nc")
+    assert not utils.is_remote("file:///path/to/out.nc")
+    assert not utils.is_remote("/path/to/out.nc")
+    assert not utils.is_remote(Path("/path/to/out.nc"))
+
+
 def test_is_file():  # noqa: D103
     assert not utils.is_file(None)
     assert utils.is_file(resource_file("dummy.nc"))
@@ -117,6 +125,71 @@ class TestGuessType:  # noqa: D101
         assert mime == "application/x-ogc-dods"
 
 
+class TestOpendapDetection:  # noqa: D101
+    @pytest.fixture(autouse=True)
+    def heads(self, monkeypatch):  # noqa: D102
+        import requests
+
+        calls = []
+
+        def head(url, **kwargs):
+            calls.append(url)
+            if "unreachable" in url:
+                raise requests.exceptions.ConnectionError()
+            r = requests.Response()
+            r.status_code = 200
+            if "opendap" in url:
+                r.headers["Content-Description"] = "dods-error"
+            return r
+
+        utils.clear_opendap_cache()
+        monkeypatch.setattr(requests, "head", head)
+        yield calls
+        utils.clear_opendap_cache()
+
+    def test_pattern(self, heads):  # noqa: D102
+        assert utils.is_opendap_url("https://remote.org/thredds/dodsC/a.nc")
+        assert not utils.is_opendap_url("/thredds/dodsC/a.nc")
+        assert heads == []
+
+    def test_registered(self, heads, monkeypatch):  # noqa: D102
+        monkeypatch.setattr(utils, "_opendap_endpoints", set())
+        utils.register_opendap_endpoint("https://remote.org/dap/")
+        assert utils.is_opendap_url("https://remote.org/dap/a.nc")
+        assert heads == []
+
+    def test_cached(self, heads):  # noqa: D102
+        # The outputs of each job are in their own directory.
+        for i in range(10):
+            assert not utils.is_opendap_url(f"https://remote.org/files/{i}/x.nc")
+        assert len(heads) == 1
+        # Positive results only apply to the same directory.
+        for i in range(10):
+            assert utils.is_opendap_url(f"https://remote.org/data/opendap/{i}.nc")
+        assert len(heads) == 2
+        assert not utils.is_opendap_url("https://remote.org/data/files/x.nc")
+        assert len(heads) == 3
+
+        assert not utils.is_opendap_url("https://remote.org/files/a.nc", ttl=0)
+        utils.clear_opendap_cache()
+        assert not utils.is_opendap_url("https://remote.org/files/a.nc", ttl=0)
+        assert not utils.is_opendap_url("https://remote.org/files/a.nc", ttl=0)
+        assert len(heads) == 5
+
+    def test_concurrent(self, heads):  # noqa: D102
+        from concurrent.futures import ThreadPoolExecutor
+
+        urls = [f"https://remote.org/opendap/x/{i}.nc" for i in range(100)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(utils.is_opendap_url, urls))
+        assert 1 <= len(heads) <= 8
+
+    def test_unreachable_host(self, heads):  # noqa: D102
+        for i in range(5):
+            assert not utils.is_opendap_url(f"https://unreachable.org/{i}/a.nc")
+        assert len(heads) == 1
+
+
 @pytest.mark.online
 def test_is_opendap_url():
     # This test uses online requests, and the servers are not as stable as hoped.
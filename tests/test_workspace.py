@@ -0,0 +1,82 @@
+# noqa: D100
+
+import gc
+from pathlib import Path
+
+import pytest
+from common import EMU_CAPS_XML, EMU_DESC_XML, URL_EMU
+
+from birdy import WPSClient
+from birdy.client.outputs import WPSResult
+from birdy.client.utils import extend_instance
+from birdy.client.workspace import Workspace
+
+
+def test_context_manager(tmp_path):  # noqa: D103
+    with Workspace(root=tmp_path) as ws:
+        d = ws.mkdtemp()
+        (d / "out.nc").write_bytes(b"0" * 10)
+        assert ws.path.parent == tmp_path
+        assert ws.size == 10
+    assert not ws.path.exists()
+    assert ws.closed
+    with pytest.raises(ValueError):
+        ws.mkdtemp()
+
+
+def test_garbage_collected(tmp_path):  # noqa: D103
+    ws = Workspace(root=tmp_path)
+    path = ws.path
+    del ws
+    gc.collect()
+    assert not path.exists()
+
+
+def test_quota(tmp_path):  # noqa: D103
+    ws = Workspace(root=tmp_path, quota=150)
+    a, b = ws.mkdtemp(), ws.mkdtemp()
+    (a / "a.nc").write_bytes(b"0" * 100)
+    (b / "b.nc").write_bytes(b"0" * 100)
+
+    with pytest.warns(UserWarning, match="quota"):
+        ws.enforce_quota()
+    assert a.exists()
+
+    ws.release(a)
+    c = ws.mkdtemp()
+    assert not a.exists()
+    assert b.exists() and c.exists()
+    ws.close()
+
+
+def test_result_release(tmp_path):  # noqa: D103
+    from owslib.wps import WPSExecution
+
+    ws = Workspace(root=tmp_path, quota=0)
+    result = WPSExecution()
+    extend_instance(result, WPSResult)
+    result.attach(wps_outputs={}, workspace=ws)
+    path = Path(result._path)
+    assert path.parent == ws.path
+    (path / "out.nc").write_bytes(b"0" * 10)
+
+    del result
+    gc.collect()
+    ws.enforce_quota()
+    assert not path.exists()
+    ws.close()
+
+
+def test_client_workspace(tmp_path):  # noqa: D103
+    with WPSClient(
+        URL_EMU, caps_xml=EMU_CAPS_XML, desc_xml=EMU_DESC_XML, workspace=tmp_path
+    ) as wps:
+        path = wps._workspace.path
+        assert path.parent == tmp_path
+    assert not path.exists()
+
+    ws = Workspace(root=tmp_path)
+    WPSClient(
+        URL_EMU, caps_xml=EMU_CAPS_XML, desc_xml=EMU_DESC_XML, workspace=ws
+    ).close()
+    assert not ws.closed